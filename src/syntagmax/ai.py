@@ -20,6 +20,7 @@ import git as gitmodule
 from jinja2 import Environment, FileSystemLoader
 
 from syntagmax.errors import FatalError
+from syntagmax.yaml_utils import safe_load
 
 lg = logging.getLogger(__name__)
 
@@ -31,11 +32,11 @@ def load_agent_registry(config) -> dict:
         if not custom_path.exists():
             raise FatalError(f'Custom agents file not found: {custom_path}')
         lg.info(f'Loading custom agent registry from {custom_path}')
-        data = yaml.safe_load(custom_path.read_text(encoding='utf-8'))
+        data = safe_load(custom_path.read_text(encoding='utf-8'))
     else:
         resource_path = importlib.resources.files('syntagmax.resources').joinpath('agents.yaml')
         lg.debug('Loading default agent registry from package resources')
-        data = yaml.safe_load(resource_path.read_text(encoding='utf-8'))
+        data = safe_load(resource_path.read_text(encoding='utf-8'))
 
     if not data or 'agents' not in data:
         raise FatalError('Invalid agent registry: missing "agents" key')
@@ -110,7 +111,7 @@ def _parse_frontmatter(content: str) -> dict | None:
     if not match:
         return None
     try:
-        data = yaml.safe_load(match.group(1))
+        data = safe_load(match.group(1))
     except yaml.YAMLError:
         return None
     if not isinstance(data, dict):
@@ -5,30 +5,38 @@
 # Description: Analyse a tree of artifacts.
 
 import logging as lg
+from collections.abc import Iterable, Mapping
+from contextlib import nullcontext
 
 from syntagmax.artifact import ArtifactMap, Artifact
+from syntagmax.column_checks import ColumnChecks
 from syntagmax.config import Config
+from syntagmax.extract_cache import LogRecords, replay_log_records
 from syntagmax.i18n import _
-from syntagmax.id_utils import compile_id_schema
-from syntagmax.metamodel import evaluate_condition
+from syntagmax.log_utils import capture_warnings
+from syntagmax.rules import ArtifactRules, AttributeRule, compile_rules, value_is_valid
 from syntagmax.report import ReportError, CAT_SCHEMA, CAT_ATTRIBUTE, CAT_REFERENCE, CAT_TRACE, CAT_STRUCTURE
 
+type ValidationResult = tuple[list[ReportError], LogRecords]
+
 
 class ArtifactValidator:
     def __init__(self, metamodel, artifacts: ArtifactMap, errors: list | None = None, suppress_tracing: bool = False):
-        # Index rules by artifact name for fast lookup
+        # Compile rule tables by artifact name for fast lookup
         if metamodel is not None and 'artifacts' in metamodel:
-            self._artifacts = metamodel['artifacts']
-            self._traces = metamodel.get('traces', {})
+            self._rules = compile_rules(metamodel['artifacts'], metamodel.get('traces', {}))
         else:
             # Backward compatibility or empty metamodel
-            self._artifacts = metamodel if metamodel else {}
-            self._traces = {}
+            self._rules = compile_rules(metamodel, {}) if metamodel else {}
 
         self.errors = errors if errors is not None else []
         self._artifacts_map = artifacts
-        self._id_schema_cache = {}
         self._suppress_tracing = suppress_tracing
+        self._column_checks: ColumnChecks | None = None
+
+    def prepare(self, artifacts: Iterable[Artifact]):
+        """Run the presence and type checks of unconditional single-valued rules for all given artifacts in columns."""
+        self._column_checks = ColumnChecks(self._rules, artifacts)
 
     def _make_error(self, artifact: Artifact, message: str, category: str) -> ReportError:
         from syntagmax.artifact import LineLocation
@@ -48,91 +56,51 @@ class ArtifactValidator:
         )
 
     def validate(self, artifact: Artifact):
-        if self._artifacts is None or not self._artifacts:
+        if not self._rules:
             return self.errors
 
-        if artifact.atype not in self._artifacts:
+        rules = self._rules.get(artifact.atype)
+        if rules is None:
             self.errors.append(self._make_error(artifact, _("Unknown artifact type: '{atype}'").format(atype=artifact.atype), CAT_ATTRIBUTE))
             return self.errors
 
-        self._validate_attributes(artifact)
-        self._validate_id_schema(artifact)
+        self._validate_attributes(artifact, rules)
+        self._validate_id_schema(artifact, rules)
         if not self._suppress_tracing:
-            self._validate_traces(artifact)
+            self._validate_traces(artifact, rules)
 
         return self.errors
 
-    def _evaluate_condition(self, artifact: Artifact, condition: dict | None) -> bool:
-        if not condition:
-            return True
-
-        # Build a metamodel dict in the format expected by the shared helper
-        metamodel = {'artifacts': self._artifacts, 'traces': self._traces}
-        return evaluate_condition(artifact.fields, artifact.atype, condition, metamodel)
-
-    def _validate_id_schema(self, artifact: Artifact):
-        artifact_rules = self._artifacts[artifact.atype]['attributes']
-        id_rules = artifact_rules.get('id', [])
-        if not id_rules:
-            return
-
-        if isinstance(id_rules, dict):
-            id_rules = [id_rules]
-
+    def _validate_id_schema(self, artifact: Artifact, rules: ArtifactRules):
         # Usually only one id rule, but let's be safe
-        for rule in id_rules:
-            if not self._evaluate_condition(artifact, rule.get('condition')):
-                continue
-
-            schema = rule.get('schema')
-            if not schema:
+        for rule in rules.id_rules:
+            if rule.condition is not None and not rule.condition(artifact.fields):
                 continue
 
-            cache_key = (schema, artifact.atype)
-            compiled_pattern = self._id_schema_cache.get(cache_key)
-
-            if compiled_pattern is None:
-                compiled_pattern = compile_id_schema(schema, artifact.atype)
-                self._id_schema_cache[cache_key] = compiled_pattern
-
-            if not compiled_pattern.match(artifact.aid):
+            if not rule.pattern.match(artifact.aid):
                 self.errors.append(
                     self._make_error(
                         artifact,
                         _("Artifact ID '{aid}' does not match schema '{schema}' for type '{atype}'").format(
-                            aid=artifact.aid, schema=schema, atype=artifact.atype
+                            aid=artifact.aid, schema=rule.schema, atype=artifact.atype
                         ),
                         CAT_SCHEMA,
                     )
                 )
 
-    def _validate_attributes(self, artifact: Artifact):
-        artifact_rules = self._artifacts[artifact.atype]['attributes']
-        actual_names = set(artifact.fields.keys())
+    def _validate_attributes(self, artifact: Artifact, rules: ArtifactRules):
+        fields = artifact.fields
 
         # 1. Identify active rules for each attribute
-        active_rules_by_name = self._get_active_rules(artifact, artifact_rules)
+        if rules.unconditional:
+            active_rules_by_name = rules.attributes
+            allowed_names = rules.allowed_names
+        else:
+            active_rules_by_name = self._get_active_rules(artifact, rules)
+            allowed_names = {name for name, active in active_rules_by_name}
 
         # 2. Check for Additional Attributes (Strict Mode)
-        self._check_extra_attributes(artifact, actual_names, active_rules_by_name)
-
-        # 3. Check each attribute's rules
-        self._check_attribute_requirements(artifact, actual_names, active_rules_by_name)
-
-    def _get_active_rules(self, artifact: Artifact, artifact_rules: dict) -> dict[str, list[dict]]:
-        active_rules_by_name = {}
-        for attr_name, rules in artifact_rules.items():
-            if isinstance(rules, dict):
-                rules = [rules]
-            active = [r for r in rules if self._evaluate_condition(artifact, r.get('condition'))]
-            if active:
-                active_rules_by_name[attr_name] = active
-        return active_rules_by_name
-
-    def _check_extra_attributes(self, artifact: Artifact, actual_names: set[str], active_rules_by_name: dict[str, list[dict]]):
-        all_allowed_names = set(active_rules_by_name.keys())
-        extra_fields = actual_names - all_allowed_names
-        for extra in extra_fields:
+        for extra in set(fields) - allowed_names:
             self.errors.append(
                 self._make_error(
                     artifact,
@@ -141,33 +109,54 @@ class ArtifactValidator:
                 )
             )
 
-    def _check_attribute_requirements(self, artifact: Artifact, actual_names: set[str], active_rules_by_name: dict[str, list[dict]]):
-        for attr_name, active_rules in active_rules_by_name.items():
-            # Check if mandatory and missing
-            is_mandatory = any(r['presence'] == 'mandatory' for r in active_rules)
-            if is_mandatory and attr_name not in actual_names:
-                self.errors.append(
-                    self._make_error(
-                        artifact,
-                        _("Missing mandatory attribute: '{attr_name}'").format(attr_name=attr_name),
-                        CAT_ATTRIBUTE,
-                    )
-                )
+        # 3. Check each attribute's rules, taking the results of the columnar pass where there are any
+        checks = self._column_checks if self._column_checks is not None and self._column_checks.covers(artifact) else None
+        if checks is not None:
+            residual = checks.residual(artifact)
+            findings = checks.findings(artifact)
+            if not residual and not findings:
+                return
+
+        for attr_name, active_rules in active_rules_by_name:
+            if checks is not None and attr_name not in residual:
+                for rule in findings.get(attr_name, ()):
+                    if rule is None:
+                        self._report_missing(artifact, attr_name)
+                    else:
+                        self._report_invalid_value(artifact, fields[attr_name], rule, attr_name)
                 continue
 
-            if attr_name not in actual_names:
+            if attr_name not in fields:
+                # Check if mandatory and missing
+                if any(r.mandatory for r in active_rules):
+                    self._report_missing(artifact, attr_name)
                 continue
 
-            value = artifact.fields[attr_name]
+            value = fields[attr_name]
 
             for rule in active_rules:
                 self._check_rule(artifact, attr_name, value, rule)
 
-    def _check_rule(self, artifact: Artifact, attr_name: str, value, rule: dict):
-        is_multiple = rule.get('multiple', False)
-        type_info = rule['type_info']
+    def _report_missing(self, artifact: Artifact, attr_name: str):
+        self.errors.append(
+            self._make_error(
+                artifact,
+                _("Missing mandatory attribute: '{attr_name}'").format(attr_name=attr_name),
+                CAT_ATTRIBUTE,
+            )
+        )
+
+    def _get_active_rules(self, artifact: Artifact, rules: ArtifactRules) -> list[tuple[str, tuple[AttributeRule, ...]]]:
+        active_rules_by_name = []
+        fields = artifact.fields
+        for attr_name, attribute_rules in rules.attributes:
+            active = tuple(r for r in attribute_rules if r.condition is None or r.condition(fields))
+            if active:
+                active_rules_by_name.append((attr_name, active))
+        return active_rules_by_name
 
-        if is_multiple:
+    def _check_rule(self, artifact: Artifact, attr_name: str, value, rule: AttributeRule):
+        if rule.multiple:
             if not isinstance(value, list):
                 self.errors.append(
                     self._make_error(
@@ -178,7 +167,7 @@ class ArtifactValidator:
                 )
             else:
                 for item in value:
-                    self._check_type(artifact, item, type_info, attr_name)
+                    self._check_type(artifact, item, rule, attr_name)
         else:
             if isinstance(value, list):
                 self.errors.append(
@@ -189,87 +178,58 @@ class ArtifactValidator:
                     )
                 )
             else:
-                self._check_type(artifact, value, type_info, attr_name)
-
-    def _check_type(self, artifact: Artifact, val, type_info: dict, attr_name: str):
-        expected_type = type_info['type']
-
-        if expected_type == 'integer':
-            try:
-                int(val)
-            except (ValueError, TypeError):
-                self.errors.append(
-                    self._make_error(
-                        artifact,
-                        _("Attribute '{attr_name}' value '{val}' cannot be converted to an integer").format(attr_name=attr_name, val=val),
-                        CAT_ATTRIBUTE,
-                    )
-                )
-
-        elif expected_type == 'boolean':
-            if 'custom_values' in type_info:
-                truthy = {v.lower() for v in type_info['custom_values']['true']}
-                falsy = {v.lower() for v in type_info['custom_values']['false']}
-                expected_str = _('expected {true_vals} / {false_vals}').format(
-                    true_vals=', '.join(type_info['custom_values']['true']), false_vals=', '.join(type_info['custom_values']['false'])
-                )
+                self._check_type(artifact, value, rule, attr_name)
+
+    def _check_type(self, artifact: Artifact, val, rule: AttributeRule, attr_name: str):
+        if rule.kind == 'reference':
+            self._check_reference(artifact, val, attr_name)
+        elif not value_is_valid(rule, val):
+            self._report_invalid_value(artifact, val, rule, attr_name)
+
+    def _report_invalid_value(self, artifact: Artifact, val, rule: AttributeRule, attr_name: str):
+        if rule.kind == 'integer':
+            message = _("Attribute '{attr_name}' value '{val}' cannot be converted to an integer").format(attr_name=attr_name, val=val)
+        elif rule.kind == 'boolean':
+            if rule.custom_true is not None:
+                expected_str = _('expected {true_vals} / {false_vals}').format(true_vals=', '.join(rule.custom_true), false_vals=', '.join(rule.custom_false))
             else:
-                truthy = {'true', 'yes', '1'}
-                falsy = {'false', 'no', '0'}
                 expected_str = _('expected true/false, yes/no, 1/0')
+            message = _("Attribute '{attr_name}' value '{val}' is not a valid boolean ({expected})").format(attr_name=attr_name, val=val, expected=expected_str)
+        else:
+            message = _("Attribute '{attr_name}' value '{val}' is invalid. Allowed values: {allowed}").format(
+                attr_name=attr_name, val=val, allowed=list(rule.allowed)
+            )
 
-            if str(val).lower() not in truthy | falsy:
-                self.errors.append(
-                    self._make_error(
-                        artifact,
-                        _("Attribute '{attr_name}' value '{val}' is not a valid boolean ({expected})").format(
-                            attr_name=attr_name, val=val, expected=expected_str
-                        ),
-                        CAT_ATTRIBUTE,
-                    )
-                )
+        self.errors.append(self._make_error(artifact, message, CAT_ATTRIBUTE))
 
-        elif expected_type == 'enum':
-            allowed = type_info['allowed']
-            if val not in allowed:
-                self.errors.append(
-                    self._make_error(
-                        artifact,
-                        _("Attribute '{attr_name}' value '{val}' is invalid. Allowed values: {allowed}").format(attr_name=attr_name, val=val, allowed=allowed),
-                        CAT_ATTRIBUTE,
-                    )
+    def _check_reference(self, artifact: Artifact, val, attr_name: str):
+        if not isinstance(val, str):
+            msg = _("Attribute '{attr_name}' value '{val}' is a malformed reference (expected ID string)").format(attr_name=attr_name, val=val)
+            if self._suppress_tracing:
+                lg.warning(msg)
+            else:
+                self.errors.append(self._make_error(artifact, msg, CAT_REFERENCE))
+        else:
+            aid = val.split('@')[0] if '@' in val else val
+            ref_artifact = self._artifacts_map.get(aid)
+            if not ref_artifact:
+                msg = _("Attribute '{attr_name}' value '{val}' refers to an unknown artifact ID '{aid}'").format(attr_name=attr_name, val=val, aid=aid)
+                if self._suppress_tracing:
+                    lg.warning(msg)
+                else:
+                    self.errors.append(self._make_error(artifact, msg, CAT_REFERENCE))
+            elif ref_artifact.atype not in self._rules:
+                msg = _("Attribute '{attr_name}' value '{val}' refers to an artifact with unknown type '{atype}'").format(
+                    attr_name=attr_name, val=val, atype=ref_artifact.atype
                 )
-
-        elif expected_type == 'reference':
-            if not isinstance(val, str):
-                msg = _("Attribute '{attr_name}' value '{val}' is a malformed reference (expected ID string)").format(attr_name=attr_name, val=val)
                 if self._suppress_tracing:
                     lg.warning(msg)
                 else:
                     self.errors.append(self._make_error(artifact, msg, CAT_REFERENCE))
-            else:
-                aid = val.split('@')[0] if '@' in val else val
-                ref_artifact = self._artifacts_map.get(aid)
-                if not ref_artifact:
-                    msg = _("Attribute '{attr_name}' value '{val}' refers to an unknown artifact ID '{aid}'").format(attr_name=attr_name, val=val, aid=aid)
-                    if self._suppress_tracing:
-                        lg.warning(msg)
-                    else:
-                        self.errors.append(self._make_error(artifact, msg, CAT_REFERENCE))
-                elif ref_artifact.atype not in self._artifacts:
-                    msg = _("Attribute '{attr_name}' value '{val}' refers to an artifact with unknown type '{atype}'").format(
-                        attr_name=attr_name, val=val, atype=ref_artifact.atype
-                    )
-                    if self._suppress_tracing:
-                        lg.warning(msg)
-                    else:
-                        self.errors.append(self._make_error(artifact, msg, CAT_REFERENCE))
-
-    def _validate_traces(self, artifact: Artifact):
-        all_trace_rules = self._traces.get(artifact.atype, [])
 
+    def _validate_traces(self, artifact: Artifact, rules: ArtifactRules):
         # Evaluate conditions on the FROM artifact
-        active_trace_rules = [r for r in all_trace_rules if self._evaluate_condition(artifact, r.get('condition'))]
+        active_trace_rules = [r for r in rules.traces if r.condition is None or r.condition(artifact.fields)]
 
         # Look up parents to get their types
         actual_parents = []
@@ -281,9 +241,10 @@ class ArtifactValidator:
                 actual_parents.append(parent_artifact)
 
         # 1. Forbidden undeclared traces
-        allowed_target_types = set()
-        for rule in active_trace_rules:
-            allowed_target_types.update(rule['targets'])
+        if len(active_trace_rules) == len(rules.traces):
+            allowed_target_types = rules.trace_targets
+        else:
+            allowed_target_types = frozenset().union(*(rule.targets for rule in active_trace_rules))
 
         for parent in actual_parents:
             if parent.atype not in allowed_target_types:
@@ -297,8 +258,8 @@ class ArtifactValidator:
 
         # 2. Mandatory traces and Mode validation
         for rule in active_trace_rules:
-            targets = set(rule['targets'])
-            mode = rule.get('mode', 'timestamp')
+            targets = rule.targets
+            mode = rule.mode
 
             found = False
             for parent in actual_parents:
@@ -328,7 +289,7 @@ class ArtifactValidator:
                                 )
                             )
 
-            if rule['presence'] == 'mandatory' and not found:
+            if rule.mandatory and not found:
                 target_str = ' or '.join(f"'{t}'" for t in targets)
                 self.errors.append(
                     self._make_error(
@@ -339,17 +300,35 @@ class ArtifactValidator:
                 )
 
 
-def analyse_tree(config: Config, artifacts: ArtifactMap, errors: list):
+def analyse_tree(config: Config, artifacts: ArtifactMap, errors: list, reuse: Mapping[str, ValidationResult] | None = None) -> dict[str, ValidationResult]:
+    """Validate all artifacts and return the errors and warnings of each one by ID.
+
+    Artifacts found in `reuse` are not validated again; their recorded results are reported instead.
+    Warnings are only collected when `reuse` is given.
+    """
     suppress = config.params.get('suppress_tracing', False)
     validator = ArtifactValidator(config.metamodel, artifacts, errors, suppress_tracing=suppress)
+    results: dict[str, ValidationResult] = {}
+    validator.prepare(a for a in artifacts.values() if a.atype != 'ROOT' and not (reuse and a.aid in reuse))
 
-    for artifact in artifacts.values():
-        # Skipping the root pseudo-artifact
-        if artifact.atype == 'ROOT':
-            continue
+    with capture_warnings() if reuse is not None else nullcontext([]) as log_records:
+        for artifact in artifacts.values():
+            # Skipping the root pseudo-artifact
+            if artifact.atype == 'ROOT':
+                continue
 
-        lg.info(f'Validating artifact: {artifact}')
-        validator.validate(artifact)
+            first_error = len(errors)
+            first_record = len(log_records)
+            cached = reuse.get(artifact.aid) if reuse else None
+
+            if cached is not None:
+                errors.extend(cached[0])
+                replay_log_records(cached[1])
+            else:
+                lg.info(f'Validating artifact: {artifact}')
+                validator.validate(artifact)
+
+            results[artifact.aid] = (errors[first_error:], log_records[first_record:])
 
     # Ensure there is only one ROOT
     root_count = 0
@@ -360,3 +339,5 @@ def analyse_tree(config: Config, artifacts: ArtifactMap, errors: list):
 
     if root_count != 1:
         errors.append(ReportError(message=_('Must have exactly one root artifact'), category=CAT_STRUCTURE))
+
+    return results
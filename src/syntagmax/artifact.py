@@ -4,15 +4,18 @@
 # Created: 2025-03-29
 # Description: Artifacts are the basic units of the Requirement Management System (RMS).
 
+from collections.abc import Set as AbstractSet
 from dataclasses import dataclass
 from datetime import datetime
 
 from syntagmax.errors import RMSException
 from syntagmax.i18n import _
+from syntagmax.interning import intern
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from syntagmax.config import Config, InputRecord
+    from syntagmax.reachability import ReachabilityIndex
 
 
 class ValidationError(RMSException):
@@ -20,11 +23,15 @@ class ValidationError(RMSException):
 
 
 class Location:
+    __slots__ = ()
+
     def filepath(self) -> str:
         raise NotImplementedError
 
 
 class FileLocation(Location):
+    __slots__ = ('loc_file', 'loc_sidecar')
+
     def __init__(self, loc_file: str, loc_sidecar: str | None = None):
         self.loc_file = loc_file
         self.loc_sidecar = loc_sidecar
@@ -39,6 +46,8 @@ class FileLocation(Location):
 
 
 class LineLocation(Location):
+    __slots__ = ('loc_file', 'loc_lines')
+
     def __init__(self, loc_file: str, loc_lines: tuple[int, int]):
         self.loc_file = loc_file
         self.loc_lines = loc_lines
@@ -51,6 +60,8 @@ class LineLocation(Location):
 
 
 class NotebookLocation(LineLocation):
+    __slots__ = ('loc_cell',)
+
     def __init__(self, loc_file: str, loc_lines: tuple[int, int], loc_cell: int):
         super().__init__(loc_file, loc_lines)
         self.loc_cell = loc_cell
@@ -73,7 +84,7 @@ class Revision:
         return f'{self.hash_short} by {self.author_email} at {self.timestamp}'
 
 
-@dataclass
+@dataclass(slots=True)
 class ParentLink:
     pid: str
     nominal_revision: str | None = None
@@ -83,7 +94,29 @@ class ParentLink:
 UNDEFINED_ID = '<undefined>'
 
 
+def _slot_names(cls: type) -> tuple[str, ...]:
+    """Instance slots of a class and its bases."""
+    return tuple(name for klass in reversed(cls.__mro__) for name in klass.__dict__.get('__slots__', ()))
+
+
 class Artifact:
+    # Change reports hold hundreds of thousands of artifacts; subclasses declare their own slots
+    __slots__ = (
+        '_config',
+        'location',
+        'driver',
+        'record',
+        'atype',
+        'aid',
+        'pids',
+        'parent_links',
+        'children',
+        'reachability',
+        'fields',
+        '_normalized_fields',
+        'revisions',
+    )
+
     def __init__(self, config: 'Config'):
         self._config = config
         self.location: Location | None = None
@@ -94,11 +127,18 @@ class Artifact:
         self.pids: list[str] = []
         self.parent_links: list[ParentLink] = []
         self.children: set[str] = set()
-        self.ancestors: set[str] = set()
+        self.reachability: 'ReachabilityIndex | None' = None
         self.fields: dict[str, str | list[str]] = {}
         self._normalized_fields: dict[str, str | None] | None = None
         self.revisions: set[Revision] = set()
 
+    @property
+    def ancestors(self) -> AbstractSet[str]:
+        """Ancestors of this artifact in the tree, answered by the reachability index (empty before build_tree)."""
+        if self.reachability is None:
+            return frozenset()
+        return self.reachability.ancestor_view(self.aid)
+
     @property
     def latest_revision(self) -> Revision | None:
         if not self.revisions:
@@ -108,6 +148,17 @@ class Artifact:
     def contents(self) -> str:
         return self.fields.get('contents', '<empty>')
 
+    def __getstate__(self) -> dict:
+        # Config and input record are process-wide objects, the extraction cache reattaches them
+        state = {name: getattr(self, name) for name in _slot_names(type(self)) if hasattr(self, name)}
+        state['_config'] = None
+        state['record'] = None
+        return state
+
+    def __setstate__(self, state: dict):
+        for name, value in state.items():
+            setattr(self, name, value)
+
     def __str__(self) -> str:
         hash_short = self.latest_revision.hash_short if self.latest_revision else 'none'
         return f'{self.atype}።{self.aid}።{self.location}@{hash_short}'
@@ -133,11 +184,12 @@ class ArtifactBuilder:
         if self.artifact.aid:
             raise ValidationError(self._build_error(_('Duplicate AID')))
 
-        self.artifact.aid = aid
-        self.artifact.atype = atype
+        self.artifact.aid = intern(aid)
+        self.artifact.atype = intern(atype)
         return self
 
     def add_field(self, field: str, value: str):
+        field = intern(field)
         multiple = False
         is_reference = False
         if self._metamodel and self.artifact.atype in self._metamodel.get('artifacts', {}):
@@ -13,12 +13,12 @@ if TYPE_CHECKING:
     from syntagmax.artifact import Artifact
 
 
-@dataclass
+@dataclass(slots=True)
 class Block:
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class TextBlock(Block):
     content: str
     marker: str | None = None
@@ -29,30 +29,30 @@ class TextBlock(Block):
     None for unmarked text blocks or when offset tracking is not active."""
 
 
-@dataclass
+@dataclass(slots=True)
 class ArtifactBlock(Block):
     artifact: Artifact
     raw_text: str
 
 
-@dataclass
+@dataclass(slots=True)
 class ErrorBlock(Block):
     message: str
     raw_text: str
 
 
-@dataclass
+@dataclass(slots=True)
 class FileRecord:
     path: str
     blocks: list[Block] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class InputBlock:
     name: str
     files: list[FileRecord] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class BlockTree:
     inputs: list[InputBlock] = field(default_factory=list)
@@ -10,12 +10,13 @@ from pathlib import Path
 
 from syntagmax.blocks import FileRecord
 from syntagmax.config import Config, InputRecord
+from syntagmax.discovery import FileDiscovery
 from syntagmax.extract import EXTRACTORS
 
 lg = logging.getLogger(__name__)
 
 
-def _remap_record(record: InputRecord, worktree_path: Path, original_base: Path) -> InputRecord:
+def _remap_record(record: InputRecord, worktree_path: Path, original_base: Path, discovery: FileDiscovery | None = None) -> InputRecord:
     """Create a copy of an InputRecord with paths remapped to a worktree.
 
     Does NOT mutate the original record.
@@ -28,6 +29,7 @@ def _remap_record(record: InputRecord, worktree_path: Path, original_base: Path)
         record: Original input record from config.
         worktree_path: Path to the worktree root (same structure as repo root).
         original_base: Original base directory from config.
+        discovery: File discovery shared between the records of the worktree.
 
     Returns:
         A new InputRecord with record_base and filepaths pointing into the worktree.
@@ -60,7 +62,7 @@ def _remap_record(record: InputRecord, worktree_path: Path, original_base: Path)
     glob_pattern = record.filter_glob
 
     if new_record_base.exists():
-        new_filepaths = sorted(new_record_base.glob(glob_pattern))
+        new_filepaths = (discovery or FileDiscovery()).find(new_record_base, glob_pattern)
     else:
         lg.warning('Record directory not found in worktree: %s', new_record_base)
         new_filepaths = []
@@ -156,9 +158,10 @@ def extract_blocks_at_revision(
     wt_config = _make_worktree_config(config, worktree_path)
     result: dict[str, list[FileRecord]] = {}
     errors: list[tuple[str, str]] = []
+    discovery = FileDiscovery()
 
     for record in config.input_records():
-        remapped = _remap_record(record, worktree_path, config.base_dir())
+        remapped = _remap_record(record, worktree_path, config.base_dir(), discovery)
 
         if not remapped.filepaths:
             lg.debug('No files found for record %s in worktree', record.name)
@@ -37,6 +37,8 @@ from syntagmax.cli_ai import ai
 @click.option('--render-tree', is_flag=True, help='Render the artifact tree')
 @click.option('--cwd', type=click.Path(exists=True), help='Change the working directory')
 @click.option('--no-git', is_flag=True, help='Skip git history extraction')
+@click.option('--no-cache', is_flag=True, help='Bypass the persistent extraction cache')
+@click.option('-j', '--jobs', type=click.IntRange(min=0), default=None, help='Number of extraction worker processes (0 = one per CPU)')
 @click.option('--lang', 'language', type=click.Choice(['en', 'ru']), default=None, help='Output language (en, ru)')
 @click.option('-f', '--config-file', type=click.Path(), default='.syntagmax/config.toml', help='Path to config file')
 def rms(ctx: click.Context, **kwargs: dict[str, Any]):
@@ -97,9 +99,10 @@ def init(ctx: click.Context):
 @click.option('--allow-dirty-worktree', is_flag=True, help='Allow analysis on a dirty git worktree')
 @click.option('--suppress-tracing', is_flag=True, help='Suppress tracing model errors')
 @click.option('--tasks', is_flag=True, help='Enable task generation (overrides config)')
+@click.option('--incremental', is_flag=True, help='Re-analyze only what changed in git since the previous incremental run')
 @click.option('--output', default=None, help='Report output file or "console" for stdout (default: <output_path>/report.md)')
 @click.argument('step', type=click.Choice(public_steps()), default='metrics')
-def analyze(obj: Params, allow_dirty_worktree: bool, suppress_tracing: bool, tasks: bool, output: str | None, step: str):
+def analyze(obj: Params, allow_dirty_worktree: bool, suppress_tracing: bool, tasks: bool, incremental: bool, output: str | None, step: str):
     import sys
 
     cfg_path = Path(obj['config_file'])
@@ -109,6 +112,7 @@ def analyze(obj: Params, allow_dirty_worktree: bool, suppress_tracing: bool, tas
     obj['allow_dirty_worktree'] = allow_dirty_worktree
     obj['suppress_tracing'] = suppress_tracing
     obj['tasks'] = tasks
+    obj['incremental'] = incremental
     config = Config(obj, cfg_path)
     report = process(step, config)
 
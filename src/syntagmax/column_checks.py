@@ -0,0 +1,130 @@
+# SPDX-License-Identifier: MIT
+
+# Author: Boris Resnick
+# Created: 2026-10-17
+# Description: Columnar attribute checks for all artifacts of a type at once.
+
+from collections import defaultdict
+from collections.abc import Iterable, Mapping
+
+import polars as pl
+
+from syntagmax.artifact import Artifact
+from syntagmax.rules import ArtifactRules, AttributeRule, value_is_valid
+
+# Accepts a subset of what int() accepts; rejected values are confirmed with int() itself
+INTEGER_PATTERN = r'^\s*[+-]?\d+(?:_\d+)*\s*$'
+
+
+def _vectorized(rule: AttributeRule) -> bool:
+    if rule.condition is not None or rule.multiple:
+        return False
+    if rule.kind == 'enum':
+        return all(isinstance(v, str) for v in rule.allowed)
+    return rule.kind in ('string', 'integer', 'boolean')
+
+
+def _invalid_expr(rule: AttributeRule, column: pl.Expr) -> pl.Expr | None:
+    if rule.kind == 'integer':
+        valid = column.str.contains(INTEGER_PATTERN)
+    elif rule.kind == 'boolean':
+        valid = column.str.to_lowercase().is_in(sorted(rule.boolean_values))
+    elif rule.kind == 'enum':
+        valid = column.is_in(list(rule.allowed))
+    else:
+        return None
+    return column.is_not_null() & ~valid
+
+
+class ColumnChecks:
+    """Presence and type checks of unconditional single-valued attribute rules, run as Polars expressions.
+
+    Each artifact type becomes one frame with a column per attribute, and every check is an
+    expression over a column. Only string values are checked in columns. Attributes with conditional,
+    multiple or reference rules, and attributes holding other values, are left to the per-artifact
+    checks of ArtifactValidator. The validator reports the findings in rule order, so the report is
+    the same as without the columnar pass, and skips artifacts without findings.
+    """
+
+    def __init__(self, rules: Mapping[str, ArtifactRules], artifacts: Iterable[Artifact]):
+        self._artifacts: dict[str, Artifact] = {}
+        # Attributes left to per-artifact checks, by artifact type and by artifact ID
+        self._residual_by_type: dict[str, frozenset[str]] = {}
+        self._residual: dict[str, frozenset[str]] = {}
+        # Failed checks by artifact ID: attribute name -> missing mandatory attribute (None) or violated rules
+        self._findings: dict[str, dict[str, list[AttributeRule | None]]] = {}
+
+        by_type: dict[str, list[Artifact]] = defaultdict(list)
+        for artifact in artifacts:
+            if artifact.atype in rules:
+                by_type[artifact.atype].append(artifact)
+                self._artifacts[artifact.aid] = artifact
+
+        for atype, group in by_type.items():
+            self._check_type(rules[atype], group)
+
+    def _check_type(self, rules: ArtifactRules, group: list[Artifact]):
+        field_dicts = [artifact.fields for artifact in group]
+        data: dict[str, list] = {}
+        exprs: list[pl.Expr] = []
+        # Attribute name, value column and whether the attribute is mandatory
+        columns: list[tuple[str, str, bool]] = []
+        # Output column -> violated rule
+        outputs: dict[str, tuple[str, AttributeRule]] = {}
+        residual: set[str] = set()
+        unchecked: dict[str, set[str]] = defaultdict(set)
+
+        for index, (attr_name, attribute_rules) in enumerate(rules.attributes):
+            if not all(_vectorized(rule) for rule in attribute_rules):
+                residual.add(attr_name)
+                continue
+
+            # Absent attributes and values other than strings are both null; null rows are told apart below
+            column = f'v{index}'
+            data[column] = [value if (value := fields.get(attr_name)).__class__ is str else None for fields in field_dicts]
+            columns.append((attr_name, column, any(rule.mandatory for rule in attribute_rules)))
+
+            for number, rule in enumerate(attribute_rules):
+                invalid = _invalid_expr(rule, pl.col(column))
+                if invalid is not None:
+                    outputs[f'r{index}_{number}'] = (attr_name, rule)
+                    exprs.append(invalid.alias(f'r{index}_{number}'))
+
+        if not columns:
+            self._residual_by_type[rules.atype] = frozenset(residual)
+            return
+
+        exprs.extend(pl.col(column).is_null().alias(f'n{column}') for _, column, _ in columns)
+        frame = pl.DataFrame(data, schema=dict.fromkeys(data, pl.String)).lazy().select(exprs).with_row_index('row').collect()
+
+        for attr_name, column, mandatory in columns:
+            for row in frame.filter(pl.col(f'n{column}')).get_column('row').to_list():
+                artifact = group[row]
+                if attr_name in artifact.fields:
+                    unchecked[artifact.aid].add(attr_name)
+                elif mandatory:
+                    self._add_finding(artifact, attr_name, None)
+
+        for name, (attr_name, rule) in outputs.items():
+            for row in frame.filter(pl.col(name)).get_column('row').to_list():
+                artifact = group[row]
+                if not value_is_valid(rule, artifact.fields[attr_name]):
+                    self._add_finding(artifact, attr_name, rule)
+
+        self._residual_by_type[rules.atype] = frozenset(residual)
+        for aid, attr_names in unchecked.items():
+            self._residual[aid] = frozenset(residual | attr_names)
+
+    def _add_finding(self, artifact: Artifact, attr_name: str, rule: AttributeRule | None):
+        self._findings.setdefault(artifact.aid, {}).setdefault(attr_name, []).append(rule)
+
+    def covers(self, artifact: Artifact) -> bool:
+        return self._artifacts.get(artifact.aid) is artifact
+
+    def residual(self, artifact: Artifact) -> frozenset[str]:
+        """Attributes of a covered artifact that must still be checked per artifact."""
+        return self._residual.get(artifact.aid) or self._residual_by_type[artifact.atype]
+
+    def findings(self, artifact: Artifact) -> Mapping[str, list[AttributeRule | None]]:
+        """Failed columnar checks of a covered artifact by attribute, in rule order."""
+        return self._findings.get(artifact.aid, {})
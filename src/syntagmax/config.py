@@ -9,6 +9,7 @@ import re
 from pathlib import Path
 import tomllib
 import logging as lg
+from collections.abc import Sequence
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -20,6 +21,7 @@ from benedict import benedict
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 from syntagmax.params import Params
+from syntagmax.discovery import FileDiscovery
 from syntagmax.metamodel import load_metamodel
 from syntagmax.errors import FatalError
 from syntagmax.plugin import PluginConfig
@@ -97,7 +99,7 @@ class InputRecord:
     name: str
     dir: str
     record_base: Path
-    filepaths: list[Path]
+    filepaths: Sequence[Path]
     driver: str
     default_atype: str
     marker: str
@@ -133,6 +135,25 @@ class InputConfig(BaseModel):
         return _validate_no_duplicate_elements(v)
 
 
+VALID_METRIC_KINDS = frozenset({'trace_coverage', 'orphans', 'depth_histogram', 'breakdown', 'suspicious_links'})
+
+
+class MetricDefinition(BaseModel):
+    """One entry of the metrics catalogue."""
+
+    name: str = Field(..., description='Metric name shown in the report')
+    kind: str = Field(..., description='Metric kind: trace_coverage, orphans, depth_histogram, breakdown or suspicious_links')
+    atype: str | None = Field(default=None, description='Restrict the metric to one artifact type (the source type for trace metrics)')
+    by: list[str] = Field(default_factory=list, description='Attributes to group by (breakdown only). Defaults to the status field.')
+
+    @field_validator('kind')
+    @classmethod
+    def validate_kind(cls, v: str) -> str:
+        if v not in VALID_METRIC_KINDS:
+            raise ValueError(f'Unknown metric kind "{v}". Valid kinds: {sorted(VALID_METRIC_KINDS)}')
+        return v
+
+
 class MetricsConfig(BaseModel):
     model_config = ConfigDict(extra='ignore')
     enabled: bool = Field(default=False, description='Enable metrics collection')
@@ -140,6 +161,8 @@ class MetricsConfig(BaseModel):
     status_field: str = Field(default='status', description='Name of the attribute used to track artifact status')
     verify_field: str = Field(default='verify', description='Name of the attribute used to track verification status')
     tbd_marker: str = Field(default='TBD', description='String marker used to identify "To Be Defined" items')
+    catalogue: list[MetricDefinition] | None = Field(default=None, description='Metrics catalogue over all artifacts and trace links')
+    builtin_catalogue: bool = Field(default=False, description='Report the built-in catalogue when no catalogue is defined')
 
 
 class ReportConfig(BaseModel):
@@ -157,6 +180,11 @@ class ImpactConfig(BaseModel):
     task_atype_map: dict[str, str] = Field(default_factory=dict, description='Mapping of parent_atype/child_atype to task atype. Fallback: TASK')
 
 
+class CacheConfig(BaseModel):
+    model_config = ConfigDict(extra='ignore')
+    enabled: bool = Field(default=False, description='Enable the persistent extraction cache')
+    dir: str = Field(default='cache/', description='Directory for cache files (relative to config file directory)')
+
 
 class AiConfig(BaseModel):
     model_config = ConfigDict(extra='ignore')
@@ -201,6 +229,7 @@ class ConfigFile(BaseModel):
     warnings_as_errors: bool = Field(default=False, description='Treat warnings as fatal errors')
     publish: str | None = Field(default=None, description='Global publish config file path, relative to config file directory')
     output_path: str = Field(default='outputs/', description='Base directory for report-like outputs (relative to config file directory)')
+    jobs: int = Field(default=1, ge=0, description='Number of worker processes for extraction (0 = one per CPU)')
     input: list[InputConfig] = Field(..., description='List of input sources to process')
     metrics: MetricsConfig = Field(MetricsConfig(), description='Configuration for metrics collection')
     impact: ImpactConfig = Field(ImpactConfig(), description='Configuration for impact analysis')
@@ -211,6 +240,7 @@ class ConfigFile(BaseModel):
     trace: TraceConfig = Field(default_factory=TraceConfig, description='Configuration for trace export')
     ai: AiConfig = Field(default_factory=AiConfig)
     report: ReportConfig = Field(default_factory=ReportConfig, description='Report formatting options')
+    cache: CacheConfig = Field(default_factory=CacheConfig, description='Configuration for the persistent extraction cache')
 
     @field_validator('log_level')
     @classmethod
@@ -237,6 +267,7 @@ class Config:
     metrics: MetricsConfig
     impact: ImpactConfig
     report: ReportConfig
+    cache: CacheConfig
 
     def __init__(self, params: Params, config_filename: Path):
         self.params = params
@@ -244,11 +275,20 @@ class Config:
         self.metrics = MetricsConfig()
         self.impact = ImpactConfig()
         self.report = ReportConfig()
+        self.cache = CacheConfig()
         self._output_path = 'outputs/'
+        self._jobs = 1
         self._input_records: list[InputRecord] = []
+        self._discovery = FileDiscovery(use_git=not params.get('no_git', False))
         self._plugins = []
         self._read_config(config_filename)
 
+    def __getstate__(self) -> dict:
+        # Loaded plugin modules cannot be pickled; worker processes only need extraction settings
+        state = self.__dict__.copy()
+        state['_plugins'] = []
+        return state
+
     def _read_config(self, config_filename: Path):
         errors: list[str] = []
 
@@ -299,6 +339,7 @@ class Config:
         # Attach WarningsAsErrorsHandler if config enables it but CLI didn't
         if resolved_wae:
             from syntagmax.log_utils import get_warnings_handler
+
             if not get_warnings_handler():
                 wae_handler = WarningsAsErrorsHandler()
                 lg.getLogger().addHandler(wae_handler)
@@ -334,7 +375,9 @@ class Config:
         self.impact = config_model.impact
         self.ai = config_model.ai
         self.report = config_model.report
+        self.cache = config_model.cache
         self._output_path = config_model.output_path
+        self._jobs = config_model.jobs
 
         # CLI --tasks flag overrides config tasks_enabled
         if self.params.get('tasks'):
@@ -390,7 +433,7 @@ class Config:
                 glob = DEFAULT_FILTERS[input_config.driver]
 
             lg.debug(f'Adding input files from {name} with filter {glob}')
-            filepaths = Path(record_base).glob(glob)
+            filepaths = self._discovery.lazy(record_base, glob)
 
             artifact_marker = input_config.marker or input_config.atype
             fragment_markers = input_config.markers
@@ -441,7 +484,7 @@ class Config:
                     name=name,
                     dir=input_config.dir,
                     record_base=record_base,
-                    filepaths=list(filepaths),
+                    filepaths=filepaths,
                     driver=input_config.driver,
                     default_atype=input_config.atype,
                     marker=artifact_marker,
@@ -458,7 +501,6 @@ class Config:
 
         for input_record in self._input_records:
             lg.info(f'Input record: {input_record.name}')
-            lg.debug(f'Input files: {len(input_record.filepaths)}')
 
     def _validate_marker_attribute_collisions(self, errors: list[str]):
         """Validate that configured fragment markers do not collide with metamodel attribute names."""
@@ -521,6 +563,27 @@ class Config:
             return p
         return Path(self._root_dir, self._output_path)
 
+    def cache_dir(self) -> Path:
+        """Resolve the cache directory relative to the config file directory."""
+        p = Path(self.cache.dir)
+        if p.is_absolute():
+            return p
+        return Path(self._root_dir, self.cache.dir)
+
+    def jobs(self) -> int:
+        """Resolve the number of extraction worker processes: CLI --jobs > config jobs > 1."""
+        jobs = self.params.get('jobs')
+        if jobs is None:
+            jobs = self._jobs
+        if jobs == 0:
+            jobs = os.cpu_count() or 1
+        return jobs
+
+    def cache_enabled(self) -> bool:
+        # Incremental analysis is built on top of the extraction cache
+        enabled = self.cache.enabled or self.params.get('incremental', False)
+        return enabled and not self.params.get('no_cache', False)
+
     def resolve_task_template(self, record: 'InputRecord | None') -> tuple[Path | None, str]:
         """Resolve task template path following publish-like resolution order.
         Returns (template_dir, template_name) or (None, 'task.j2') for built-in default.
@@ -0,0 +1,175 @@
+# SPDX-License-Identifier: MIT
+
+# Author: Boris Resnick
+# Created: 2026-10-17
+# Description: Lazy, shared discovery of input files, using git ls-files inside repositories.
+
+import fnmatch
+import glob
+import logging as lg
+import os
+import re
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+
+
+class GlobMatcher:
+    """A compiled input filter glob with the semantics of Path.glob ('**' spans zero or more directories).
+
+    Besides matching relative file paths, it tells whether a directory can contain matches, so a walk
+    can prune directories outside the literal prefix of the pattern (e.g. everything but docs/ for
+    'docs/**/*.md').
+    """
+
+    def __init__(self, pattern: str):
+        self.pattern = pattern
+        self._regex = re.compile(glob.translate(pattern, recursive=True, include_hidden=True))
+        parts = pattern.split('/')
+        self._prefix: list[re.Pattern[str]] = []
+        self._open = parts[-1] == '**'
+        for part in parts[:-1]:
+            if part == '**':
+                self._open = True
+                break
+            self._prefix.append(re.compile(fnmatch.translate(part)))
+
+    def matches(self, rel_path: str) -> bool:
+        """Whether a slash-separated path relative to the searched directory matches the pattern."""
+        return self._regex.match(rel_path) is not None
+
+    def can_contain(self, rel_dir: str) -> bool:
+        """Whether files below a slash-separated directory path (relative to the searched one) can match."""
+        for i, part in enumerate(rel_dir.split('/')):
+            if i >= len(self._prefix):
+                return self._open
+            if not self._prefix[i].match(part):
+                return False
+        return True
+
+
+class FileDiscovery:
+    """Lists the files of input directories on demand and shares the listings between records.
+
+    Inside a git repository the listing comes from `git ls-files` (tracked and untracked files, without
+    ignored ones), read once per repository, so ignored build trees and worktrees are never walked.
+    Outside a repository, or when git is disabled, the directory is walked with pruning by the glob.
+    """
+
+    def __init__(self, use_git: bool = True):
+        self._use_git = use_git
+        # Complete listings (paths relative to the root, sorted) of repository roots
+        self._listings: dict[Path, list[str]] = {}
+        # Repository root of each directory looked up, None outside a repository
+        self._roots: dict[Path, Path | None] = {}
+
+    def find(self, directory: Path, pattern: str) -> list[Path]:
+        """Files below directory that match the glob pattern, sorted by path."""
+        matcher = GlobMatcher(pattern)
+        listing = self._git_listing(directory) if self._use_git else None
+
+        if listing is None:
+            return [Path(directory, rel) for rel in sorted(self._walk(directory, matcher))]
+
+        root, files = listing
+        prefix = Path(directory).resolve().relative_to(root).as_posix()
+        prefix = '' if prefix == '.' else prefix + '/'
+        start = len(prefix)
+        return [Path(directory, rel[start:]) for rel in files if rel.startswith(prefix) and matcher.matches(rel[start:])]
+
+    def lazy(self, directory: Path, pattern: str) -> 'LazyFileList':
+        return LazyFileList(self, directory, pattern)
+
+    def _git_listing(self, directory: Path) -> tuple[Path, list[str]] | None:
+        resolved = Path(directory).resolve()
+        if resolved not in self._roots:
+            # Looked up per directory: a worktree nested in another repository has its own listing
+            self._roots[resolved] = self._find_root(resolved)
+        root = self._roots[resolved]
+        if root is None:
+            return None
+        if root not in self._listings:
+            try:
+                self._listings[root] = _ls_files(_git_repo(root))
+            except Exception as e:
+                lg.debug(f'Listing {directory} without git: {e}')
+                self._roots[resolved] = None
+                return None
+            lg.debug(f'Listed {len(self._listings[root])} files of the repository at {root}')
+        return root, self._listings[root]
+
+    @staticmethod
+    def _find_root(directory: Path) -> Path | None:
+        if not directory.is_dir():
+            return None
+        try:
+            return Path(_git_repo(directory, search_parent_directories=True).working_tree_dir).resolve()
+        except Exception as e:
+            lg.debug(f'{directory} is not in a git repository: {e}')
+            return None
+
+    def _walk(self, directory: Path, matcher: GlobMatcher) -> Iterator[str]:
+        for dirpath, dirnames, filenames in os.walk(directory):
+            rel_dir = Path(dirpath).relative_to(directory).as_posix()
+            prefix = '' if rel_dir == '.' else rel_dir + '/'
+            dirnames[:] = [d for d in dirnames if matcher.can_contain(prefix + d)]
+            for name in filenames:
+                if matcher.matches(prefix + name):
+                    yield prefix + name
+
+
+def _git_repo(path: Path, **kwargs):
+    import git
+
+    return git.Repo(path, **kwargs)
+
+
+def _ls_files(repo) -> list[str]:
+    """Files of the worktree that git knows or would add: tracked ones that still exist, and untracked ones not ignored."""
+
+    def paths(*args: str) -> list[str]:
+        return [p for p in repo.git.ls_files('-z', *args).split('\0') if p]
+
+    # Submodules are gitlinks (mode 160000) in the index, not files
+    tracked = [entry.split('\t', 1)[1] for entry in paths('--stage') if not entry.startswith('160000 ')]
+    deleted = set(paths('--deleted'))
+    files = {p for p in tracked if p not in deleted}
+    # Untracked nested repositories are listed as directories
+    files.update(p for p in paths('--others', '--exclude-standard') if not p.endswith('/'))
+    return sorted(files)
+
+
+class LazyFileList(Sequence[Path]):
+    """The files of an input record, discovered on first use."""
+
+    def __init__(self, discovery: FileDiscovery, directory: Path, pattern: str):
+        self._discovery = discovery
+        self._directory = directory
+        self._pattern = pattern
+        self._paths: list[Path] | None = None
+
+    def _resolve(self) -> list[Path]:
+        if self._paths is None:
+            self._paths = self._discovery.find(self._directory, self._pattern)
+        return self._paths
+
+    def __getitem__(self, index):
+        return self._resolve()[index]
+
+    def __len__(self) -> int:
+        return len(self._resolve())
+
+    def __iter__(self) -> Iterator[Path]:
+        return iter(self._resolve())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (list, tuple, LazyFileList)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        state = 'pending' if self._paths is None else f'{len(self._paths)} files'
+        return f'LazyFileList({str(self._directory)!r}, {self._pattern!r}, {state})'
+
+    def __reduce__(self):
+        # Worker processes receive the discovered list, not the discovery
+        return list, (self._resolve(),)
@@ -5,7 +5,12 @@
 # Description: Extracts artifacts from a given file using the appropriate extractor
 
 import logging as lg
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
 
+from syntagmax.blocks import Block
+from syntagmax.extractors.extractor import Extractor, ExtractorResult
 from syntagmax.extractors.text import TextExtractor
 from syntagmax.extractors.sidecar import SidecarExtractor
 from syntagmax.extractors.obsidian import ObsidianExtractor
@@ -13,7 +18,10 @@ from syntagmax.extractors.ipynb import IPynbExtractor
 from syntagmax.extractors.simple_markdown import SimpleMarkdownExtractor
 from syntagmax.artifact import Artifact, UNDEFINED_ID
 from syntagmax.config import Config
-from syntagmax.i18n import _
+from syntagmax.extract_cache import CacheStats, ExtractionCache, LogRecords, open_extraction_cache, rehydrate_blocks, replay_log_records
+from syntagmax.i18n import _, setup_i18n
+from syntagmax.interning import intern_artifact
+from syntagmax.log_utils import capture_warnings
 from syntagmax.report import ReportError, CAT_EXTRACTION, CAT_DUPLICATE
 from syntagmax.utils import pprint
 
@@ -31,16 +39,38 @@ def print_artifact(artifact: Artifact):
     pprint(f'[magenta]{artifact.driver}[/magenta] :: [cyan]{artifact.atype}[/cyan] :: [green]{artifact.aid}[/green] (parents: {len(artifact.pids)})')
 
 
-def extract(config: Config, errors) -> list[Artifact]:
+def extract(config: Config, errors, cache_stats: CacheStats | None = None, cache: ExtractionCache | None = None) -> list[Artifact]:
     artifacts: list[Artifact] = []
+    cache = cache or open_extraction_cache(config)
 
-    for record in config.input_records():
-        lg.debug(f'Processing record: {record.name} ({record.driver})')
+    if cache and cache_stats is not None:
+        cache.stats = cache_stats
+
+    records = config.input_records()
+    extractors: list[Extractor] = []
+
+    for record in records:
         extractor = EXTRACTORS[record.driver](config, record, config.metamodel)
-        record_artifacts, record_errors = extractor.extract()
+        extractor.cache = cache.for_record(record) if cache else None
+        extractors.append(extractor)
+
+    jobs = config.jobs()
+
+    if jobs > 1:
+        results = _extract_parallel(config, extractors, jobs)
+    else:
+        results = []
+        for record, extractor in zip(records, extractors):
+            lg.debug(f'Processing record: {record.name} ({record.driver})')
+            results.append(extractor.extract())
+
+    for record, (record_artifacts, record_errors) in zip(records, results):
         artifacts.extend(record_artifacts)
         errors.extend(ReportError(message=err, category=CAT_EXTRACTION, input_record=record.name) for err in record_errors)
 
+    if cache:
+        cache.save()
+
     if config.params.get('log_level') == 'debug':
         lg.debug('Listing raw artifacts:')
 
@@ -50,6 +80,93 @@ def extract(config: Config, errors) -> list[Artifact]:
     return artifacts
 
 
+# Per-process state of extraction workers, set up by _init_worker
+_worker_config: Config | None = None
+_worker_extractors: dict[int, Extractor] = {}
+
+
+def _init_worker(config: Config):
+    global _worker_config
+
+    # Workers report diagnostics back to the parent instead of logging them directly
+    root_logger = lg.getLogger()
+    for h in list(root_logger.handlers):
+        root_logger.removeHandler(h)
+    root_logger.addHandler(lg.NullHandler())
+
+    setup_i18n(config.language)
+    _worker_config = config
+    _worker_extractors.clear()
+
+
+def _extract_file_in_worker(task: tuple[int, Path]) -> tuple[list[Block], LogRecords]:
+    record_index, filepath = task
+    extractor = _worker_extractors.get(record_index)
+
+    if extractor is None:
+        assert _worker_config is not None
+        record = _worker_config.input_records()[record_index]
+        extractor = EXTRACTORS[record.driver](_worker_config, record, _worker_config.metamodel)
+        _worker_extractors[record_index] = extractor
+
+    with capture_warnings() as log_records:
+        blocks = extractor.extract_blocks_from_file(filepath)
+
+    return blocks, log_records
+
+
+def _extract_parallel(config: Config, extractors: list[Extractor], jobs: int) -> list[ExtractorResult]:
+    """Extract all records with a process pool, producing the same results in the same order as a serial run."""
+    records = config.input_records()
+    file_blocks: list[list[tuple[Path, list[Block] | None]]] = []
+    tasks: list[tuple[int, Path]] = []
+
+    # Cache lookups stay in this process; only misses are sent to the workers
+    for index, (record, extractor) in enumerate(zip(records, extractors)):
+        lg.debug(f'Processing record: {record.name} ({record.driver})')
+        record_blocks = []
+
+        for filepath in record.filepaths:
+            blocks = extractor.cached_blocks(filepath)
+            if blocks is None:
+                tasks.append((index, filepath))
+            record_blocks.append((filepath, blocks))
+
+        file_blocks.append(record_blocks)
+
+    workers = min(jobs, len(tasks))
+    fresh = iter([])
+
+    if workers > 1:
+        lg.info(f'Extracting {len(tasks)} file(s) with {workers} worker processes')
+        chunksize = max(1, len(tasks) // (workers * 4))
+
+        # Spawned workers behave the same on every platform and do not inherit threads or locks of this process
+        context = multiprocessing.get_context('spawn')
+
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker, initargs=(config,)) as executor:
+            fresh = iter(list(executor.map(_extract_file_in_worker, tasks, chunksize=chunksize)))
+
+    results: list[ExtractorResult] = []
+
+    for record, extractor, record_blocks in zip(records, extractors, file_blocks):
+        resolved: list[tuple[Path, list[Block]]] = []
+
+        for filepath, blocks in record_blocks:
+            if blocks is None and workers > 1:
+                blocks, log_records = next(fresh)
+                replay_log_records(log_records)
+                blocks = rehydrate_blocks(blocks, config, record)
+                extractor.store_blocks(filepath, blocks, log_records)
+            elif blocks is None:
+                blocks = extractor.extract_uncached(filepath)
+            resolved.append((filepath, blocks))
+
+        results.append(extractor.collect_results(resolved))
+
+    return results
+
+
 def build_artifact_map(artifacts_list: list[Artifact], errors) -> dict[str, Artifact]:
     artifacts: dict[str, Artifact] = {}
 
@@ -79,6 +196,6 @@ def build_artifact_map(artifacts_list: list[Artifact], errors) -> dict[str, Arti
                 )
             )
             continue
-        artifacts[a.aid] = a
+        artifacts[a.aid] = intern_artifact(a)
 
     return artifacts
@@ -0,0 +1,273 @@
+# SPDX-License-Identifier: MIT
+
+# Author: Boris Resnick
+# Created: 2026-10-16
+# Description: Persistent per-file extraction cache keyed by content hash.
+
+import hashlib
+import json
+import logging as lg
+import os
+import pickle
+from dataclasses import dataclass, field
+from importlib.metadata import version
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from syntagmax.blocks import ArtifactBlock, Block
+
+if TYPE_CHECKING:
+    from syntagmax.config import Config, InputRecord
+
+# Bump when the pickled block layout changes in an incompatible way
+CACHE_FORMAT = 3
+
+type LogRecords = list[tuple[int, str]]
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+
+
+@dataclass
+class CacheEntry:
+    signature: tuple
+    digest: str
+    payload: bytes
+    dependencies: tuple[str, ...] = ()
+
+
+@dataclass
+class _Pending:
+    signature: tuple
+    digest: str
+
+
+def _metamodel_fingerprint(metamodel: dict | None) -> str:
+    data = json.dumps(metamodel, sort_keys=True, default=str)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+def record_fingerprint(config: 'Config', record: 'InputRecord') -> str:
+    """Fingerprint everything besides file contents that influences extraction of a record."""
+    payload = {
+        'format': CACHE_FORMAT,
+        'version': version('syntagmax'),
+        'driver': record.driver,
+        'name': record.name,
+        'base_dir': config.base_dir().absolute().as_posix(),
+        'record_base': Path(record.record_base).absolute().as_posix(),
+        'default_atype': record.default_atype,
+        'marker': record.marker,
+        'markers': record.markers,
+        'exclude_elements': [(e.name, e.mode) for e in record.exclude_elements],
+        'language': getattr(config, 'language', 'en'),
+        'metamodel': _metamodel_fingerprint(config.metamodel),
+    }
+
+    if record.driver == 'obsidian':
+        payload['strict_line_breaks'] = config.resolve_strict_line_breaks()
+
+    data = json.dumps(payload, sort_keys=True)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+def _stat_signature(paths: list[Path]) -> tuple:
+    signature = []
+    for path in paths:
+        try:
+            st = path.stat()
+            signature.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            signature.append(None)
+    return tuple(signature)
+
+
+def _content_digest(paths: list[Path]) -> str:
+    h = hashlib.sha256()
+    for path in paths:
+        try:
+            data = path.read_bytes()
+        except OSError:
+            h.update(b'\x00missing\x00')
+            continue
+        h.update(len(data).to_bytes(8, 'little'))
+        h.update(data)
+    return h.hexdigest()
+
+
+def replay_log_records(log_records: LogRecords):
+    for level, message in log_records:
+        lg.log(level, message)
+
+
+def rehydrate_blocks(blocks: list[Block], config: 'Config', record: 'InputRecord') -> list[Block]:
+    """Reattach the config and input record that unpickled artifacts do not carry."""
+    for block in blocks:
+        if isinstance(block, ArtifactBlock):
+            block.artifact._config = config
+            block.artifact.record = record
+
+    return blocks
+
+
+class RecordCache:
+    """Cached block lists of the files of a single input record."""
+
+    def __init__(self, config: 'Config', record: 'InputRecord', path: Path, stats: CacheStats, trusted: dict[str, str] | None = None):
+        self._config = config
+        self._record = record
+        self._path = path
+        self._stats = stats
+        self._trusted = trusted or {}
+        self.trusted_hits: set[str] = set()
+        self._fingerprint = record_fingerprint(config, record)
+        self._entries: dict[str, CacheEntry] = {}
+        self._used: set[str] = set()
+        self._pending: dict[str, _Pending] = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        if not self._path.exists():
+            return
+
+        try:
+            with open(self._path, 'rb') as f:
+                data = pickle.load(f)
+        except Exception as e:
+            lg.warning(f'Ignoring unreadable extraction cache {self._path}: {e}')
+            return
+
+        if data.get('fingerprint') != self._fingerprint:
+            lg.debug(f'Extraction cache for {self._record.name} is stale, rebuilding')
+            self._dirty = True
+            return
+
+        self._entries = data.get('entries', {})
+
+    def _key(self, filepath: Path) -> str:
+        return Path(filepath).absolute().as_posix()
+
+    def get(self, filepath: Path, dependencies: list[Path]) -> list[Block] | None:
+        """Return rehydrated blocks for an unchanged file, or None on a cache miss."""
+        key = self._key(filepath)
+        self._used.add(key)
+        entry = self._entries.get(key)
+
+        # Entries known to be unchanged (e.g. from git history) are reused without touching the file system
+        if entry is not None and self._trusted.get(key) == entry.digest:
+            self.trusted_hits.add(key)
+            return self._hit(entry)
+
+        signature = _stat_signature(dependencies)
+
+        if entry is not None and entry.signature == signature:
+            return self._hit(entry)
+
+        digest = _content_digest(dependencies)
+
+        if entry is not None and entry.digest == digest:
+            # Touched but identical content: refresh the signature only
+            entry.signature = signature
+            self._dirty = True
+            return self._hit(entry)
+
+        self._stats.misses += 1
+        self._pending[key] = _Pending(signature=signature, digest=digest)
+        return None
+
+    def put(self, filepath: Path, dependencies: list[Path], blocks: list[Block], log_records: LogRecords):
+        key = self._key(filepath)
+        pending = self._pending.pop(key, None)
+
+        if pending is None:
+            pending = _Pending(signature=_stat_signature(dependencies), digest=_content_digest(dependencies))
+
+        try:
+            payload = pickle.dumps((blocks, log_records), protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            lg.debug(f'Not caching {filepath}: {e}')
+            return
+
+        self._entries[key] = CacheEntry(
+            signature=pending.signature,
+            digest=pending.digest,
+            payload=payload,
+            dependencies=tuple(Path(d).absolute().as_posix() for d in dependencies),
+        )
+        self._used.add(key)
+        self._dirty = True
+
+    def _hit(self, entry: CacheEntry) -> list[Block]:
+        self._stats.hits += 1
+        blocks, log_records = pickle.loads(entry.payload)
+
+        # Replay diagnostics so that a cached run reports the same warnings as a fresh one
+        replay_log_records(log_records)
+        return rehydrate_blocks(blocks, self._config, self._record)
+
+    def used_entries(self) -> dict[str, CacheEntry]:
+        return {key: self._entries[key] for key in self._used if key in self._entries}
+
+    def save(self):
+        stale = set(self._entries) - self._used
+        if not self._dirty and not stale:
+            return
+
+        for key in stale:
+            del self._entries[key]
+
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._path.with_suffix('.tmp')
+
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({'fingerprint': self._fingerprint, 'entries': self._entries}, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        os.replace(tmp_path, self._path)
+        self._dirty = False
+
+
+@dataclass
+class ExtractionCache:
+    """On-disk store of extracted blocks under <cache dir>/extract, one file per input record."""
+
+    config: 'Config'
+    directory: Path
+    stats: CacheStats = field(default_factory=CacheStats)
+    trusted: dict[str, str] = field(default_factory=dict)
+    _records: list[RecordCache] = field(default_factory=list)
+
+    def for_record(self, record: 'InputRecord') -> RecordCache:
+        name = hashlib.sha256(record.name.encode('utf-8')).hexdigest()[:16]
+        cache = RecordCache(self.config, record, self.directory / f'{name}.pickle', self.stats, self.trusted)
+        self._records.append(cache)
+        return cache
+
+    def used_entries(self) -> dict[str, CacheEntry]:
+        entries: dict[str, CacheEntry] = {}
+        for cache in self._records:
+            entries.update(cache.used_entries())
+        return entries
+
+    def trusted_hits(self) -> set[str]:
+        return set().union(*(cache.trusted_hits for cache in self._records))
+
+    def save(self):
+        for cache in self._records:
+            try:
+                cache.save()
+            except OSError as e:
+                lg.warning(f'Could not write extraction cache: {e}')
+
+        lg.info(f'Extraction cache: {self.stats.hits} hit(s), {self.stats.misses} miss(es)')
+
+
+def open_extraction_cache(config: 'Config') -> ExtractionCache | None:
+    """Return the extraction cache for the project, or None when caching is disabled."""
+    if not config.cache_enabled():
+        return None
+
+    return ExtractionCache(config=config, directory=config.cache_dir() / 'extract')
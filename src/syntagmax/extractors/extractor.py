@@ -7,7 +7,7 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import TYPE_CHECKING, Sequence
+from typing import TYPE_CHECKING, Iterable, Sequence
 import logging as lg
 
 from syntagmax.config import InputRecord, Config
@@ -15,6 +15,7 @@ from syntagmax.artifact import Artifact
 
 if TYPE_CHECKING:
     from syntagmax.blocks import Block
+    from syntagmax.extract_cache import LogRecords, RecordCache
 
 type ExtractorResult = tuple[Sequence[Artifact], list[str]]
 
@@ -24,36 +25,44 @@ class Extractor:
         self._config = config
         self._record = record
         self._metamodel = metamodel
+        self.cache: RecordCache | None = None
         self._is_multiple_cache: dict[tuple[str, str], bool] = {}
         self._yaml_bool_cache: dict[tuple[str, str, bool], str] = {}
 
     def driver(self) -> str: ...
 
     def extract_from_file(self, filepath: Path) -> ExtractorResult:
-        from syntagmax.blocks import ArtifactBlock, ErrorBlock
-
-        blocks = self.extract_blocks_from_file(filepath)
-        artifacts = [b.artifact for b in blocks if isinstance(b, ArtifactBlock)]
-        errors = [b.message for b in blocks if isinstance(b, ErrorBlock)]
-        return artifacts, errors
+        return self.collect_results([(filepath, self.load_blocks(filepath))], check_record=False)
 
     def extract(self) -> ExtractorResult:
+        return self.collect_results((filepath, self.load_blocks(filepath)) for filepath in self._record.filepaths)
+
+    def collect_results(self, file_blocks: Iterable[tuple[Path, list[Block]]], check_record: bool = True) -> ExtractorResult:
+        """Derive artifacts and errors from per-file block lists, in the given file order."""
+        from syntagmax.blocks import ArtifactBlock, ErrorBlock
+
         errors: list[str] = []
         artifacts: list[Artifact] = []
 
-        for filepath in self._record.filepaths:
+        for filepath, blocks in file_blocks:
             lg.debug(f'Processing file: {filepath}')
-            file_artifacts, file_errors = self.extract_from_file(filepath)
-            artifacts.extend(file_artifacts)
-            errors.extend(file_errors)
+            artifacts.extend(b.artifact for b in blocks if isinstance(b, ArtifactBlock))
+            errors.extend(b.message for b in blocks if isinstance(b, ErrorBlock))
 
             if errors:
                 lg.debug(f'Errors were reported for {filepath}')
             else:
                 lg.debug(f'Successfully processed file: {filepath}')
 
+        if check_record:
+            errors.extend(self.check_record())
+
         return artifacts, errors
 
+    def check_record(self) -> list[str]:
+        """Record-level checks run once after all files have been extracted."""
+        return []
+
     def _yaml_value_to_str(self, value, atype: str, attr_name: str) -> str:
         """Convert a YAML-parsed value to a string, handling boolean coercion.
 
@@ -101,6 +110,42 @@ class Extractor:
     def extract_blocks_from_file(self, filepath: Path) -> list['Block']:
         return []
 
+    def cache_dependencies(self, filepath: Path) -> list[Path]:
+        """Files whose contents determine the blocks extracted from filepath."""
+        return [filepath]
+
+    def load_blocks(self, filepath: Path) -> list['Block']:
+        """Extract blocks from a file, going through the extraction cache when one is attached."""
+        blocks = self.cached_blocks(filepath)
+
+        if blocks is not None:
+            return blocks
+
+        return self.extract_uncached(filepath)
+
+    def extract_uncached(self, filepath: Path) -> list['Block']:
+        """Extract blocks from a file and store them in the extraction cache, if any."""
+        if self.cache is None:
+            return self.extract_blocks_from_file(filepath)
+
+        from syntagmax.log_utils import capture_warnings
+
+        with capture_warnings() as log_records:
+            blocks = self.extract_blocks_from_file(filepath)
+
+        self.store_blocks(filepath, blocks, log_records)
+        return blocks
+
+    def cached_blocks(self, filepath: Path) -> list['Block'] | None:
+        if self.cache is None:
+            return None
+
+        return self.cache.get(filepath, self.cache_dependencies(filepath))
+
+    def store_blocks(self, filepath: Path, blocks: list['Block'], log_records: 'LogRecords'):
+        if self.cache is not None:
+            self.cache.put(filepath, self.cache_dependencies(filepath), blocks, log_records)
+
     def update_artifact(self, artifact: Artifact, fields: dict[str, str]): ...
 
     def update_artifacts(self, loc_file: str, updates: list[tuple[Artifact, str]]):
@@ -5,9 +5,9 @@
 # Description: Extracts artifacts from ipynb files.
 
 from pathlib import Path
-import json
 import re
 
+from syntagmax.extractors.ipynb_stream import read_cells
 from syntagmax.extractors.markdown import MarkdownExtractor
 from syntagmax.artifact import NotebookLocation
 from syntagmax.blocks import Block, TextBlock, ErrorBlock
@@ -19,8 +19,10 @@ class IPynbExtractor(MarkdownExtractor):
         return 'ipynb'
 
     def extract_blocks_from_file(self, filepath: Path) -> list[Block]:
+        # Streamed, so that large outputs such as embedded images are never loaded
         try:
-            notebook = json.loads(filepath.read_text(encoding='utf-8'))
+            with open(filepath, encoding='utf-8') as f:
+                cells = read_cells(f)
         except Exception as e:
             return [ErrorBlock(message=_("Error extracting from {file}: {error}").format(file=filepath, error=str(e)), raw_text='')]
 
@@ -29,10 +31,8 @@ class IPynbExtractor(MarkdownExtractor):
         marker = self._record.marker
         marker_pattern = re.compile(rf'\[{marker}\]', re.IGNORECASE)
 
-        for cell_idx, cell in enumerate(notebook.get('cells', [])):
-            source = ''.join(cell.get('source', []))
-
-            if cell.get('cell_type') == 'markdown' and marker_pattern.search(source):
+        for cell_idx, (cell_type, source) in enumerate(cells):
+            if cell_type == 'markdown' and marker_pattern.search(source):
 
                 def location_builder(start, end, ci=cell_idx):
                     return NotebookLocation(loc_file=loc_file, loc_lines=(start, end), loc_cell=ci)
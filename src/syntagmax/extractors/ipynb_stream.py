@@ -0,0 +1,247 @@
+# SPDX-License-Identifier: MIT
+
+# Author: Boris Resnick
+# Created: 2026-10-17
+# Description: Streaming reader of notebook cells that skips outputs without materializing them.
+
+import json
+import re
+from collections.abc import Iterator
+from typing import TextIO
+
+CHUNK_SIZE = 1 << 16
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_STRING_STOP = re.compile(r'["\\\x00-\x1f]')
+_ESCAPE = re.compile(r'\\(?:["\\/bfnrt]|u[0-9a-fA-F]{4})')
+_NUMBER_CHARS = re.compile(r'[-+0-9.eE]+')
+_NUMBER = re.compile(r'-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?')
+_LITERALS = {'t': 'true', 'f': 'false', 'n': 'null'}
+
+
+class NotebookSyntaxError(ValueError):
+    pass
+
+
+class _Scanner:
+    """A JSON tokenizer over a text stream that holds at most one chunk plus a few characters.
+
+    Values can be read or skipped; skipped values are fully validated but never built.
+    """
+
+    def __init__(self, stream: TextIO, chunk_size: int):
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._buf = ''
+        self._pos = 0
+        # Characters dropped from the front of the buffer, for error positions
+        self._offset = 0
+
+    def _fill(self) -> bool:
+        chunk = self._stream.read(self._chunk_size)
+        if not chunk:
+            return False
+        self._offset += self._pos
+        self._buf = self._buf[self._pos :] + chunk
+        self._pos = 0
+        return True
+
+    def _error(self, message: str):
+        raise NotebookSyntaxError(f'{message} (char {self._offset + self._pos})')
+
+    def peek(self) -> str:
+        """The next character after whitespace, or '' at the end of the stream."""
+        while True:
+            self._pos = _WHITESPACE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            self._error(f'Expecting {char!r}')
+        self._pos += 1
+
+    def string(self, keep: bool = True) -> str | None:
+        self.expect('"')
+        parts: list[str] = []
+
+        while True:
+            stop = _STRING_STOP.search(self._buf, self._pos)
+
+            if stop is None:
+                if keep:
+                    parts.append(self._buf[self._pos :])
+                self._pos = len(self._buf)
+                if not self._fill():
+                    self._error('Unterminated string')
+                continue
+
+            start = stop.start()
+
+            if stop.group() == '"':
+                if keep:
+                    parts.append(self._buf[self._pos : start])
+                self._pos = start + 1
+                return json.loads('"' + ''.join(parts) + '"') if keep else None
+
+            if stop.group() != '\\':
+                self._pos = start
+                self._error('Invalid control character')
+
+            escape = _ESCAPE.match(self._buf, start)
+            if escape is None:
+                # The escape may continue in the next chunk
+                if keep:
+                    parts.append(self._buf[self._pos : start])
+                self._pos = start
+                if len(self._buf) - start < 6 and self._fill():
+                    continue
+                self._error('Invalid escape')
+
+            if keep:
+                parts.append(self._buf[self._pos : escape.end()])
+            self._pos = escape.end()
+
+    def _number(self):
+        while True:
+            # Take the whole run of number characters, which may continue in the next chunk, then check it
+            lexeme = _NUMBER_CHARS.match(self._buf, self._pos)
+            if lexeme.end() == len(self._buf) and self._fill():
+                continue
+            if not _NUMBER.fullmatch(lexeme.group()):
+                self._error('Invalid number')
+            self._pos = lexeme.end()
+            return
+
+    def _literal(self, word: str):
+        while len(self._buf) - self._pos < len(word) and self._fill():
+            pass
+        if not self._buf.startswith(word, self._pos):
+            self._error('Expecting value')
+        self._pos += len(word)
+
+    def skip_value(self) -> None:
+        """Validate and drop the next value, however large or deeply nested."""
+        closers: list[str] = []
+
+        while True:
+            char = self.peek()
+
+            if char == '{':
+                self._pos += 1
+                if self.peek() == '}':
+                    self._pos += 1
+                else:
+                    closers.append('}')
+                    self.string(keep=False)
+                    self.expect(':')
+                    continue
+            elif char == '[':
+                self._pos += 1
+                if self.peek() == ']':
+                    self._pos += 1
+                else:
+                    closers.append(']')
+                    continue
+            elif char == '"':
+                self.string(keep=False)
+            elif char and char in '-0123456789':
+                self._number()
+            elif char and char in _LITERALS:
+                self._literal(_LITERALS[char])
+            else:
+                self._error('Expecting value')
+
+            # A value is complete: close finished containers, or move on to the next element
+            while closers:
+                char = self.peek()
+                if char == ',':
+                    self._pos += 1
+                    if closers[-1] == '}':
+                        self.string(keep=False)
+                        self.expect(':')
+                    break
+                if char != closers[-1]:
+                    self._error(f"Expecting ',' or {closers[-1]!r}")
+                self._pos += 1
+                closers.pop()
+            else:
+                return
+
+    def members(self) -> Iterator[str]:
+        """Keys of an object; the caller reads or skips each value before asking for the next key."""
+        self.expect('{')
+        if self.peek() == '}':
+            self._pos += 1
+            return
+        while True:
+            key = self.string()
+            self.expect(':')
+            yield key
+            char = self.peek()
+            self._pos += 1
+            if char == '}':
+                return
+            if char != ',':
+                self._pos -= 1
+                self._error("Expecting ',' or '}'")
+
+    def elements(self) -> Iterator[None]:
+        """Positions of array elements; the caller reads or skips each element."""
+        self.expect('[')
+        if self.peek() == ']':
+            self._pos += 1
+            return
+        while True:
+            yield None
+            char = self.peek()
+            self._pos += 1
+            if char == ']':
+                return
+            if char != ',':
+                self._pos -= 1
+                self._error("Expecting ',' or ']'")
+
+    def end(self):
+        if self.peek():
+            self._error('Extra data')
+
+
+def _read_cell(scanner: _Scanner) -> tuple[str | None, str]:
+    cell_type = None
+    source = ''
+
+    for key in scanner.members():
+        if key == 'cell_type' and scanner.peek() == '"':
+            cell_type = scanner.string()
+        elif key == 'source' and scanner.peek() == '[':
+            source = ''.join(scanner.string() for _ in scanner.elements())
+        elif key == 'source' and scanner.peek() == '"':
+            source = scanner.string()
+        else:
+            scanner.skip_value()
+
+    return cell_type, source
+
+
+def read_cells(stream: TextIO, chunk_size: int = CHUNK_SIZE) -> list[tuple[str | None, str]]:
+    """The type and joined source of each cell of a notebook, in order.
+
+    The whole document is validated as JSON, but only cell types and sources are kept; outputs,
+    attachments and metadata are skipped chunk by chunk, so memory does not grow with their size.
+    Raises NotebookSyntaxError for malformed JSON or a notebook that is not an object of cell objects.
+    """
+    scanner = _Scanner(stream, chunk_size)
+    cells: list[tuple[str | None, str]] = []
+
+    for key in scanner.members():
+        if key != 'cells':
+            scanner.skip_value()
+            continue
+        # As with json.loads, a repeated key replaces the earlier value
+        cells = [_read_cell(scanner) for _ in scanner.elements()]
+
+    scanner.end()
+    return cells
@@ -4,32 +4,66 @@
 # Created: 2026-03-22
 # Description: Base class for extracting artifacts from Markdown content.
 
+from bisect import bisect_left
 from pathlib import Path
 import logging as lg
 import re
 from typing import Callable
-from benedict import benedict
-from lark import Lark, Transformer, exceptions
+from lark import Transformer, exceptions
 
 from syntagmax.extractors.extractor import Extractor, ExtractorResult
 from syntagmax.config import Config, InputRecord
 from syntagmax.artifact import ArtifactBuilder, Artifact, Location, UNDEFINED_ID
 from syntagmax.blocks import Block, TextBlock, ArtifactBlock, ErrorBlock
+from syntagmax.lark_utils import get_parser, read_grammar
 
+from syntagmax.extractors.markdown_fastpath import RequirementSegment, recognize_segment
 from syntagmax.extractors.markdown_filters import (
     ElementFilterMixin,
     apply_soft_line_breaks as apply_soft_line_breaks,  # noqa: F401 — re-exported
 )
 from syntagmax.extractors.markdown_markers import MarkerSplitterMixin
 from syntagmax.i18n import _
+from syntagmax.yaml_utils import safe_load
+
+
+def _newline_offsets(text: str) -> list[int]:
+    """Offsets of all newlines in text, for line lookups by bisection."""
+    offsets = []
+    pos = text.find('\n')
+    while pos != -1:
+        offsets.append(pos)
+        pos = text.find('\n', pos + 1)
+    return offsets
+
+
+def _line_at(newlines: list[int], pos: int) -> int:
+    """1-based line number of the character at pos."""
+    return bisect_left(newlines, pos) + 1
 
 
 class MarkdownArtifact(Artifact):
+    __slots__ = ('_yaml_data', '_yaml_text', 'source_metadata')
+
     def __init__(self, config: Config):
         super().__init__(config)
-        self.yaml_data: benedict | None = None
+        self._yaml_data: dict | None = None
+        self._yaml_text: str | None = None
         self.source_metadata: dict[str, str] = {}
 
+    @property
+    def yaml_data(self) -> dict | None:
+        """The YAML block of the requirement, parsed from its raw text on first access."""
+        if self._yaml_text is not None:
+            self._yaml_data = safe_load(self._yaml_text) if self._yaml_text else {'attrs': {}}
+            self._yaml_text = None
+        return self._yaml_data
+
+    @yaml_data.setter
+    def yaml_data(self, value: dict | None):
+        self._yaml_data = value
+        self._yaml_text = None
+
 
 class MarkdownTransformer(Transformer):
     def AID(self, t):
@@ -96,15 +130,14 @@ class MarkdownTransformer(Transformer):
 class MarkdownExtractor(MarkerSplitterMixin, ElementFilterMixin, Extractor):
     def __init__(self, config: Config, record: InputRecord, metamodel: dict | None = None):
         super().__init__(config, record, metamodel)
-        grammar_path = Path(__file__).parent / 'markdown.lark'
-        grammar = grammar_path.read_text(encoding='utf-8')
+        grammar = read_grammar(Path(__file__).parent / 'markdown.lark')
 
         # Replace placeholders with actual marker
         marker = self._record.marker
         grammar = grammar.replace('_TOKEN_BEGIN', f'"[{marker}]"i')
         grammar = grammar.replace('_TOKEN_END', f'"[/{marker}]"i')
 
-        self._parser = Lark(grammar, parser='lalr', maybe_placeholders=False)
+        self._parser = get_parser(grammar, maybe_placeholders=False)
         self._transformer = MarkdownTransformer()
 
         # Pre-compile marker-specific and record-specific regexes
@@ -114,19 +147,18 @@ class MarkdownExtractor(MarkerSplitterMixin, ElementFilterMixin, Extractor):
         markers = self._record.markers
         if markers:
             escaped = '|'.join(re.escape(m) for m in markers)
-            self._closed_paired_re = re.compile(rf'\[({escaped})(?:\s+([^\]]+))?\](.*?)\[/\1\]', re.IGNORECASE | re.DOTALL)
-            self._unclosed_paired_re = re.compile(
-                rf'\[({escaped})(?:\s+([^\]]+))?\](.*?)(?=\n\s*\n|\n\s*\[(?:{escaped})(?:\s+[^\]]+)?\]|\n\s*#{{1,6}}\s|\Z)', re.IGNORECASE | re.DOTALL
-            )
-            self._line_prefix_re = re.compile(rf'^\[({escaped})(?:\s+([^\]]+))?\]\s*(.*?)(?=\n\n|\Z)', re.IGNORECASE | re.DOTALL | re.MULTILINE)
+            self._marker_tag_re = re.compile(rf'\[({escaped})(?:\s+([^\]]+))?\]', re.IGNORECASE)
+            self._marker_close_re = re.compile(rf'\[/({escaped})\]', re.IGNORECASE)
+            # The newline where an unclosed marker ends: before an empty line, the next marker, or a heading
+            self._marker_end_re = re.compile(rf'\n(?=\s*\n|\s*\[(?:{escaped})(?:\s+[^\]]+)?\]|\s*#{{1,6}}\s)', re.IGNORECASE)
 
             fallback_patterns = [rf'^(?:\[(?:{escaped})(?:\s+[^\]]+)?\])', r'^#{1,6}\s', r'\n[ \t]*\r?\n']
             self._fallback_re = re.compile('|'.join(f'({p})' for p in fallback_patterns), re.MULTILINE | re.IGNORECASE)
             self._fallback_num_patterns = len(fallback_patterns)
         else:
-            self._closed_paired_re = None
-            self._unclosed_paired_re = None
-            self._line_prefix_re = None
+            self._marker_tag_re = None
+            self._marker_close_re = None
+            self._marker_end_re = None
 
             fallback_patterns = [r'^#{1,6}\s', r'\n[ \t]*\r?\n']
             self._fallback_re = re.compile('|'.join(f'({p})' for p in fallback_patterns), re.MULTILINE | re.IGNORECASE)
@@ -405,8 +437,8 @@ class MarkdownExtractor(MarkerSplitterMixin, ElementFilterMixin, Extractor):
         marker: str,
     ) -> tuple[int, int, bool, int]:
         """Find segment end and return (segment_end, next_pos, fallback_pos_set, yaml_start_pos)."""
-        slash_req_match = self._slash_req_re.search(markdown[start_pos:terminator_search_end])
-        slash_req_pos = (start_pos + slash_req_match.start()) if slash_req_match else -1
+        slash_req_match = self._slash_req_re.search(markdown, start_pos, terminator_search_end)
+        slash_req_pos = slash_req_match.start() if slash_req_match else -1
 
         yaml_search_end = slash_req_pos if slash_req_pos != -1 else terminator_search_end
         yaml_start_pos = markdown.find('```yaml', start_pos, yaml_search_end)
@@ -423,20 +455,23 @@ class MarkdownExtractor(MarkerSplitterMixin, ElementFilterMixin, Extractor):
 
         if segment_end == -1:
             # Context-aware fallback
-            first_nl = markdown.find('\n', match_end)
-            if first_nl != -1 and first_nl < terminator_search_end:
+            first_nl = markdown.find('\n', match_end, terminator_search_end)
+            if first_nl != -1:
+                # Searching from a line start, so ^ anchors behave as they would on a slice
                 fallback_search_start = first_nl + 1
+                fallback_match = self._fallback_re.search(markdown, fallback_search_start, terminator_search_end)
+                offset = 0
             else:
+                # The rest of the marker line: ^ must also match at its start, so search a slice of it
                 fallback_search_start = match_end
-            fallback_search_region = markdown[fallback_search_start:terminator_search_end]
-
-            fallback_match = self._fallback_re.search(fallback_search_region)
+                fallback_match = self._fallback_re.search(markdown[match_end:terminator_search_end])
+                offset = match_end
 
             if fallback_match:
-                fallback_abs_pos = fallback_search_start + fallback_match.start()
+                fallback_abs_pos = offset + fallback_match.start()
                 if fallback_match.group(self._fallback_num_patterns):  # last group = empty line
                     segment_end = fallback_abs_pos + 1
-                    consume_end = fallback_search_start + fallback_match.end()
+                    consume_end = offset + fallback_match.end()
                     while consume_end < len(markdown):
                         scan = consume_end
                         while scan < len(markdown) and markdown[scan] in ' \t':
@@ -461,6 +496,21 @@ class MarkdownExtractor(MarkerSplitterMixin, ElementFilterMixin, Extractor):
         return segment_end, next_pos, fallback_pos_set, yaml_start_pos
 
 
+    def _parse_segment(self, segment: str) -> RequirementSegment:
+        """Split a requirement segment into its parts, using the grammar only when the fast path declines."""
+        parsed = recognize_segment(segment, self._record.marker)
+        if parsed is not None:
+            return parsed
+
+        req = self._transformer.transform(self._parser.parse(segment))['req']
+        yaml_info = req['yaml']
+        return RequirementSegment(
+            contents=req['contents']['text'] or '',
+            # Field names are read with surrounding and repeated whitespace collapsed, e.g. [ID ] is id
+            fields=[(' '.join(field['field']['marker'].split()), field['field']['contents']['text'] or '') for field in req['fields']['list']],
+            yaml_text=yaml_info.get('text') if yaml_info else None,
+        )
+
     def _process_segment(
         self,
         segment: str,
@@ -471,14 +521,10 @@ class MarkdownExtractor(MarkerSplitterMixin, ElementFilterMixin, Extractor):
     ) -> Block:
         """Process a segment of markdown, parse it, and build either an ArtifactBlock or an ErrorBlock."""
         try:
-            tree = self._parser.parse(segment)
-            req_data = self._transformer.transform(tree)
-            req = benedict(req_data)
-
-            contents = req.get('req.contents.text') or ''
-            fields = req.get_list('req.fields.list')
-            yaml_info = req.get('req.yaml')
-            yaml_text = yaml_info.get('text') if yaml_info else None
+            parsed = self._parse_segment(segment)
+            contents = parsed.contents
+            fields = parsed.fields
+            yaml_text = parsed.yaml_text
 
             # NBSP detection
             if '\xa0' in segment:
@@ -487,20 +533,21 @@ class MarkdownExtractor(MarkerSplitterMixin, ElementFilterMixin, Extractor):
                 return ErrorBlock(message=error, raw_text=segment)
 
             if not yaml_text:
-                yaml_dict = benedict({'attrs': {}})
                 yaml_attrs = {}
             else:
-                yaml_dict = benedict.from_yaml(yaml_text)
+                yaml_dict = safe_load(yaml_text)
+                if not isinstance(yaml_dict, (dict, list)):
+                    raise ValueError(f'Invalid data type: {type(yaml_dict)}, expected dict or list.')
 
-                if 'attrs' not in yaml_dict:
+                if not isinstance(yaml_dict, dict) or 'attrs' not in yaml_dict:
                     error = _("Invalid metadata in YAML at line {line}").format(line=start_line)
                     lg.error(error)
                     return ErrorBlock(message=error, raw_text=segment)
-                yaml_attrs = yaml_dict.get_dict('attrs')
+                yaml_attrs = yaml_dict['attrs'] if isinstance(yaml_dict['attrs'], dict) else {}
 
             # Merged dict for ID/AType extraction, YAML takes precedence
             temp_attrs = {
-                **{field.get_str('field.marker'): (field.get('field.contents.text') or '').strip() for field in fields},
+                **{field_marker: field_text.strip() for field_marker, field_text in fields},
                 **yaml_attrs,
             }
 
@@ -532,11 +579,10 @@ class MarkdownExtractor(MarkerSplitterMixin, ElementFilterMixin, Extractor):
             builder.add_field('id', aid)
 
             # Add fields found in markdown individually
-            for field in fields:
-                field_marker = field.get_str('field.marker')
+            for field_marker, field_text in fields:
                 if field_marker.lower() in ['id', 'atype']:
                     continue
-                builder.add_field(field_marker, (field.get('field.contents.text') or '').strip())
+                builder.add_field(field_marker, field_text.strip())
 
             # Add fields found in YAML individually
             for name, value in yaml_attrs.items():
@@ -558,9 +604,10 @@ class MarkdownExtractor(MarkerSplitterMixin, ElementFilterMixin, Extractor):
 
             artifact = builder.build()
             if isinstance(artifact, MarkdownArtifact):
-                artifact.yaml_data = yaml_dict
-                for field in fields:
-                    artifact.source_metadata[field.get_str('field.marker').lower()] = 'markdown'
+                # Only code that edits requirements reads yaml_data, so it is parsed again on demand
+                artifact._yaml_text = yaml_text or ''
+                for field_marker, _field_text in fields:
+                    artifact.source_metadata[field_marker.lower()] = 'markdown'
                 for name in yaml_attrs.keys():
                     artifact.source_metadata[name.lower()] = 'yaml'
 
@@ -583,7 +630,9 @@ class MarkdownExtractor(MarkerSplitterMixin, ElementFilterMixin, Extractor):
         blocks: list[Block] = []
         marker = self._record.marker
         start_marker_re = self._start_marker_re
+        newlines = _newline_offsets(markdown)
         pos = 0
+        next_marker_match = start_marker_re.search(markdown)
 
         if location_builder is None:
             loc_file = self._config.derive_path(filepath)
@@ -592,7 +641,10 @@ class MarkdownExtractor(MarkerSplitterMixin, ElementFilterMixin, Extractor):
                 return LineLocation(loc_file=loc_file, loc_lines=(start, end))
 
         while True:
-            match = start_marker_re.search(markdown, pos)
+            # Reuse the lookahead of the previous segment unless that segment ran past it
+            if next_marker_match is not None and next_marker_match.start() < pos:
+                next_marker_match = start_marker_re.search(markdown, pos)
+            match = next_marker_match
             if not match:
                 break
 
@@ -613,7 +665,7 @@ class MarkdownExtractor(MarkerSplitterMixin, ElementFilterMixin, Extractor):
 
             if segment_end == -1:
                 # Should not happen given EOF fallback, but guard against it
-                start_line = markdown.count('\n', 0, start_pos) + 1
+                start_line = _line_at(newlines, start_pos)
                 if yaml_start_pos != -1:
                     error = _("Unclosed YAML block in requirement at line {line} in {file}").format(line=start_line, file=filepath)
                 else:
@@ -625,8 +677,8 @@ class MarkdownExtractor(MarkerSplitterMixin, ElementFilterMixin, Extractor):
                 continue
 
             segment = markdown[start_pos:segment_end]
-            start_line = markdown.count('\n', 0, start_pos) + 1
-            end_line = markdown.count('\n', 0, segment_end) + 1
+            start_line = _line_at(newlines, start_pos)
+            end_line = _line_at(newlines, segment_end)
 
             # Ensure segment ends with a newline for the Lark parser
             # (only needed for fallback-terminated segments that may lack one, e.g. EOF)
@@ -650,18 +702,14 @@ class MarkdownExtractor(MarkerSplitterMixin, ElementFilterMixin, Extractor):
         if text_after:
             blocks.append(TextBlock(content=text_after, source_offset=pos))
 
-        # Post-process: split TextBlocks by fragment markers
-        if self._record.markers:
-            split_blocks: list[Block] = []
-            for block in blocks:
-                if isinstance(block, TextBlock) and block.marker is None:
-                    split_blocks.extend(self._split_text_block_by_markers(block))
-                else:
-                    split_blocks.append(block)
-            blocks = split_blocks
-
-        # Post-process: split headings into separate TextBlocks
-        blocks = self._split_headings(blocks)
+        # Post-process: split TextBlocks into fragment markers, headings and unmarked text
+        split_blocks: list[Block] = []
+        for block in blocks:
+            if isinstance(block, TextBlock) and block.marker is None:
+                split_blocks.extend(self._split_text_block_by_markers(block))
+            else:
+                split_blocks.append(block)
+        blocks = split_blocks
 
         return blocks
 
@@ -0,0 +1,73 @@
+# SPDX-License-Identifier: MIT
+
+# Author: Boris Resnick
+# Created: 2026-10-17
+# Description: Fast-path recognizer for simple Markdown requirement segments.
+
+import re
+from dataclasses import dataclass
+
+_FIELD_RE = re.compile(r'\[([\w.-]+)\](.*)')
+
+
+@dataclass(slots=True)
+class RequirementSegment:
+    """The parts of a requirement segment: contents, inline fields and the YAML block text."""
+
+    contents: str
+    fields: list[tuple[str, str]]
+    yaml_text: str | None
+
+
+def recognize_segment(segment: str, marker: str) -> RequirementSegment | None:
+    """Split a requirement segment of the common shape without the Lark parser.
+
+    Accepts the marker on its own line, content lines, `[field] value` lines with continuation lines,
+    and an optional closing ```yaml block or `[/MARKER]` line. Returns None for anything else (blank
+    lines, indented or fenced lines, tabs, carriage returns, non-breaking spaces, unusual field names),
+    in which case the segment goes through the grammar. The result equals what the grammar produces.
+    """
+    opening = f'[{marker}]\n'
+    if segment[: len(opening)].lower() != opening.lower():
+        return None
+    body = segment[len(opening) :]
+    if '\r' in body or '\t' in body or '\xa0' in body:
+        return None
+
+    yaml_text = None
+    yaml_pos = body.find('```yaml')
+    if yaml_pos != -1:
+        end_pos = body.find('```', yaml_pos + 7)
+        if (yaml_pos and body[yaml_pos - 1] != '\n') or end_pos != len(body) - 3 or end_pos == yaml_pos + 7:
+            return None
+        yaml_text = body[yaml_pos + 7 : end_pos]
+        body = body[:yaml_pos]
+    else:
+        closing = f'[/{marker}]'
+        if body[-len(closing) :].lower() == closing.lower():
+            body = body[: -len(closing)]
+
+    if body and not body.endswith('\n'):
+        return None
+
+    # The grammar reads the end of the marker line as the first content line
+    contents = ['\n']
+    fields: list[tuple[str, list[str]]] = []
+    for line in body.split('\n')[:-1]:
+        if not line or line[0] in ' `':
+            return None
+        if line[0] == '[':
+            match = _FIELD_RE.fullmatch(line)
+            if not match:
+                return None
+            fields.append((match.group(1).lower(), [match.group(2)]))
+        elif fields:
+            fields[-1][1].append(line)
+        else:
+            contents.append(line + '\n')
+
+    return RequirementSegment(
+        contents=''.join(contents),
+        fields=[(name, '\n'.join(part.strip() for part in parts if part.strip())) for name, parts in fields],
+        yaml_text=yaml_text,
+    )
@@ -7,32 +7,53 @@
 import re
 from typing import TYPE_CHECKING
 
-from syntagmax.blocks import Block, TextBlock
+from syntagmax.blocks import ArtifactBlock, Block, TextBlock
 
 if TYPE_CHECKING:
     from syntagmax.config import InputRecord, Config, ExcludeElementConfig
 
 _VALID_BLOCK_ID_RE = re.compile(r'^[a-zA-Z0-9_.\-]+$')
 
-# Patterns for detecting Markdown block-level elements
-_HEADING_RE = re.compile(r'^\s*#{1,6}\s')
-_TABLE_ROW_RE = re.compile(r'^\s*\|')
-_UNORDERED_LIST_RE = re.compile(r'^\s*[-*+]\s')
-_ORDERED_LIST_RE = re.compile(r'^\s*\d+[.)]\s')
-_THEMATIC_BREAK_RE = re.compile(r'^\s*[-*_]{3,}\s*$')
-_HTML_BLOCK_RE = re.compile(r'^\s*<')
-_FENCE_START_RE = re.compile(r'^\s*```')
+# Line labels: each line gets a bit set of the kinds below
+FENCE = 1  # opens or closes a fenced code block
+BLANK = 2  # empty or whitespace only
+BLOCK = 4  # block-level element kept as is by soft line breaks: heading, table row, list item, rule or HTML
+HEADING = 8  # starts with '#', a heading or not
+CALLOUT = 16  # starts with '>'
+RULE = 32  # horizontal rule (thematic break)
+
+# Labels by the first character after the indentation: fixed, or decided by a pattern whose matching group
+# names the kind. Patterns see the line ending, so whitespace after a marker must not be CR or LF.
+_LIST_ITEM_RE = re.compile(r'(?P<block>\d+[.)][^\S\r\n])')
+_LEADING_KINDS: dict[str, 'int | re.Pattern[str]'] = {
+    '': BLANK,
+    '>': CALLOUT,
+    '|': BLOCK,
+    '<': BLOCK,
+    '#': re.compile(r'(?P<heading>#{1,6}[^\S\r\n])|(?P<hash>)'),
+    '`': re.compile(r'(?P<fence>```)'),
+    **dict.fromkeys('-*_+', re.compile(r'(?P<rule>[-*_]{3,}\s*\Z)|(?P<block>[-*+][^\S\r\n])')),
+}
+# First characters of lines that element filters act on by label
+_FILTER_LEADS = frozenset('`>#-*_')
+_KIND_LABELS: dict[str, int] = {
+    'fence': FENCE,
+    'rule': RULE | BLOCK,
+    'heading': HEADING | BLOCK,
+    'hash': HEADING,
+    'block': BLOCK,
+}
 
 # Module-level pre-compiled static regexes for filtering
-_FRONTMATTER_PATTERN = re.compile(r'\A---\r?\n.*?\r?\n---\r?\n', re.DOTALL)
+_FRONTMATTER_DELIMITERS = ('---\n', '---\r\n')
 _TAG_PATTERN = re.compile(
     r'(?<![^\s([{"\'])[ \t]*'
     r'#(?!(?:[0-9a-fA-F]{3,4}|[0-9a-fA-F]{6}|[0-9a-fA-F]{8})\b)'
     r'[^\d\W][\w\-/]*',
     re.UNICODE,
 )
+_LINE_ELEMENTS = {'callouts', 'headings', 'horizontal_rules', 'tags'}
 _CODE_SPAN_RE = re.compile(r'(`{1,2})(?:.+?)\1')
-_HR_PATTERN = re.compile(r'^\s*[-*_]{3,}\s*$')
 _CALLOUT_ONLY_RE = re.compile(r'^(\s*)>\s?(.*)$')
 _HEADING_ONLY_RE = re.compile(r'^(\s*)#{1,6}\s+(.*)$')
 _MULTIPLE_WS_RE = re.compile(r'[ \t]{2,}')
@@ -43,112 +64,96 @@ def _validate_block_id(id_str: str) -> bool:
     return bool(_VALID_BLOCK_ID_RE.match(id_str))
 
 
-def _is_block_element(line_content: str) -> bool:
-    """Check if a line (without line ending) is a Markdown block-level element."""
-    return bool(
-        _HEADING_RE.match(line_content)
-        or _TABLE_ROW_RE.match(line_content)
-        or _UNORDERED_LIST_RE.match(line_content)
-        or _ORDERED_LIST_RE.match(line_content)
-        or _THEMATIC_BREAK_RE.match(line_content)
-        or _HTML_BLOCK_RE.match(line_content)
-    )
+def line_label(line: str) -> int:
+    """The kinds a line (as split by str.splitlines) belongs to, ignoring its line ending.
 
-
-def apply_soft_line_breaks(text: str) -> str:
-    """Convert single newlines to Markdown hard breaks (trailing two spaces).
-
-    This implements Obsidian's relaxed line break behavior for standard Markdown
-    renderers. The transformation is:
-    - Code-block-aware: lines inside fenced code blocks are never modified.
-    - CRLF-safe: preserves original line endings.
-    - Block-syntax-aware: headings, tables, lists, thematic breaks, and HTML blocks
-      are never modified.
-    - Paragraph-safe: empty/whitespace-only lines and lines preceding them are not modified.
-
-    Args:
-        text: The input text content.
-
-    Returns:
-        Text with single newlines converted to hard breaks where appropriate.
+    Labels do not depend on neighbouring lines; consumers track fenced code blocks from the FENCE labels.
     """
-    if not text:
-        return text
-
-    # Split preserving line endings
-    lines = text.splitlines(keepends=True)
-    if not lines:
-        return text
-
+    text = line.lstrip()
+    kind = _LEADING_KINDS.get(text[:1])
+    if kind is None:
+        if not text[0].isdecimal():
+            return 0
+        kind = _LIST_ITEM_RE
+    if kind.__class__ is int:
+        return kind
+    m = kind.match(text)
+    return _KIND_LABELS[m.lastgroup] if m else 0
+
+
+def classify_lines(lines: list[str]) -> list[int]:
+    """Label every line once with line_label."""
+    return list(map(line_label, lines))
+
+
+def _frontmatter_length(lines: list[str]) -> int:
+    """Number of leading lines that form a frontmatter block: '---' lines around at least one line."""
+    if not lines or lines[0] not in _FRONTMATTER_DELIMITERS:
+        return 0
+    for i in range(2, len(lines)):
+        # A closing '---' after a bare CR or another line separator does not start a line of its own
+        if lines[i] in _FRONTMATTER_DELIMITERS and lines[i - 1].endswith('\n'):
+            return i + 1
+    return 0
+
+
+def _soft_break_lines(lines: list[str], labels: list[int]) -> str:
     result: list[str] = []
     in_code_block = False
+    next_labels = labels[1:] + [0]
 
-    for i, line in enumerate(lines):
-        # Separate content from line ending
-        if line.endswith('\r\n'):
-            content = line[:-2]
-            ending = '\r\n'
-        elif line.endswith('\n'):
-            content = line[:-1]
-            ending = '\n'
-        elif line.endswith('\r'):
-            content = line[:-1]
-            ending = '\r'
-        else:
-            # Last line without trailing newline — no transformation needed
+    for line, label, next_label in zip(lines, labels, next_labels):
+        # Lines without a trailing newline are never modified
+        if line[-1] not in '\r\n':
             result.append(line)
             continue
 
-        stripped = content.lstrip()
-
-        # Track fenced code block state
-        if _FENCE_START_RE.match(content):
+        if label & FENCE:
             in_code_block = not in_code_block
             result.append(line)
             continue
 
-        # Lines inside code blocks are never modified
-        if in_code_block:
+        # Code, blank lines, lines before a blank line (paragraph breaks) and block elements are never modified
+        if in_code_block or label & (BLANK | BLOCK) or next_label & BLANK:
             result.append(line)
             continue
 
-        # Empty or whitespace-only lines are never modified
-        if not stripped:
-            result.append(line)
-            continue
-
-        # Check if next line is empty or whitespace-only (preserve paragraph breaks)
-        if i + 1 < len(lines):
-            next_line = lines[i + 1]
-            # Strip line ending from next line for whitespace check
-            if next_line.endswith('\r\n'):
-                next_content = next_line[:-2]
-            elif next_line.endswith('\n'):
-                next_content = next_line[:-1]
-            elif next_line.endswith('\r'):
-                next_content = next_line[:-1]
-            else:
-                next_content = next_line
-            if not next_content.strip():
-                result.append(line)
-                continue
-
-        # Block-level elements are never modified
-        if _is_block_element(content):
-            result.append(line)
-            continue
+        content = line.rstrip('\r\n')
 
         # Already has a hard break (trailing two spaces or backslash)
         if content.endswith('  ') or content.endswith('\\'):
             result.append(line)
             continue
 
-        # Apply transformation: append two spaces before line ending
-        result.append(content + '  ' + ending)
+        result.append(content + '  ' + line[len(content) :])
 
     return ''.join(result)
 
 
+def apply_soft_line_breaks(text: str) -> str:
+    """Convert single newlines to Markdown hard breaks (trailing two spaces).
+
+    This implements Obsidian's relaxed line break behavior for standard Markdown
+    renderers. The transformation is:
+    - Code-block-aware: lines inside fenced code blocks are never modified.
+    - CRLF-safe: preserves original line endings.
+    - Block-syntax-aware: headings, tables, lists, thematic breaks, and HTML blocks
+      are never modified.
+    - Paragraph-safe: empty/whitespace-only lines and lines preceding them are not modified.
+
+    Args:
+        text: The input text content.
+
+    Returns:
+        Text with single newlines converted to hard breaks where appropriate.
+    """
+    if not text:
+        return text
+
+    lines = text.splitlines(keepends=True)
+    return _soft_break_lines(lines, classify_lines(lines))
+
+
 class ElementFilterMixin:
     """Mixin providing element filtering capabilities for Markdown extractors."""
 
@@ -156,10 +161,15 @@ class ElementFilterMixin:
         _record: 'InputRecord'
         _config: 'Config'
 
+    def _soft_line_breaks(self) -> bool:
+        """Whether single newlines in text and artifact contents become hard breaks (see apply_soft_line_breaks)."""
+        return False
+
     def _apply_element_filters(self, blocks: list[Block]) -> list[Block]:
-        """Apply exclude_elements filtering to TextBlocks."""
+        """Apply exclude_elements filtering to TextBlocks, and soft line breaks when the extractor uses them."""
         exclude = self._record.exclude_elements
-        if not exclude:
+        soft_line_breaks = self._soft_line_breaks()
+        if not exclude and not soft_line_breaks:
             return blocks
 
         # Determine headings exclusion mode (if configured)
@@ -173,7 +183,7 @@ class ElementFilterMixin:
         is_file_start = True
 
         for block in blocks:
-            if isinstance(block, TextBlock):
+            if isinstance(block, TextBlock) and exclude:
                 # Handle pre-split HEADING blocks
                 if block.marker == 'HEADING' and headings_mode:
                     is_file_start = False
@@ -192,7 +202,7 @@ class ElementFilterMixin:
                         if content and content.strip():
                             filtered.append(
                                 TextBlock(
-                                    content=content,
+                                    content=apply_soft_line_breaks(content) if soft_line_breaks else content,
                                     marker=None,
                                     id=block.id,
                                     explicit_id=block.explicit_id,
@@ -201,7 +211,7 @@ class ElementFilterMixin:
                             )
                     continue
 
-                content = self._filter_text_content(block.content, is_file_start, exclude)
+                content = self._filter_text_content(block.content, is_file_start, exclude, soft_line_breaks)
                 is_file_start = False
                 if content and content.strip():
                     filtered.append(
@@ -214,117 +224,120 @@ class ElementFilterMixin:
                         )
                     )
             else:
+                if isinstance(block, TextBlock):
+                    block.content = apply_soft_line_breaks(block.content)
+                elif soft_line_breaks and isinstance(block, ArtifactBlock):
+                    contents = block.artifact.fields.get('contents')
+                    if contents and isinstance(contents, str):
+                        block.artifact.fields['contents'] = apply_soft_line_breaks(contents)
                 is_file_start = False
                 filtered.append(block)
 
         return filtered
 
-    def _filter_text_content(self, content: str, is_file_start: bool, exclude: list['ExcludeElementConfig']) -> str:
+    def _filter_text_content(self, content: str, is_file_start: bool, exclude: list['ExcludeElementConfig'], soft_line_breaks: bool = False) -> str:
         """Filter excluded Markdown elements from text content.
 
         Respects fenced code blocks: lines inside ``` fences are never filtered.
         Supports both LF and CRLF line endings.
         Each element has a mode: only, string, or string-on-start.
+        With soft_line_breaks, the kept lines also get hard breaks, reusing the line labels.
         """
         # Build lookup: element name -> mode
         exclude_map: dict[str, str] = {e.name: e.mode for e in exclude}
 
-        # Handle frontmatter first (operates on entire content, not line-by-line)
+        lines = content.splitlines(keepends=True)
+
         # All modes behave identically for frontmatter (complete removal)
         if is_file_start and 'frontmatter' in exclude_map:
-            content = _FRONTMATTER_PATTERN.sub('', content)
+            lines = lines[_frontmatter_length(lines) :]
+
+        if exclude_map.keys() & _LINE_ELEMENTS:
+            lines, labels = self._filter_lines(lines, exclude_map, soft_line_breaks)
+        elif soft_line_breaks:
+            labels = classify_lines(lines)
+
+        if not soft_line_breaks:
+            return ''.join(lines)
+
+        text = ''.join(lines)
+        # Rewritten lines can be empty or keep a line separator inside, and dropping a line can join a bare CR
+        # with the next LF; only then do the kept lines differ from the lines of the text and need new labels
+        if text.splitlines(keepends=True) != lines:
+            return apply_soft_line_breaks(text)
+        return _soft_break_lines(lines, labels)
 
-        # If no line-level filters remain, return early
-        line_elements = set(exclude_map.keys()) & {'callouts', 'headings', 'horizontal_rules', 'tags'}
-        if not line_elements:
-            return content
+    def _filter_lines(self, lines: list[str], exclude_map: dict[str, str], labelled: bool) -> tuple[list[str], list[int]]:
+        """Label each line and drop or rewrite it for the line-level elements; returns the kept lines and their labels.
 
+        Unless labelled, only lines that can be fences, callouts, headings or rules are labelled, others get 0.
+        """
         tags_mode = exclude_map.get('tags')
         callouts_mode = exclude_map.get('callouts')
         headings_mode = exclude_map.get('headings')
         hr_mode = exclude_map.get('horizontal_rules')
 
-        # Obsidian tag pattern
-        if tags_mode:
-            _tag_pattern = _TAG_PATTERN
-            # Code span regex for masking
-            _code_span_re = _CODE_SPAN_RE
-
-        hr_pattern = _HR_PATTERN
-        callout_only_re = _CALLOUT_ONLY_RE
-        heading_only_re = _HEADING_ONLY_RE
-
-        lines = content.splitlines(keepends=True)
         result: list[str] = []
+        result_labels: list[int] = []
         in_code_block = False
 
-        for line in lines:
-            stripped = line.lstrip()
+        for original in lines:
+            line = original
+            label = line_label(line) if labelled or line.lstrip()[:1] in _FILTER_LEADS else 0
 
-            # Track fenced code block state
-            if stripped.startswith('```'):
+            # Fence lines and lines inside code blocks are always preserved
+            if label & FENCE:
                 in_code_block = not in_code_block
-                result.append(line)
-                continue
-
-            # Lines inside code blocks are always preserved
-            if in_code_block:
-                result.append(line)
-                continue
+            elif in_code_block:
+                pass
 
             # --- Callouts ---
-            if callouts_mode and stripped.startswith('>'):
-                if callouts_mode == 'only':
-                    m = callout_only_re.match(line)
-                    if m:
-                        text_part = line.rstrip('\r\n')
-                        ending = line[len(text_part):]
-                        result.append(m.group(1) + m.group(2) + ending)
-                    else:
-                        result.append(line)
-                    continue
-                else:
-                    # string and string-on-start both remove the line
+            elif callouts_mode and label & CALLOUT:
+                # string and string-on-start both remove the line
+                if callouts_mode != 'only':
                     continue
+                line = self._strip_prefix(line, _CALLOUT_ONLY_RE)
 
             # --- Headings ---
-            if headings_mode and stripped.startswith('#'):
-                if headings_mode == 'only':
-                    m = heading_only_re.match(line)
-                    if m:
-                        text_part = line.rstrip('\r\n')
-                        ending = line[len(text_part):]
-                        result.append(m.group(1) + m.group(2) + ending)
-                    else:
-                        result.append(line)
-                    continue
-                else:
-                    # string and string-on-start both remove the line
+            elif headings_mode and label & HEADING:
+                # string and string-on-start both remove the line
+                if headings_mode != 'only':
                     continue
+                line = self._strip_prefix(line, _HEADING_ONLY_RE)
 
             # --- Horizontal rules ---
-            if hr_mode and hr_pattern.match(line):
+            elif hr_mode and label & RULE:
                 # All modes remove the line
                 continue
 
             # --- Tags ---
-            if tags_mode:
+            elif tags_mode:
                 if tags_mode == 'only':
-                    line = self._strip_tags_from_line(line, _tag_pattern)
+                    line = self._strip_tags_from_line(line, _TAG_PATTERN)
                 elif tags_mode == 'string':
                     # Remove entire line if it contains any tag outside code spans
-                    if self._line_has_tag(line, _tag_pattern, _code_span_re):
+                    if self._line_has_tag(line, _TAG_PATTERN, _CODE_SPAN_RE):
                         continue
                 else:
                     # string-on-start: remove line if first non-ws is a tag; else strip inline
-                    if self._line_starts_with_tag(line, _tag_pattern, _code_span_re):
+                    if self._line_starts_with_tag(line, _TAG_PATTERN, _CODE_SPAN_RE):
                         continue
-                    else:
-                        line = self._strip_tags_from_line(line, _tag_pattern)
+                    line = self._strip_tags_from_line(line, _TAG_PATTERN)
 
             result.append(line)
-
-        return ''.join(result)
+            # Rewritten lines may be of another kind now
+            result_labels.append(label if not labelled or line == original else line_label(line))
+
+        return result, result_labels
+
+    def _strip_prefix(self, line: str, prefix_re: 're.Pattern[str]') -> str:
+        """Keep the indentation and text of a callout or heading line, without its marker."""
+        m = prefix_re.match(line)
+        if not m:
+            return line
+        text_part = line.rstrip('\r\n')
+        ending = line[len(text_part):]
+        return m.group(1) + m.group(2) + ending
 
     def _mask_code_spans(self, line: str, code_span_re: 're.Pattern[str]') -> str:
         """Replace inline code span content with placeholder characters for detection."""
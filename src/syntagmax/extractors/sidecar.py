@@ -5,15 +5,17 @@
 # Description: Extracts artifacts from sidecar YAML files.
 
 import logging as lg
+import os
 from pathlib import Path
 import yaml
 
 from syntagmax.config import Config, InputRecord
 from syntagmax.artifact import ArtifactBuilder, Artifact, FileLocation, ValidationError
-from syntagmax.extractors.extractor import Extractor, ExtractorResult
+from syntagmax.extractors.extractor import Extractor
 from syntagmax.artifact import UNDEFINED_ID
 from syntagmax.blocks import Block, ArtifactBlock, ErrorBlock
 from syntagmax.i18n import _
+from syntagmax.yaml_utils import safe_load
 
 
 def _pop_case_insensitive(data: dict, key: str, default):
@@ -26,34 +28,73 @@ def _pop_case_insensitive(data: dict, key: str, default):
     return default
 
 
+class SidecarIndex:
+    """Entries below a record directory, read with a single walk, and the originals their sidecars describe.
+
+    Pairing, orphan and both-present checks are set lookups on the index instead of file system calls.
+    Paths are kept as strings joined onto the record directory, the way the input file paths are built.
+    """
+
+    def __init__(self, root: Path):
+        # Path('.', name) is just name, so the current directory gets no prefix
+        self._prefix = '' if os.fspath(root) == '.' else os.path.join(root, '')
+        self.entries: set[str] = set()
+        for dirpath, dirnames, filenames in os.walk(root):
+            rel = os.path.relpath(dirpath, root)
+            head = self._prefix if rel == '.' else os.path.join(self._prefix, rel, '')
+            self.entries.update(head + name for name in dirnames)
+            self.entries.update(head + name for name in filenames)
+
+        # Originals (existing or not) named by the sidecars of each kind
+        self.stmx = {p[: -len('.stmx')] for p in self.entries if p.endswith('.stmx')}
+        self.syntagmax = {p[: -len('.syntagmax')] for p in self.entries if p.endswith('.syntagmax')}
+
+    def covers(self, path: str) -> bool:
+        """Whether a path lies below the indexed directory, so that its absence from the index means absence from disk."""
+        if not self._prefix:
+            return not os.path.isabs(path) and not path.startswith(os.pardir)
+        return path.startswith(self._prefix)
+
+    def orphans(self) -> list[Path]:
+        """Sidecars without their original, .stmx ones first."""
+        return [Path(f'{p}.stmx') for p in sorted(self.stmx - self.entries)] + [Path(f'{p}.syntagmax') for p in sorted(self.syntagmax - self.entries)]
+
+
 class SidecarExtractor(Extractor):
     def __init__(self, config: Config, record: InputRecord, metamodel: dict | None = None):
         super().__init__(config, record, metamodel)
+        self._index: SidecarIndex | None = None
 
     def driver(self) -> str:
         return 'sidecar'
 
-    def extract(self) -> ExtractorResult:
-        artifacts, errors = super().extract()
+    def sidecar_index(self) -> SidecarIndex | None:
+        """The index of the record directory, scanned on first use; None without a record directory."""
+        if self._index is None:
+            record_base = self._record.record_base
+            if not record_base or not record_base.is_dir():
+                return None
+            self._index = SidecarIndex(record_base)
+        return self._index
 
+    def check_record(self) -> list[str]:
         # Check for orphaned sidecar files in the input record's base directory
-        record_base = self._record.record_base
-
-        if record_base and record_base.exists():
-            for sidecar_path in list(record_base.rglob('*.stmx')) + list(record_base.rglob('*.syntagmax')):
-                original_name = sidecar_path.name
+        index = self.sidecar_index()
 
-                if original_name.endswith('.stmx'):
-                    original_name = original_name[:-5]
-                elif original_name.endswith('.syntagmax'):
-                    original_name = original_name[:-10]
+        if index is None:
+            return []
 
-                original_path = sidecar_path.with_name(original_name)
+        return [
+            _("{driver} :: Orphaned sidecar file {path} without matching original file").format(driver=self.driver(), path=sidecar_path)
+            for sidecar_path in index.orphans()
+        ]
 
-                if not original_path.exists():
-                    errors.append(_("{driver} :: Orphaned sidecar file {path} without matching original file").format(driver=self.driver(), path=sidecar_path))
+    def cache_dependencies(self, filepath: Path) -> list[Path]:
+        # Only the sidecar files are read, the original may be an arbitrarily large binary
+        if filepath.name.endswith('.stmx') or filepath.name.endswith('.syntagmax'):
+            return [filepath]
 
-        return artifacts, errors
+        return [filepath.with_name(f'{filepath.name}.stmx'), filepath.with_name(f'{filepath.name}.syntagmax')]
 
     def extract_blocks_from_file(self, filepath: Path) -> list[Block]:
         # Skip sidecar metadata files themselves if they match the glob
@@ -65,8 +106,15 @@ class SidecarExtractor(Extractor):
         stmx_path = filepath.with_name(f'{filepath.name}.stmx')
         syntagmax_path = filepath.with_name(f'{filepath.name}.syntagmax')
 
-        stmx_exists = stmx_path.exists()
-        syntagmax_exists = syntagmax_path.exists()
+        index = self.sidecar_index()
+        original = os.fspath(filepath)
+
+        if index is not None and index.covers(original):
+            stmx_exists = original in index.stmx
+            syntagmax_exists = original in index.syntagmax
+        else:
+            stmx_exists = stmx_path.exists()
+            syntagmax_exists = syntagmax_path.exists()
 
         if stmx_exists and syntagmax_exists:
             msg = _("{driver} :: Both .stmx and .syntagmax sidecars are present for {file}").format(driver=self.driver(), file=filepath)
@@ -80,7 +128,7 @@ class SidecarExtractor(Extractor):
 
         try:
             with open(sidecar_path, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
+                data = safe_load(f)
         except yaml.YAMLError as e:
             msg = _("{driver} :: Malformed YAML in sidecar {path}: {error}").format(driver=self.driver(), path=sidecar_path, error=str(e))
             return [ErrorBlock(message=msg, raw_text='')]
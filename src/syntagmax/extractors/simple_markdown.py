@@ -15,6 +15,7 @@ from syntagmax.artifact import ArtifactBuilder, Artifact, FileLocation, Validati
 from syntagmax.extractors.extractor import Extractor
 from syntagmax.blocks import Block, ArtifactBlock, ErrorBlock
 from syntagmax.i18n import _
+from syntagmax.yaml_utils import safe_load
 
 
 _FRONTMATTER_RE = re.compile(
@@ -52,7 +53,7 @@ class SimpleMarkdownExtractor(Extractor):
         if not match:
             return (None, text)
 
-        data = yaml.safe_load(match.group(1))
+        data = safe_load(match.group(1))
 
         if not isinstance(data, dict):
             lg.warning(f'{self.driver()} :: Frontmatter is not a YAML dictionary, treating as no frontmatter')
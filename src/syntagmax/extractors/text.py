@@ -5,19 +5,67 @@
 # Description: Extracts artifacts from text files (primarily, source code).
 
 import logging as lg
+import mmap
+import os
 import re
+from collections.abc import Iterator
 from pathlib import Path
 
-from lark import Lark, Transformer, exceptions
+from lark import Transformer, exceptions
 
 from syntagmax.config import Config, InputRecord
 from syntagmax.artifact import ArtifactBuilder, Artifact, ValidationError, LineLocation
 from syntagmax.extractors.extractor import Extractor
+from syntagmax.lark_utils import get_parser, read_grammar
 from syntagmax.artifact import UNDEFINED_ID
 from syntagmax.blocks import Block, TextBlock, ArtifactBlock, ErrorBlock
 from syntagmax.i18n import _
 
 
+SECTION_START = b'[<'
+SECTION_END = b'>]'
+
+
+def _decode(data: bytes) -> str:
+    # Files used to be read in text mode, which translates all line endings to '\n'
+    return data.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+
+
+def _line_breaks(data: bytes) -> int:
+    return data.count(b'\n') + data.count(b'\r') - data.count(b'\r\n')
+
+
+def scan_sections(data: bytes | mmap.mmap) -> Iterator[tuple[str, str | None, int, int]]:
+    """Split UTF-8 file content into text gaps and [< ... >] sections in one pass over the bytes.
+
+    Yields (gap, section, start_line, end_line) for every section, with the text before it as gap,
+    and finally (gap, None, 0, 0) for the text after the last complete section. Markers are found on
+    the bytes, line numbers are counted only over the bytes between consecutive markers, and each gap
+    and section is decoded on its own. The markers are ASCII, so the pieces split at UTF-8 character
+    boundaries.
+    """
+    pos = 0
+    line = 1
+
+    while True:
+        start_pos = data.find(SECTION_START, pos)
+        if start_pos == -1:
+            break
+        end_pos = data.find(SECTION_END, start_pos)
+        if end_pos == -1:
+            break
+
+        segment_end = end_pos + len(SECTION_END)
+        gap = data[pos:start_pos]
+        segment = data[start_pos:segment_end]
+        start_line = line + _line_breaks(gap)
+        line = start_line + _line_breaks(segment)
+        yield _decode(gap), _decode(segment), start_line, line
+        pos = segment_end
+
+    yield _decode(data[pos:]), None, 0, 0
+
+
 class IdRef:
     def __init__(self, aid: str):
         self.value = aid
@@ -72,6 +120,8 @@ class TextTransformer(Transformer):
 
 
 class TextArtifact(Artifact):
+    __slots__ = ()
+
     def __init__(self, config: Config):
         super().__init__(config)
 
@@ -79,8 +129,8 @@ class TextArtifact(Artifact):
 class TextExtractor(Extractor):
     def __init__(self, config: Config, record: InputRecord, metamodel: dict | None = None):
         super().__init__(config, record, metamodel)
-        grammar_path = Path(__file__).parent / 'text.lark'
-        self._parser = Lark.open(grammar_path, rel_to=__file__, parser='lalr', maybe_placeholders=False)
+        grammar = read_grammar(Path(__file__).parent / 'text.lark')
+        self._parser = get_parser(grammar, maybe_placeholders=False)
         self._transformer = TextTransformer()
 
     def driver(self) -> str:
@@ -135,87 +185,66 @@ class TextExtractor(Extractor):
     def extract_blocks_from_file(self, filepath: Path) -> list[Block]:
         blocks: list[Block] = []
         try:
-            text = filepath.read_text(encoding='utf-8')
+            with open(filepath, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return []
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    # The scan decodes every byte, so an undecodable file yields nothing before any section is parsed and reported
+                    pieces = list(scan_sections(data))
         except (UnicodeDecodeError, OSError):
             return []
-        file_location = self._config.derive_path(filepath)
-
-        start_marker = '[<'
-        end_marker = '>]'
-        pos = 0
 
-        while True:
-            start_pos = text.find(start_marker, pos)
-
-            if start_pos == -1:
-                break
-
-            # Text before this artifact
-            gap = text[pos:start_pos]
+        file_location = self._config.derive_path(filepath)
+        for gap, segment, start_line, end_line in pieces:
             if gap:
                 blocks.append(TextBlock(content=gap))
+            if segment is not None:
+                location = LineLocation(loc_file=file_location, loc_lines=(start_line, end_line))
+                blocks.append(self._section_block(segment, location))
+        return blocks
 
-            end_pos = text.find(end_marker, start_pos)
-            if end_pos == -1:
-                break
-
-            segment_end = end_pos + len(end_marker)
-            segment = text[start_pos:segment_end]
-            start_line = text.count('\n', 0, start_pos) + 1
-            end_line = text.count('\n', 0, segment_end) + 1
-            section_start_string = segment.split('\n', 1)[0]
-            location = LineLocation(loc_file=file_location, loc_lines=(start_line, end_line))
-
-            lg.debug(f'Found section at line {start_line}, parsing: {section_start_string}')
-
-            try:
-                tree = self._parser.parse(segment)
-                section = self._transformer.transform(tree)
-
-                builder = ArtifactBuilder(self._config, TextArtifact, 'text', location, self._metamodel, record=self._record)
-
-                aid: str | None = None
-                atype: str | None = self._record.default_atype
-                header = section['header']
-                body = section['body'] or ''
-
-                for item in header:
-                    if isinstance(item, IdRef):
-                        aid = item.value
-                    if isinstance(item, ATypeRef):
-                        atype = item.value
+    def _section_block(self, segment: str, location: LineLocation) -> Block:
+        section_start_string = segment.split('\n', 1)[0]
+        lg.debug(f'Found section at line {location.loc_lines[0]}, parsing: {section_start_string}')
 
-                if aid is None:
-                    error = self._format_error(_('Missing ID'), location, section_start_string, _('ID is required'))
-                    lg.warning(error)
-                    aid = UNDEFINED_ID
+        try:
+            tree = self._parser.parse(segment)
+            section = self._transformer.transform(tree)
 
-                builder.add_id(aid, atype)
-                builder.add_field('id', aid)
-                builder.add_field('contents', body.strip())
+            builder = ArtifactBuilder(self._config, TextArtifact, 'text', location, self._metamodel, record=self._record)
 
-                for item in header:
-                    if isinstance(item, tuple):
-                        builder.add_field(item[0], item[1])
+            aid: str | None = None
+            atype: str | None = self._record.default_atype
+            header = section['header']
+            body = section['body'] or ''
 
-                artifact = builder.build()
-                blocks.append(ArtifactBlock(artifact=artifact, raw_text=segment))
+            for item in header:
+                if isinstance(item, IdRef):
+                    aid = item.value
+                if isinstance(item, ATypeRef):
+                    atype = item.value
 
-            except (exceptions.ParseError, exceptions.UnexpectedToken) as e:
-                error = self._format_error(_('Parse Error'), location, section_start_string, str(e))
+            if aid is None:
+                error = self._format_error(_('Missing ID'), location, section_start_string, _('ID is required'))
                 lg.warning(error)
-                blocks.append(ErrorBlock(message=error, raw_text=segment))
+                aid = UNDEFINED_ID
 
-            except ValidationError as e:
-                error = self._format_error(_('Malformed artifact'), location, section_start_string, str(e))
-                lg.warning(error)
-                blocks.append(ErrorBlock(message=error, raw_text=segment))
+            builder.add_id(aid, atype)
+            builder.add_field('id', aid)
+            builder.add_field('contents', body.strip())
 
-            pos = segment_end
+            for item in header:
+                if isinstance(item, tuple):
+                    builder.add_field(item[0], item[1])
 
-        # Text after the last artifact
-        gap = text[pos:]
-        if gap:
-            blocks.append(TextBlock(content=gap))
+            return ArtifactBlock(artifact=builder.build(), raw_text=segment)
 
-        return blocks
+        except (exceptions.ParseError, exceptions.UnexpectedToken) as e:
+            error = self._format_error(_('Parse Error'), location, section_start_string, str(e))
+            lg.warning(error)
+            return ErrorBlock(message=error, raw_text=segment)
+
+        except ValidationError as e:
+            error = self._format_error(_('Malformed artifact'), location, section_start_string, str(e))
+            lg.warning(error)
+            return ErrorBlock(message=error, raw_text=segment)
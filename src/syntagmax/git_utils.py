@@ -5,7 +5,10 @@
 # Description: Git utilities for extracting history and revisions.
 
 import git
+import json
 import logging as lg
+import os
+from collections.abc import Iterable, Iterator
 from datetime import datetime
 from pathlib import Path
 from syntagmax.artifact import ArtifactMap, Revision, LineLocation, FileLocation, Artifact
@@ -24,6 +27,29 @@ def is_dirty(config: Config) -> bool:
         return False
 
 
+def split_paths(output: str) -> list[str]:
+    """Split NUL-separated path output of a git command run with -z."""
+    return [p.strip('\n') for p in output.split('\0') if p.strip('\n')]
+
+
+def is_ancestor(repo: git.Repo, ancestor: str, head: str) -> bool:
+    try:
+        return repo.is_ancestor(ancestor, head)
+    except git.GitCommandError:
+        # The commit is gone (e.g. after a rebase and gc)
+        return False
+
+
+def paths_changed_since(repo: git.Repo, commit: str, head: str) -> set[str]:
+    """Repository-relative paths touched by any commit in commit..head, merge commits included.
+
+    A path can be touched even if its content is the same at both ends (a change and its revert),
+    which still changes what `git blame` reports.
+    """
+    output = repo.git.log('-z', '-m', '--name-only', '--no-renames', '--format=', f'{commit}..{head}')
+    return set(split_paths(output))
+
+
 class RepoCache:
     def __init__(self, config: Config):
         self.config = config
@@ -65,11 +91,444 @@ class RepoCache:
             return None, None
 
 
-def populate_revisions(config: Config, artifacts: ArtifactMap, errors: list[str]):
+def _revision(hexsha: str, committed_date: int, author_email: str) -> Revision:
+    return Revision(
+        hash_long=hexsha,
+        hash_short=hexsha[:7],
+        timestamp=datetime.fromtimestamp(committed_date),
+        author_email=author_email,
+    )
+
+
+def parse_blame_porcelain(output: bytes) -> list[Revision]:
+    """Return the revision of every line of a file (index 0 is line 1) from `git blame --porcelain` output."""
+    commits: dict[str, dict[bytes, bytes]] = {}
+    line_commits: dict[int, str] = {}
+    expect_header = True
+    current: dict[bytes, bytes] = {}
+
+    for line in output.split(b'\n'):
+        if expect_header:
+            if not line:
+                continue
+            # <sha> <line in original file> <line in final file> [<lines in group>]
+            parts = line.split(b' ')
+            sha = parts[0].decode('ascii')
+            line_commits[int(parts[2])] = sha
+            current = commits.setdefault(sha, {})
+            expect_header = False
+        elif line.startswith(b'\t'):
+            expect_header = True
+        else:
+            key, _, value = line.partition(b' ')
+            current.setdefault(key, value)
+
+    revisions: dict[str, Revision] = {}
+    for sha, info in commits.items():
+        email = info.get(b'author-mail', b'').decode('utf-8', errors='replace')
+        if email.startswith('<') and email.endswith('>'):
+            email = email[1:-1]
+        revisions[sha] = _revision(sha, int(info[b'committer-time']), email)
+
+    return [revisions[line_commits[n]] for n in sorted(line_commits)]
+
+
+# Bump when the layout of the revision cache changes in an incompatible way
+REVISION_CACHE_FORMAT = 1
+
+
+def _encode_revision(revision: Revision) -> list:
+    return [revision.hash_long, int(revision.timestamp.timestamp()), revision.author_email]
+
+
+def _decode_revision(data: list) -> Revision:
+    return _revision(data[0], data[1], data[2])
+
+
+class _RepoRevisions:
+    """Cached revisions of one repository that are still valid at its current HEAD."""
+
+    def __init__(self, repo: git.Repo, stored: dict | None):
+        self.head = repo.head.commit.hexsha
+        self.blobs: dict[str, str] = {}
+
+        for entry in repo.git.ls_tree('-r', '-z', 'HEAD').split('\0'):
+            meta, _, path = entry.partition('\t')
+            if path:
+                self.blobs[path] = meta.split()[2]
+
+        # Blame reads the worktree, so modified and untracked files are never cached
+        modified = repo.git.diff('-z', '--name-only', '--no-renames', 'HEAD')
+        untracked = repo.git.ls_files('-z', '--others', '--exclude-standard')
+        self.dirty = set(split_paths(modified)) | set(split_paths(untracked))
+
+        self.blame: dict[str, dict] = {}
+        self.last: dict[str, list | None] = {}
+
+        if not stored:
+            return
+
+        if stored['head'] == self.head:
+            touched: set[str] = set()
+        elif is_ancestor(repo, stored['head'], self.head):
+            touched = paths_changed_since(repo, stored['head'], self.head)
+        else:
+            lg.info(f'Cached revisions were recorded at {stored["head"][:7]}, which is not in the history of HEAD; discarding them')
+            return
+
+        # An entry stays valid while no new commit touched its path
+        self.blame = {path: e for path, e in stored['blame'].items() if path not in touched and self.blobs.get(path) == e['blob']}
+        self.last = {path: e for path, e in stored['last'].items() if path not in touched}
+
+    def to_json(self) -> dict:
+        return {'head': self.head, 'blame': self.blame, 'last': self.last}
+
+
+class RevisionCache:
+    """Revisions of previous runs kept in <cache dir>/revisions.json.
+
+    Blame results are keyed by path and blob SHA at HEAD, last commits by path. Both are reused
+    as long as no commit since the recorded HEAD touched the path. If the recorded HEAD is no longer
+    an ancestor of HEAD (e.g. after a rebase), the repository's entries are discarded.
+    """
+
+    def __init__(self, path: Path):
+        self._path = path
+        self._stored: dict[str, dict] = self._load()
+        self._repos: dict[Path, _RepoRevisions | None] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _load(self) -> dict[str, dict]:
+        if not self._path.exists():
+            return {}
+
+        try:
+            data = json.loads(self._path.read_text(encoding='utf-8'))
+        except (OSError, ValueError) as e:
+            lg.warning(f'Ignoring unreadable revision cache {self._path}: {e}')
+            return {}
+
+        if data.get('format') != REVISION_CACHE_FORMAT:
+            return {}
+
+        return data.get('repos', {})
+
+    def _repo(self, repo: git.Repo, repo_root: Path) -> _RepoRevisions | None:
+        if repo_root not in self._repos:
+            try:
+                self._repos[repo_root] = _RepoRevisions(repo, self._stored.get(str(repo_root)))
+            except (git.GitCommandError, ValueError) as e:
+                lg.debug(f'Not caching revisions of {repo_root}: {e}')
+                self._repos[repo_root] = None
+
+        return self._repos[repo_root]
+
+    def get_blame(self, repo: git.Repo, repo_root: Path, rel_path: str) -> list[Revision] | None:
+        state = self._repo(repo, repo_root)
+        entry = state.blame.get(rel_path) if state and rel_path not in state.dirty else None
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        commits = [_decode_revision(c) for c in entry['commits']]
+        return [commits[i] for i in entry['lines']]
+
+    def put_blame(self, repo: git.Repo, repo_root: Path, rel_path: str, lines: list[Revision]):
+        state = self._repo(repo, repo_root)
+        if state is None or rel_path in state.dirty or rel_path not in state.blobs:
+            return
+
+        indexes: dict[Revision, int] = {}
+        state.blame[rel_path] = {
+            'blob': state.blobs[rel_path],
+            'lines': [indexes.setdefault(revision, len(indexes)) for revision in lines],
+            'commits': [_encode_revision(revision) for revision in indexes],
+        }
+
+    def get_last_commit(self, repo: git.Repo, repo_root: Path, rel_path: str) -> tuple[bool, Revision | None]:
+        """Return (found, revision); a cached path may have no commits at all."""
+        state = self._repo(repo, repo_root)
+
+        if state is None or rel_path not in state.last:
+            self.misses += 1
+            return False, None
+
+        self.hits += 1
+        entry = state.last[rel_path]
+        return True, _decode_revision(entry) if entry else None
+
+    def has_last_commit(self, repo: git.Repo, repo_root: Path, rel_path: str) -> bool:
+        state = self._repo(repo, repo_root)
+        return state is not None and rel_path in state.last
+
+    def put_last_commit(self, repo: git.Repo, repo_root: Path, rel_path: str, revision: Revision | None):
+        state = self._repo(repo, repo_root)
+        if state is not None:
+            state.last[rel_path] = _encode_revision(revision) if revision else None
+
+    def save(self):
+        lg.info(f'Revision cache: {self.hits} hit(s), {self.misses} miss(es)')
+        repos = dict(self._stored)
+
+        for root, state in self._repos.items():
+            if state is None:
+                repos.pop(str(root), None)
+            else:
+                repos[str(root)] = state.to_json()
+
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self._path.with_suffix('.tmp')
+            tmp_path.write_text(json.dumps({'format': REVISION_CACHE_FORMAT, 'repos': repos}), encoding='utf-8')
+            os.replace(tmp_path, self._path)
+        except OSError as e:
+            lg.warning(f'Could not write revision cache: {e}')
+
+
+def open_revision_cache(config: Config) -> RevisionCache | None:
+    """Return the revision cache for the project, or None when caching is disabled."""
+    if not config.cache_enabled():
+        return None
+
+    return RevisionCache(config.cache_dir() / 'revisions.json')
+
+
+class RevisionIndex:
+    """Answers revision queries with one blame per file and one history walk per repository."""
+
+    def __init__(self, config: Config, artifacts: ArtifactMap, cache: RevisionCache | None = None):
+        self.config = config
+        self._artifacts = artifacts
+        self._cache = cache
+        self._blames: dict[tuple[Path, str], list[Revision] | Exception] = {}
+        self._last_commits: dict[Path, dict[str, Revision]] = {}
+
+    def line_revisions(self, repo: git.Repo, repo_root: Path, rel_path: str, start: int, end: int) -> set[Revision]:
+        key = (repo_root, rel_path)
+        lines = self._blames.get(key)
+
+        if lines is None and self._cache is not None:
+            lines = self._cache.get_blame(repo, repo_root, rel_path)
+
+        if lines is None:
+            lg.debug(f'Blaming {rel_path}')
+            try:
+                lines = parse_blame_porcelain(repo.git.blame('--porcelain', '--', rel_path, stdout_as_string=False))
+                if self._cache is not None:
+                    self._cache.put_blame(repo, repo_root, rel_path, lines)
+            except Exception as e:
+                lines = e
+
+        self._blames[key] = lines
+
+        if isinstance(lines, Exception):
+            raise lines
+
+        if start < 1 or end > len(lines) or start > end:
+            raise ValueError(f'invalid line range {start},{end}: {rel_path} has {len(lines)} lines')
+
+        return set(lines[start - 1 : end])
+
+    def last_commit(self, repo: git.Repo, repo_root: Path, rel_path: str) -> Revision | None:
+        if self._cache is not None:
+            found, revision = self._cache.get_last_commit(repo, repo_root, rel_path)
+            if found:
+                return revision
+
+        known = self._last_commits.get(repo_root)
+
+        if known is None:
+            known = self._walk_history(repo, repo_root)
+            self._last_commits[repo_root] = known
+
+        if rel_path in known:
+            revision = known[rel_path]
+        else:
+            # Not resolved by the walk: ask git for this path alone
+            commit = next(iter(repo.iter_commits('HEAD', paths=rel_path, max_count=1)), None)
+            revision = _revision(commit.hexsha, commit.committed_date, commit.author.email) if commit else None
+
+        if self._cache is not None:
+            self._cache.put_last_commit(repo, repo_root, rel_path, revision)
+
+        return revision
+
+    def _file_paths(self, repo: git.Repo, repo_root: Path) -> set[str]:
+        """Paths of all file-level artifacts and their sidecars inside the repository."""
+        base_dir = Path(self.config.base_dir())
+        paths = set()
+
+        for artifact in self._artifacts.values():
+            if not isinstance(artifact.location, FileLocation):
+                continue
+            for path in (artifact.location.loc_file, artifact.location.loc_sidecar):
+                if not path:
+                    continue
+                abs_path = (base_dir / path).absolute().resolve()
+                if abs_path.is_relative_to(repo_root):
+                    paths.add(str(abs_path.relative_to(repo_root)))
+
+        # Paths answered by the revision cache do not need the walk
+        if self._cache is not None:
+            paths = {p for p in paths if not self._cache.has_last_commit(repo, repo_root, p)}
+
+        return paths
+
+    def _walk_history(self, repo: git.Repo, repo_root: Path) -> dict[str, Revision]:
+        """Find the last commit of every file-level path with a single walk over the history.
+
+        The walk matches `git rev-list -1 HEAD -- path` for each path. Every path follows the chain
+        that history simplification follows for it: at a merge that changed the path relative to the
+        first parent, it continues with the first parent that has the same blob, and the merge itself
+        is the last commit when no parent has it. Commits come in topological order, so all chains
+        reaching a commit are known before it is processed, and the walk stops once every chain ends.
+        """
+        pending = self._file_paths(repo, repo_root)
+        resolved: dict[str, Revision] = {}
+
+        if not pending:
+            return resolved
+
+        try:
+            # -z keeps paths unquoted (core.quotePath would escape non-ASCII names) and NUL-terminated
+            proc = repo.git.log(
+                '--topo-order',
+                '--root',
+                '--no-renames',
+                '--raw',
+                '--no-abbrev',
+                '--diff-merges=first-parent',
+                '-z',
+                '--format=%x01%H%x02%ct%x02%ae%x02%P',
+                'HEAD',
+                as_process=True,
+            )
+        except git.GitCommandError as e:
+            lg.debug(f'History walk failed in {repo_root}: {e}')
+            return resolved
+
+        # Paths whose chains have reached a commit not processed yet
+        waiting: dict[str, set[str]] = {}
+        finished = True
+
+        for i, (hexsha, committed_date, author_email, parents, changes) in enumerate(_log_commits(_nul_separated(proc.stdout))):
+            paths = pending if i == 0 else waiting.pop(hexsha, None)
+            if not paths:
+                continue
+
+            revision = _revision(hexsha, int(committed_date), author_email)
+
+            for path in changes.keys() & paths:
+                paths.discard(path)
+                # Simplification follows the first parent that is TREESAME for the path
+                same = next((parent for parent in parents[1:] if _blob_at(repo, parent, path) == changes[path]), None)
+                if same is None:
+                    resolved[path] = revision
+                else:
+                    _join(waiting, same, {path})
+
+            if paths and parents:
+                _join(waiting, parents[0], paths)
+
+            if not waiting:
+                finished = False
+                break
+
+        if finished:
+            try:
+                proc.wait()
+            except git.GitCommandError as e:
+                lg.debug(f'History walk failed in {repo_root}: {e}')
+                return {}
+        else:
+            proc.kill()
+            # Reap the killed child; its non-zero status is expected
+            try:
+                proc.wait()
+            except git.GitCommandError:
+                pass
+
+        lg.debug(f'History walk resolved {len(resolved)} path(s) in {repo_root}')
+        return resolved
+
+
+_NO_BLOB = ('000000', '0' * 40)
+
+
+def _blob_at(repo: git.Repo, commit: str, path: str) -> tuple[str, str]:
+    """Mode and blob SHA of a path in a commit, as `git log --raw` reports them."""
+    try:
+        item = repo.commit(commit).tree[path]
+    except KeyError:
+        return _NO_BLOB
+    return f'{item.mode:06o}', item.hexsha
+
+
+def _join(waiting: dict[str, set[str]], commit: str, paths: set[str]):
+    existing = waiting.get(commit)
+    if existing is None:
+        waiting[commit] = paths
+    elif len(existing) < len(paths):
+        paths |= existing
+        waiting[commit] = paths
+    else:
+        existing |= paths
+
+
+def _log_commits(fields: Iterable[bytes]) -> Iterator[tuple[str, str, str, list[str], dict[str, tuple[str, str]]]]:
+    """Commits of `git log -z --raw` output with the walk's header format.
+
+    Yields (hexsha, committed date, author email, parents, changes), where changes maps each path the
+    commit changed (relative to its first parent) to its new mode and blob SHA.
+    """
+    header: list[str] | None = None
+    changes: dict[str, tuple[str, str]] = {}
+    status: tuple[str, str] | None = None
+
+    for field in fields:
+        if status is not None:
+            changes[os.fsdecode(field)] = status
+            status = None
+            continue
+
+        # The first entry of a commit follows a newline after its header
+        field = field.removeprefix(b'\n')
+
+        if field.startswith(b'\x01'):
+            if header is not None:
+                yield header[0], header[1], header[2], header[3].split(), changes
+            header = os.fsdecode(field[1:]).split('\x02')
+            changes = {}
+        elif field.startswith(b':'):
+            # :<old mode> <new mode> <old blob> <new blob> <status>, followed by the path
+            _, mode, _, blob, _ = field.decode('ascii').split(' ')
+            status = (mode, blob)
+
+    if header is not None:
+        yield header[0], header[1], header[2], header[3].split(), changes
+
+
+def _nul_separated(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Fields of a NUL-separated byte stream, whatever the chunks it is read in."""
+    rest = b''
+    for chunk in chunks:
+        *fields, rest = (rest + chunk).split(b'\0')
+        yield from fields
+    if rest:
+        yield rest
+
+
+def populate_revisions(config: Config, artifacts: ArtifactMap, errors: list[str], known: dict[str, set[Revision]] | None = None):
     """
     Populate revisions for each artifact in the map using git history.
+    Artifacts found in `known` take the given revisions instead of querying git.
     """
     repos = RepoCache(config)
+    cache = open_revision_cache(config)
+    index = RevisionIndex(config, artifacts, cache)
 
     for artifact in artifacts.values():
         if artifact.atype == 'ROOT':
@@ -81,6 +540,10 @@ def populate_revisions(config: Config, artifacts: ArtifactMap, errors: list[str]
             lg.warning(f'Could not get repo for artifact {artifact.aid}, skipping.')
             continue
 
+        if known and artifact.aid in known:
+            artifact.revisions = known[artifact.aid]
+            continue
+
         revisions = set()
         base_dir = Path(config.base_dir())
         lg.debug(f'Processing revisions for artifact {artifact.aid} at {artifact.location}')
@@ -93,21 +556,11 @@ def populate_revisions(config: Config, artifacts: ArtifactMap, errors: list[str]
 
                 rel_repo_path = abs_path.relative_to(repo_root)
                 start, end = artifact.location.loc_lines
-                lg.debug(f'Blaming {rel_repo_path} lines {start}-{end}')
-                # git blame returns a list of (Commit, list of lines)
-                for commit, _ in repo.blame(None, str(rel_repo_path), L=f'{start},{end}'):
-                    revisions.add(
-                        Revision(
-                            hash_long=commit.hexsha,
-                            hash_short=commit.hexsha[:7],
-                            timestamp=datetime.fromtimestamp(commit.committed_date),
-                            author_email=commit.author.email,
-                        )
-                    )
+                revisions = index.line_revisions(repo, repo_root, str(rel_repo_path), start, end)
                 lg.debug(f'Found {len(revisions)} revisions for {artifact.aid}')
 
             elif isinstance(artifact.location, FileLocation):
-                # Last commit for the file itself
+                # Last commit for the file itself and its sidecar
                 paths = [artifact.location.loc_file]
                 if artifact.location.loc_sidecar:
                     paths.append(artifact.location.loc_sidecar)
@@ -117,16 +570,9 @@ def populate_revisions(config: Config, artifacts: ArtifactMap, errors: list[str]
 
                     rel_repo_path = abs_path.relative_to(repo_root)
                     lg.debug(f'Getting history for {rel_repo_path}')
-                    # Use repo.iter_commits('HEAD', paths=path, max_count=1) for both the file and its sidecar
-                    for commit in repo.iter_commits('HEAD', paths=str(rel_repo_path), max_count=1):
-                        revisions.add(
-                            Revision(
-                                hash_long=commit.hexsha,
-                                hash_short=commit.hexsha[:7],
-                                timestamp=datetime.fromtimestamp(commit.committed_date),
-                                author_email=commit.author.email,
-                            )
-                        )
+                    revision = index.last_commit(repo, repo_root, str(rel_repo_path))
+                    if revision is not None:
+                        revisions.add(revision)
 
                 lg.debug(f'Found {len(revisions)} revisions for {artifact.aid}')
         except Exception as e:
@@ -135,3 +581,6 @@ def populate_revisions(config: Config, artifacts: ArtifactMap, errors: list[str]
             errors.append(message)
 
         artifact.revisions = revisions
+
+    if cache is not None:
+        cache.save()
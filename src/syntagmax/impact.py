@@ -9,6 +9,7 @@ from benedict import benedict
 
 from syntagmax.artifact import ArtifactMap
 from syntagmax.config import Config
+from syntagmax.tree import reachability
 
 
 def perform_impact_analysis(config: Config, artifacts: ArtifactMap, errors: list[str]) -> benedict:
@@ -71,21 +72,11 @@ CONST_L_CHAR = '└─'
 
 
 def _generate_suspicious_tree(artifacts: ArtifactMap, suspicious_aids: set[str], updated_aids: set[str]) -> str:
-    cache: dict[str, bool] = {}
+    # Artifacts on a path from the root down to a suspicious one
+    relevant = set(suspicious_aids) | reachability(artifacts).ancestors_of(suspicious_aids)
 
     def has_suspicious_descendant(aid: str) -> bool:
-        if aid in cache:
-            return cache[aid]
-        res = False
-        if aid in suspicious_aids:
-            res = True
-        elif aid in artifacts:
-            for cid in artifacts[aid].children:
-                if has_suspicious_descendant(cid):
-                    res = True
-                    break
-        cache[aid] = res
-        return res
+        return aid in relevant
 
     def render_node(aid: str, indent: str = '', last: bool = True, top: bool = True) -> str:
         if not has_suspicious_descendant(aid):
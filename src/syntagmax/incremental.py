@@ -0,0 +1,388 @@
+# SPDX-License-Identifier: MIT
+
+# Author: Boris Resnick
+# Created: 2026-10-16
+# Description: Incremental analysis driven by git changes since the last successful run.
+
+import hashlib
+import json
+import logging as lg
+import os
+import pickle
+from dataclasses import dataclass, field
+from importlib.metadata import version
+from pathlib import Path
+
+import git
+
+from syntagmax.analyse import ValidationResult
+from syntagmax.artifact import Artifact, ArtifactMap, FileLocation, LineLocation, Revision
+from syntagmax.config import Config
+from syntagmax.extract_cache import ExtractionCache, open_extraction_cache, record_fingerprint
+from syntagmax.git_utils import is_ancestor, paths_changed_since, split_paths
+from syntagmax.tree import reachability
+
+# Bump when the pickled state layout changes in an incompatible way
+STATE_FORMAT = 2
+
+
+@dataclass
+class FileSnapshot:
+    digest: str
+    # (normalized path, existed) for every file the extraction result depends on
+    dependencies: list[tuple[str, bool]]
+    aids: list[str]
+
+
+@dataclass
+class ArtifactSnapshot:
+    location: str
+    revisions: frozenset[Revision] | None = None
+    validation: ValidationResult | None = None
+
+
+@dataclass
+class IncrementalState:
+    fingerprint: str
+    heads: dict[str, str] = field(default_factory=dict)
+    files: dict[str, FileSnapshot] = field(default_factory=dict)
+    artifacts: dict[str, ArtifactSnapshot] = field(default_factory=dict)
+    # Files that differed from HEAD (modified or untracked) when the state was recorded
+    dirty: set[str] = field(default_factory=set)
+
+
+@dataclass
+class RepoChanges:
+    """Paths of a repository that may differ from the state recorded by the previous run."""
+
+    root: str
+    head: str
+    tracked: set[str]
+    touched: set[str]
+    # Paths that differ from HEAD in the worktree or index, and untracked files
+    dirty: set[str]
+    # False when the previous run left no usable baseline for this repository
+    has_baseline: bool
+
+
+def _state_fingerprint(config: Config) -> str:
+    payload = {
+        'format': STATE_FORMAT,
+        'version': version('syntagmax'),
+        'records': [record_fingerprint(config, record) for record in config.input_records()],
+        'suppress_tracing': config.params.get('suppress_tracing', False),
+    }
+    data = json.dumps(payload, sort_keys=True)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+def _refers_to(artifact: Artifact, aids: set[str]) -> bool:
+    for value in artifact.fields.values():
+        for item in value if isinstance(value, list) else [value]:
+            if isinstance(item, str) and any(ref.partition('@')[0].strip() in aids for ref in item.split(',')):
+                return True
+    return False
+
+
+class IncrementalAnalysis:
+    """Reuses the results of the previous run for everything git reports as unchanged.
+
+    Extraction results of untouched files are served from the extraction cache without
+    reading them. Validation results and revisions are reused for artifacts outside the
+    closure of the changed ones: their ancestors, descendants and the artifacts referring to them.
+    """
+
+    def __init__(self, config: Config):
+        self._config = config
+        self._path = config.cache_dir() / 'incremental.pickle'
+        self._fingerprint = _state_fingerprint(config)
+        self._previous = self._load()
+        self._state = IncrementalState(fingerprint=self._fingerprint)
+        self._real_dirs: dict[str, str] = {}
+        self._repos = self._scan_repos()
+        self._cache: ExtractionCache | None = None
+        self._changed_aids: set[str] | None = None
+        self._revisions_recorded = False
+        self._validation_recorded = False
+
+    @classmethod
+    def open(cls, config: Config) -> 'IncrementalAnalysis | None':
+        """Return an incremental analysis, or None when the extraction cache it relies on is disabled."""
+        if not config.cache_enabled():
+            lg.warning('Incremental analysis requires the extraction cache, running a full analysis')
+            return None
+
+        return cls(config)
+
+    def _load(self) -> IncrementalState | None:
+        if not self._path.exists():
+            lg.info('No previous incremental state, running a full analysis')
+            return None
+
+        try:
+            with open(self._path, 'rb') as f:
+                state = pickle.load(f)
+        except Exception as e:
+            lg.warning(f'Ignoring unreadable incremental state {self._path}: {e}')
+            return None
+
+        if not isinstance(state, IncrementalState) or state.fingerprint != self._fingerprint:
+            lg.info('Configuration changed since the previous run, running a full analysis')
+            return None
+
+        return state
+
+    def _real(self, path: str) -> str:
+        directory, name = os.path.split(os.path.normpath(path))
+        real_dir = self._real_dirs.get(directory)
+
+        if real_dir is None:
+            real_dir = os.path.realpath(directory)
+            self._real_dirs[directory] = real_dir
+
+        return os.path.join(real_dir, name)
+
+    def _scan_repos(self) -> dict[str, RepoChanges]:
+        repos: dict[str, RepoChanges] = {}
+
+        for record in self._config.input_records():
+            try:
+                repo = git.Repo(record.record_base, search_parent_directories=True)
+            except (git.InvalidGitRepositoryError, git.NoSuchPathError):
+                lg.info(f'Input record {record.name} is not in a git repository, its files are always checked')
+                continue
+
+            root = os.path.realpath(repo.working_tree_dir)
+            if root in repos:
+                continue
+
+            try:
+                repos[root] = self._repo_changes(repo, root)
+            except (git.GitCommandError, ValueError) as e:
+                lg.warning(f'Could not determine changes in {root}: {e}')
+
+        return repos
+
+    def _repo_changes(self, repo: git.Repo, root: str) -> RepoChanges:
+        head = repo.head.commit.hexsha
+        previous_head = self._previous.heads.get(root) if self._previous else None
+
+        def absolute(paths: list[str]) -> set[str]:
+            return {os.path.join(root, os.path.normpath(p)) for p in paths}
+
+        tracked = absolute(split_paths(repo.git.ls_files('-z')))
+        untracked = split_paths(repo.git.ls_files('-z', '--others', '--exclude-standard'))
+        dirty = absolute([*split_paths(repo.git.diff('-z', '--name-only', '--no-renames', 'HEAD')), *untracked])
+
+        if previous_head is None or not is_ancestor(repo, previous_head, head):
+            return RepoChanges(root=root, head=head, tracked=tracked, touched=set(), dirty=dirty, has_baseline=False)
+
+        committed = paths_changed_since(repo, previous_head, head)
+        worktree = repo.git.diff('-z', '--name-only', '--no-renames', previous_head)
+        touched = absolute([*committed, *split_paths(worktree), *untracked])
+
+        lg.info(f'{len(touched)} file(s) changed in {root} since {previous_head[:7]}')
+        return RepoChanges(root=root, head=head, tracked=tracked, touched=touched, dirty=dirty, has_baseline=True)
+
+    def _repo_for(self, path: str) -> RepoChanges | None:
+        # The innermost repository wins for nested worktrees
+        roots = [root for root in self._repos if path.startswith(root + os.sep)]
+        return self._repos[max(roots, key=len)] if roots else None
+
+    def _unchanged(self, path: str, existed: bool) -> bool:
+        """Whether git guarantees that the file is in the same state as in the previous run."""
+        repo = self._repo_for(path)
+
+        if repo is None or not repo.has_baseline:
+            return False
+
+        # A file that was dirty in the previous run may have been reverted since, which git does not report
+        if self._previous is not None and path in self._previous.dirty:
+            return False
+
+        if path in repo.tracked:
+            return existed and path not in repo.touched
+
+        # Neither git nor the previous run know the file: unchanged only if it still does not exist
+        return not existed and not os.path.exists(path)
+
+    def extraction_cache(self) -> ExtractionCache | None:
+        """Open the extraction cache, trusting entries of files that git reports as unchanged."""
+        cache = open_extraction_cache(self._config)
+
+        if cache is not None and self._previous is not None:
+            cache.trusted = {
+                key: snapshot.digest
+                for key, snapshot in self._previous.files.items()
+                if all(self._unchanged(path, existed) for path, existed in snapshot.dependencies)
+            }
+            lg.info(f'{len(cache.trusted)} of {len(self._previous.files)} file(s) unchanged since the previous run')
+
+        self._cache = cache
+        return cache
+
+    def _artifact_key(self, artifact: Artifact) -> str | None:
+        if artifact.location is None or artifact.atype == 'ROOT':
+            return None
+        return Path(self._config.base_dir(), artifact.location.filepath()).absolute().as_posix()
+
+    def record_extraction(self, artifacts: list[Artifact]):
+        if self._cache is None:
+            return
+
+        aids_by_key: dict[str, list[str]] = {}
+        for artifact in artifacts:
+            key = self._artifact_key(artifact)
+            if key is not None:
+                aids_by_key.setdefault(key, []).append(artifact.aid)
+
+        for key, entry in self._cache.used_entries().items():
+            if not entry.dependencies:
+                continue
+            self._state.files[key] = FileSnapshot(
+                digest=entry.digest,
+                dependencies=[(self._real(path), sig is not None) for path, sig in zip(entry.dependencies, entry.signature)],
+                aids=aids_by_key.get(key, []),
+            )
+
+        if self._previous is None:
+            return
+
+        # Artifacts of every file not served by git trust count as changed, as do those of removed files
+        trusted = self._cache.trusted_hits()
+        changed: set[str] = set()
+
+        for key, aids in aids_by_key.items():
+            if key not in trusted:
+                changed.update(aids)
+
+        for key, snapshot in self._previous.files.items():
+            if key not in trusted:
+                changed.update(snapshot.aids)
+
+        self._changed_aids = changed
+
+    def _previous_snapshot(self, artifact: Artifact) -> ArtifactSnapshot | None:
+        if self._previous is None:
+            return None
+
+        snapshot = self._previous.artifacts.get(artifact.aid)
+        if snapshot is None or snapshot.location != str(artifact.location):
+            return None
+
+        return snapshot
+
+    def _snapshot(self, artifact: Artifact) -> ArtifactSnapshot:
+        snapshot = self._state.artifacts.get(artifact.aid)
+
+        if snapshot is None:
+            snapshot = ArtifactSnapshot(location=str(artifact.location))
+            self._state.artifacts[artifact.aid] = snapshot
+
+        return snapshot
+
+    def _location_unchanged(self, artifact: Artifact) -> bool:
+        base_dir = self._config.base_dir()
+        paths = []
+
+        if isinstance(artifact.location, LineLocation):
+            paths.append(artifact.location.loc_file)
+        elif isinstance(artifact.location, FileLocation):
+            paths.append(artifact.location.loc_file)
+            if artifact.location.loc_sidecar:
+                paths.append(artifact.location.loc_sidecar)
+        else:
+            return False
+
+        return all(self._unchanged(self._real(Path(base_dir, p).absolute().as_posix()), True) for p in paths)
+
+    def _reusable_revisions(self, artifacts: ArtifactMap) -> dict[str, set[Revision]]:
+        known: dict[str, set[Revision]] = {}
+
+        for aid, artifact in artifacts.items():
+            snapshot = self._previous_snapshot(artifact)
+            if snapshot is not None and snapshot.revisions and self._location_unchanged(artifact):
+                known[aid] = set(snapshot.revisions)
+
+        return known
+
+    def known_revisions(self, artifacts: ArtifactMap) -> dict[str, set[Revision]]:
+        """Revisions of the previous run for artifacts whose files have no new history."""
+        known = self._reusable_revisions(artifacts)
+        lg.info(f'Reusing revisions of {len(known)} artifact(s)')
+        return known
+
+    def record_revisions(self, artifacts: ArtifactMap):
+        self._revisions_recorded = True
+        for artifact in artifacts.values():
+            if artifact.atype != 'ROOT' and artifact.revisions:
+                self._snapshot(artifact).revisions = frozenset(artifact.revisions)
+
+    def _affected(self, artifacts: ArtifactMap, changed: set[str]) -> set[str]:
+        affected = set(changed)
+
+        # Ancestors and descendants of changed artifacts
+        index = reachability(artifacts)
+        affected |= index.ancestors_of(changed) | index.descendants_of(changed)
+
+        # Artifacts referring to a changed ID through any attribute, including IDs that disappeared
+        affected.update(aid for aid, artifact in artifacts.items() if aid not in affected and _refers_to(artifact, changed))
+        return affected
+
+    def _reusable_validation(self, artifacts: ArtifactMap) -> dict[str, ValidationResult]:
+        if self._changed_aids is None:
+            return {}
+
+        affected = self._affected(artifacts, self._changed_aids)
+        known: dict[str, ValidationResult] = {}
+
+        for aid, artifact in artifacts.items():
+            if aid in affected:
+                continue
+            snapshot = self._previous_snapshot(artifact)
+            if snapshot is not None and snapshot.validation is not None:
+                known[aid] = snapshot.validation
+
+        return known
+
+    def known_validation(self, artifacts: ArtifactMap) -> dict[str, ValidationResult]:
+        """Validation results of the previous run for artifacts not affected by the changes."""
+        known = self._reusable_validation(artifacts)
+        total = sum(1 for artifact in artifacts.values() if artifact.atype != 'ROOT')
+        lg.info(f'Re-validating {total - len(known)} of {total} artifact(s)')
+        return known
+
+    def record_validation(self, artifacts: ArtifactMap, results: dict[str, ValidationResult]):
+        self._validation_recorded = True
+        for aid, result in results.items():
+            self._snapshot(artifacts[aid]).validation = result
+
+    def _carry_over(self, artifacts: ArtifactMap):
+        # Results of steps that did not run stay valid for the next run wherever they are not affected by changes
+        if not self._revisions_recorded:
+            for aid, revisions in self._reusable_revisions(artifacts).items():
+                self._snapshot(artifacts[aid]).revisions = frozenset(revisions)
+
+        # Affected artifacts can only be determined once the tree is built
+        if not self._validation_recorded and 'ROOT' in artifacts:
+            for aid, result in self._reusable_validation(artifacts).items():
+                self._snapshot(artifacts[aid]).validation = result
+
+    def save(self, artifacts: ArtifactMap | None):
+        """Persist the state of this run as the baseline of the next one."""
+        if artifacts is not None:
+            self._carry_over(artifacts)
+
+        self._state.heads = {root: repo.head for root, repo in self._repos.items()}
+        self._state.dirty = set().union(*(repo.dirty for repo in self._repos.values()))
+
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self._path.with_suffix('.tmp')
+
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(self._state, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+            os.replace(tmp_path, self._path)
+        except OSError as e:
+            lg.warning(f'Could not write incremental state: {e}')
@@ -7,7 +7,7 @@
 from pathlib import Path
 from typing import Any
 
-from syntagmax.config import ConfigFile, MetricsConfig, ImpactConfig, AiConfig
+from syntagmax.config import ConfigFile, MetricsConfig, ImpactConfig, AiConfig, CacheConfig
 
 
 def get_desc(field: Any) -> str:
@@ -19,7 +19,7 @@ def generate_toml() -> str:
 
     # Global ConfigFile
     for name, field in ConfigFile.model_fields.items():
-        if name in ['input', 'metrics', 'impact', 'metamodel', 'baseline', 'ai']:
+        if name in ['input', 'metrics', 'impact', 'metamodel', 'baseline', 'ai', 'cache']:
             continue
         desc = get_desc(field)
         default = field.default
@@ -106,6 +106,19 @@ def generate_toml() -> str:
         toml_str.append(f'# {name} = {val}')
     toml_str.append('')
 
+    # Cache
+    toml_str.append('# [cache]')
+    for name, field in CacheConfig.model_fields.items():
+        desc = get_desc(field)
+        default = field.default
+        if isinstance(default, bool):
+            val = str(default).lower()
+        else:
+            val = f'"{default}"'
+        toml_str.append(f'# {desc}')
+        toml_str.append(f'# {name} = {val}')
+    toml_str.append('')
+
     return '\n'.join(toml_str)
 
 
@@ -132,4 +145,4 @@ def init_project(cwd: str | None = None) -> None:
 
     gitignore_file = syntagmax_dir / '.gitignore'
     with open(gitignore_file, 'w', encoding='utf-8') as f:
-        f.write('reports/\n')
+        f.write('reports/\ncache/\n')
@@ -0,0 +1,27 @@
+# SPDX-License-Identifier: MIT
+
+# Author: Boris Resnick
+# Created: 2026-10-17
+# Description: Process-wide interning of artifact IDs, types and field names.
+
+from sys import intern
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from syntagmax.artifact import Artifact
+
+__all__ = ['intern', 'intern_artifact']
+
+
+def intern_artifact(artifact: 'Artifact') -> 'Artifact':
+    """Intern the ID, type, field names and parent IDs of an artifact in place.
+
+    Artifacts that did not come through ArtifactBuilder in this process, such as those unpickled
+    from the extraction cache or returned by extraction workers, hold their own copies of these strings.
+    """
+    artifact.aid = intern(artifact.aid)
+    artifact.atype = intern(artifact.atype)
+    if any(intern(name) is not name for name in artifact.fields):
+        artifact.fields = {intern(name): value for name, value in artifact.fields.items()}
+    artifact.pids = [intern(pid) for pid in artifact.pids]
+    return artifact
@@ -0,0 +1,39 @@
+# SPDX-License-Identifier: MIT
+
+# Author: Boris Resnick
+# Created: 2026-10-16
+# Description: Shared registry of compiled Lark parsers.
+
+from functools import cache
+from pathlib import Path
+
+from lark import Lark
+
+_PARSERS: dict[tuple, Lark] = {}
+
+
+@cache
+def read_grammar(path: Path) -> str:
+    return Path(path).read_text(encoding='utf-8')
+
+
+def _options_key(options: dict) -> tuple:
+    # A postlexer is configured by its class, so instances of the same class are interchangeable
+    return tuple(sorted((name, type(value) if name == 'postlex' else value) for name, value in options.items()))
+
+
+def get_parser(grammar: str, **options) -> Lark:
+    """Return a LALR parser for the grammar, building it at most once per process.
+
+    Parsers are shared between callers, so they must not be mutated. Lark also caches
+    the analysed grammar and parse tables on disk, which lets a cold start skip table generation.
+    """
+    options.setdefault('parser', 'lalr')
+    key = (grammar, _options_key(options))
+    parser = _PARSERS.get(key)
+
+    if parser is None:
+        parser = Lark(grammar, cache=True, **options)
+        _PARSERS[key] = parser
+
+    return parser
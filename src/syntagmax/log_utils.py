@@ -5,6 +5,8 @@
 # Description: Logging utilities for Syntagmax CLI.
 
 import logging as lg
+from collections.abc import Iterator
+from contextlib import contextmanager
 
 from rich.logging import RichHandler
 
@@ -68,3 +70,34 @@ def configure_log_display(level_str: str, warnings_as_errors: bool = False):
         if isinstance(h, RichHandler):
             h.setLevel(display_level)
             break
+
+
+class _CaptureHandler(lg.Handler):
+    def __init__(self):
+        super().__init__(level=lg.WARNING)
+        self.records: list[tuple[int, str]] = []
+
+    def emit(self, record: lg.LogRecord):
+        self.records.append((record.levelno, record.getMessage()))
+
+
+@contextmanager
+def capture_warnings() -> Iterator[list[tuple[int, str]]]:
+    """Collect (level, message) pairs of warnings and errors logged within the block.
+
+    The root logger is lowered to WARNING for the duration so that the collected
+    records do not depend on the current display level; handlers keep their own levels.
+    """
+    root_logger = lg.getLogger()
+    handler = _CaptureHandler()
+    previous_level = root_logger.level
+
+    root_logger.addHandler(handler)
+    if previous_level > lg.WARNING:
+        root_logger.setLevel(lg.WARNING)
+
+    try:
+        yield handler.records
+    finally:
+        root_logger.removeHandler(handler)
+        root_logger.setLevel(previous_level)
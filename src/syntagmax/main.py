@@ -11,11 +11,13 @@ from syntagmax.errors import FatalError
 from syntagmax.report import Report
 
 from syntagmax.extract import extract, build_artifact_map
+from syntagmax.extract_cache import CacheStats
 from syntagmax.tree import build_tree, populate_pids
 from syntagmax.render import render_tree_markdown
 from syntagmax.analyse import analyse_tree
-from syntagmax.metrics import calculate_metrics
+from syntagmax.metrics import calculate_metrics, metrics_catalogue
 from syntagmax.git_utils import populate_revisions
+from syntagmax.incremental import IncrementalAnalysis
 from syntagmax.utils import get_execution_plan
 from syntagmax.impact import perform_impact_analysis
 
@@ -43,6 +45,13 @@ DEPS = {
 }
 
 
+def dependencies(config: Config) -> dict[str, set[str]]:
+    """Step dependencies for a configuration: metrics wait for impact analysis when a metric reports suspicious links."""
+    if any(definition.kind == 'suspicious_links' for definition in metrics_catalogue(config)):
+        return {**DEPS, 'metrics': DEPS['metrics'] | {'impact'}}
+    return DEPS
+
+
 def public_steps():
     return [
         'extract',
@@ -57,7 +66,8 @@ def process(requested_step, config: Config) -> Report:
     errors: list = []
     artifacts_list = None
     artifacts = None
-    plan = get_execution_plan(DEPS, requested_step)
+    plan = get_execution_plan(dependencies(config), requested_step)
+    incremental = IncrementalAnalysis.open(config) if config.params.get('incremental', False) else None
 
     for step in plan:
         if step == 'populate_revisions' and config.params.get('no_git', False):
@@ -68,28 +78,35 @@ def process(requested_step, config: Config) -> Report:
 
         match step:
             case 'extract':
-                artifacts_list = extract(config, errors)
+                cache_stats = CacheStats()
+                cache = incremental.extraction_cache() if incremental else None
+                artifacts_list = extract(config, errors, cache_stats, cache=cache)
+                if config.cache_enabled():
+                    report.cache_stats = cache_stats
+                if incremental:
+                    incremental.record_extraction(artifacts_list)
             case 'build_artifact_map':
                 if artifacts_list is None:
                     raise FatalError(f'Artifacts list not initialized for step {step}')
                 artifacts = build_artifact_map(artifacts_list, errors)
+            case 'populate_revisions':
+                if artifacts is None:
+                    raise FatalError(f'Artifacts not initialized for step {step}')
+                known = incremental.known_revisions(artifacts) if incremental else None
+                populate_revisions(config, artifacts, errors, known=known)
+                if incremental:
+                    incremental.record_revisions(artifacts)
+            case 'tree':
+                if artifacts is None:
+                    raise FatalError(f'Artifacts not initialized for step {step}')
+                reuse = incremental.known_validation(artifacts) if incremental else None
+                results = analyse_tree(config, artifacts, errors, reuse=reuse)
+                if incremental:
+                    incremental.record_validation(artifacts, results)
             case 'metrics':
                 if artifacts is None:
                     raise FatalError(f'Artifacts not initialized for step {step}')
-                report.metrics = calculate_metrics(config, artifacts, errors)
-
-                req_type = config.metrics.requirement_type
-                contributing_records = set()
-                for a in artifacts.values():
-                    if a.atype == req_type and a.record:
-                        contributing_records.add(a.record.name)
-
-                if len(contributing_records) > 1:
-                    report.metrics_by_input = []
-                    for record_name in sorted(contributing_records):
-                        per_input_metrics = calculate_metrics(config, artifacts, errors, filter_record_name=record_name)
-                        if per_input_metrics:  # skip if no reqs in this input
-                            report.metrics_by_input.append((record_name, per_input_metrics))
+                report.metrics, report.metrics_by_input = calculate_metrics(config, artifacts, errors)
             case 'impact':
                 if artifacts is None:
                     raise FatalError(f'Artifacts not initialized for step {step}')
@@ -104,6 +121,9 @@ def process(requested_step, config: Config) -> Report:
                     raise FatalError(f'Artifacts not initialized for step {step}')
                 STEPS[step](config, artifacts, errors)
 
+    if incremental:
+        incremental.save(artifacts)
+
     if config.params['render_tree']:
         if artifacts and 'ROOT' in artifacts:
             report.tree_text = render_tree_markdown(artifacts)
@@ -4,13 +4,15 @@
 # Created: 2026-03-18
 # Description: Metamodel DSL loader
 
+from collections.abc import Callable, Mapping
 from pathlib import Path
 import logging as lg
 
-from lark import Lark, Transformer, indenter
+from lark import Transformer, indenter
 
 from syntagmax.errors import FatalError
 from syntagmax.id_utils import count_num_macros
+from syntagmax.lark_utils import get_parser, read_grammar
 
 
 class DSLTransformer(Transformer):
@@ -169,6 +171,22 @@ class DSLIndenter(indenter.Indenter):
 
 _TRUTHY_CACHE = {}
 
+DEFAULT_TRUTHY = frozenset({'true', 'yes', '1'})
+DEFAULT_FALSY = frozenset({'false', 'no', '0'})
+
+
+def truthy_values(rules: dict | list[dict]) -> frozenset[str]:
+    """Lowercased values that make a condition on an attribute with these rules hold."""
+    if isinstance(rules, dict):
+        rules = [rules]
+
+    for rule in rules:
+        type_info = rule.get('type_info', {})
+        if type_info.get('type') == 'boolean' and 'custom_values' in type_info:
+            return frozenset(v.lower() for v in type_info['custom_values']['true'])
+
+    return DEFAULT_TRUTHY
+
 
 def _precompute_truthy_values(metamodel: dict):
     m_id = id(metamodel)
@@ -176,23 +194,14 @@ def _precompute_truthy_values(metamodel: dict):
     for atype, atype_def in artifacts.items():
         attributes = atype_def.get('attributes', {})
         for attr_name, rules in attributes.items():
-            if isinstance(rules, dict):
-                rules = [rules]
-
-            truthy = {'true', 'yes', '1'}
-            for rule in rules:
-                type_info = rule.get('type_info', {})
-                if type_info.get('type') == 'boolean' and 'custom_values' in type_info:
-                    truthy = {v.lower() for v in type_info['custom_values']['true']}
-                    break
-            _TRUTHY_CACHE[(m_id, atype, attr_name)] = truthy
+            _TRUTHY_CACHE[(m_id, atype, attr_name)] = truthy_values(rules)
 
 
 def load_metamodel(model_filename: Path, errors, validate=True):
     try:
-        grammar = (Path(__file__).parent / 'metamodel.lark').read_text()
+        grammar = read_grammar(Path(__file__).parent / 'metamodel.lark')
         lg.debug(f'Using model grammar:\n{grammar}')
-        parser = Lark(grammar, parser='lalr', postlex=DSLIndenter())
+        parser = get_parser(grammar, postlex=DSLIndenter())
         lg.info(f'Read metamodel from {model_filename}')
         metamodel_text = model_filename.read_text(encoding='utf-8')
         lg.debug(f'Using model text:\n{metamodel_text}')
@@ -332,48 +341,47 @@ def evaluate_condition(artifact_fields: dict, atype: str, condition: dict | None
         return True
 
     anchor_name = condition['anchor']
-    negated = condition['negated']
+    cache_key = (id(metamodel), atype, anchor_name)
+
+    if cache_key in _TRUTHY_CACHE:
+        truthy = _TRUTHY_CACHE[cache_key]
+    else:
+        # Use custom truthy values if defined in the metamodel
+        atype_def = metamodel.get('artifacts', {}).get(atype)
+        truthy = truthy_values(atype_def.get('attributes', {}).get(anchor_name, [])) if atype_def else DEFAULT_TRUTHY
+        _TRUTHY_CACHE[cache_key] = truthy
+
+    return _condition_holds(artifact_fields.get(anchor_name), truthy, condition['negated'])
+
 
-    value = artifact_fields.get(anchor_name)
+def _condition_holds(value, truthy: frozenset[str], negated: bool) -> bool:
     if value is None:
         res = False
     elif isinstance(value, bool):
         # OPTIMIZATION: Bypasses string coercion, lowercasing, and set membership
         # check when the attribute value is already parsed as a boolean.
         res = value
+    elif isinstance(value, list):
+        res = len(value) > 0
+    elif isinstance(value, str) and value.strip() == '':
+        res = False
     else:
-        cache_key = (id(metamodel), atype, anchor_name)
-        if cache_key in _TRUTHY_CACHE:
-            truthy = _TRUTHY_CACHE[cache_key]
-        else:
-            # Default truthy values for boolean evaluation
-            truthy = {'true', 'yes', '1'}
-
-            # Use custom truthy values if defined in the metamodel
-            artifacts = metamodel.get('artifacts', {})
-            atype_def = artifacts.get(atype)
-            if atype_def:
-                anchor_rules = atype_def.get('attributes', {}).get(anchor_name, [])
-                if isinstance(anchor_rules, dict):
-                    anchor_rules = [anchor_rules]
-
-                for rule in anchor_rules:
-                    type_info = rule.get('type_info', {})
-                    if type_info.get('type') == 'boolean' and 'custom_values' in type_info:
-                        truthy = {v.lower() for v in type_info['custom_values']['true']}
-                        break
-            _TRUTHY_CACHE[cache_key] = truthy
-
-        if isinstance(value, list):
-            res = len(value) > 0
-        elif isinstance(value, str) and value.strip() == '':
-            res = False
-        else:
-            res = str(value).lower() in truthy
+        res = str(value).lower() in truthy
 
     return not res if negated else res
 
 
+def compile_condition(condition: dict, truthy: frozenset[str]) -> Callable[[Mapping], bool]:
+    """Turn a condition into a predicate over artifact fields, with the truthy values of its anchor bound in."""
+    anchor_name = condition['anchor']
+    negated = condition['negated']
+
+    def holds(fields: Mapping) -> bool:
+        return _condition_holds(fields.get(anchor_name), truthy, negated)
+
+    return holds
+
+
 def is_attribute_mandatory(attr_name: str, atype: str, metamodel: dict | None) -> bool:
     """Determine whether a named attribute is mandatory for a given artifact type.
 
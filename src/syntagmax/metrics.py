@@ -4,68 +4,334 @@
 # Created: 2026-01-04
 # Description: Calculate metrics for a tree of artifacts.
 
+from collections.abc import Callable
+from dataclasses import dataclass
+
 from benedict import benedict
 import polars as pl
 
 from syntagmax.artifact import ArtifactMap
-from syntagmax.config import Config
+from syntagmax.config import Config, MetricDefinition
 from syntagmax.i18n import _
 from syntagmax.report import ReportError, CAT_STRUCTURE
+from syntagmax.store import ArtifactStore
 
+# Prefix of attribute columns in the artifact frame, keeping them apart from the fixed columns
+FIELD_PREFIX = 'field:'
 
-def calculate_metrics(config: Config, artifacts: ArtifactMap, errors: list, filter_record_name: str | None = None) -> benedict:
-    metrics = benedict()
+TRACE_SCHEMA = {'rule': pl.Int64, 'source': pl.String, 'targets': pl.String, 'target': pl.String}
+
+# Frames built from an artifact map, in the layout of the ArtifactStore frames
+ROW = pl.UInt32
+FIELD_SCHEMA = {'row': ROW, 'name': pl.String, 'item': ROW, 'value': pl.String}
+LINK_SCHEMA = {'row': ROW, 'pid': pl.String, 'nominal_revision': pl.String, 'suspicious': pl.Boolean}
+CHILD_SCHEMA = {'row': ROW, 'child': pl.String}
+
+# Metric kinds that read parent links; the depth histogram finds the top level through them when there is no root
+LINK_KINDS = frozenset({'trace_coverage', 'orphans', 'depth_histogram', 'suspicious_links'})
+
+
+@dataclass(frozen=True)
+class MetricFrames:
+    """Frames shared by all metrics of the catalogue."""
+
+    # aid, atype, input_record, depth (with a depth histogram) and one column per attribute used by the catalogue
+    artifacts: pl.LazyFrame
+    # child, child_atype, parent, parent_atype, pinned (has a nominal revision), suspicious
+    links: pl.LazyFrame
+    # rule, source, targets, target: one row per target of every metamodel trace rule
+    traces: pl.LazyFrame
+    status_field: str
+
+
+def _requirements_frame(config: Config, artifacts: ArtifactMap | ArtifactStore) -> pl.DataFrame:
+    """One row per requirement with its input record, status, verification and all field values as strings."""
+    requirements = [a for a in artifacts.values() if a.atype == config.metrics.requirement_type]
+    status_field = config.metrics.status_field
+    verify_field = config.metrics.verify_field
+
+    return pl.DataFrame(
+        {
+            'input_record': [a.record.name if a.record else None for a in requirements],
+            'status': [a.fields.get(status_field, 'UNKNOWN') for a in requirements],
+            'has_verify': [a.fields.get(verify_field) is not None for a in requirements],
+            'values': [[str(item) for field in a.fields.values() for item in (field if isinstance(field, list) else [field])] for a in requirements],
+        },
+        schema_overrides={'input_record': pl.String, 'values': pl.List(pl.String)},
+    )
+
+
+@dataclass(frozen=True)
+class _Tables:
+    """The artifact, field, link and children frames the catalogue reads, laid out as the ArtifactStore frames."""
+
+    artifacts: pl.LazyFrame
+    fields: pl.LazyFrame
+    links: pl.LazyFrame
+    children: pl.LazyFrame
+    has_root: bool
+
+
+def _tables(artifacts: ArtifactMap | ArtifactStore, field_names: list[str], links: bool, children: bool) -> _Tables:
+    """The frames of a store as they are, or of an artifact map with only the fields, links and children asked for.
 
-    source_artifacts = artifacts.values()
-    if filter_record_name is not None:
-        source_artifacts = [a for a in source_artifacts if a.record and a.record.name == filter_record_name]
+    An artifact map is not copied into a whole ArtifactStore: contents, locations and revisions are never read here.
+    """
+    if isinstance(artifacts, ArtifactStore):
+        return _Tables(artifacts.artifact_frame(), artifacts.field_frame(), artifacts.link_frame(), artifacts.children_frame(), 'ROOT' in artifacts)
 
-    df = pl.DataFrame(
-        [
+    rows = list(artifacts.values())
+    field_rows = []
+    for row, a in enumerate(rows):
+        for name in field_names:
+            if name not in a.fields:
+                continue
+            value = a.fields[name]
+            items = (list(enumerate(value)) or [(None, None)]) if isinstance(value, list) else [(None, value)]
+            field_rows.extend((row, name, item, None if item_value is None else str(item_value)) for item, item_value in items)
+
+    link_rows = []
+    if links:
+        for row, a in enumerate(rows):
+            parent_links = {link.pid: link for link in a.parent_links}
+            for pid in a.pids:
+                link = parent_links.get(pid)
+                link_rows.append((row, pid, link.nominal_revision if link else None, link.is_suspicious if link else False))
+
+    child_rows = [(row, child) for row, a in enumerate(rows) for child in a.children] if children else []
+
+    return _Tables(
+        artifacts=pl.LazyFrame(
             {
-                'atype': artifact.atype,
-                'aid': artifact.aid,
-                'status': artifact.fields.get(config.metrics.status_field, 'UNKNOWN'),
-                'verify': artifact.fields.get(config.metrics.verify_field),
-                'has_tbd': any(
-                    config.metrics.tbd_marker in str(item) for field in artifact.fields.values() for item in (field if isinstance(field, list) else [field])
-                ),
-            }
-            for artifact in source_artifacts
-        ]
+                'row': range(len(rows)),
+                'aid': [a.aid for a in rows],
+                'atype': [a.atype for a in rows],
+                'input_record': [a.record.name if a.record is not None else None for a in rows],
+            },
+            schema={'row': ROW, 'aid': pl.String, 'atype': pl.String, 'input_record': pl.String},
+        ),
+        fields=pl.LazyFrame(field_rows, schema=FIELD_SCHEMA, orient='row'),
+        links=pl.LazyFrame(link_rows, schema=LINK_SCHEMA, orient='row'),
+        children=pl.LazyFrame(child_rows, schema=CHILD_SCHEMA, orient='row'),
+        has_root='ROOT' in artifacts,
     )
 
-    requirements = (
-        df.filter(pl.col('atype') == config.metrics.requirement_type)  # type: ignore
+
+def _depths(tables: _Tables) -> pl.DataFrame:
+    """Shortest distance of every reachable artifact from the root, top-level artifacts being at depth 1."""
+    aids = tables.artifacts.select('row', 'aid')
+    children = dict(tables.children.join(aids, on='row').group_by('aid').agg('child').select('aid', 'child').collect().iter_rows())
+    if tables.has_root:
+        level = sorted(children.get('ROOT', []))
+    else:
+        linked = tables.links.join(aids, left_on='pid', right_on='aid', how='semi').select('row').unique()
+        level = aids.join(linked, on='row', how='anti').collect().get_column('aid').to_list()
+    known = set(aids.collect().get_column('aid').to_list())
+
+    depths: dict[str, int] = {}
+    depth = 1
+    while level:
+        next_level = []
+        for aid in level:
+            if aid in depths or aid not in known:
+                continue
+            depths[aid] = depth
+            next_level.extend(children.get(aid, []))
+        level = next_level
+        depth += 1
+    return pl.DataFrame({'aid': list(depths), 'depth': list(depths.values())}, schema={'aid': pl.String, 'depth': pl.Int64})
+
+
+def _frames(config: Config, artifacts: ArtifactMap | ArtifactStore, catalogue: list[MetricDefinition]) -> MetricFrames:
+    status_field = config.metrics.status_field
+    kinds = {definition.kind for definition in catalogue}
+    field_names = sorted({name for definition in catalogue if definition.kind == 'breakdown' for name in (definition.by or [status_field])})
+    tables = _tables(artifacts, field_names, links=bool(kinds & LINK_KINDS), children='depth_histogram' in kinds)
+
+    artifacts_frame = tables.artifacts.select('row', 'aid', pl.col('atype', 'input_record').cast(pl.String)).filter(pl.col('atype') != 'ROOT')
+    if 'depth_histogram' in kinds:
+        artifacts_frame = artifacts_frame.join(_depths(tables).lazy(), on='aid', how='left')
+    values = (
+        tables.fields.with_columns(pl.col('name').cast(pl.String))
+        .filter(pl.col('name').is_in(field_names))
+        .group_by('row', 'name')
+        .agg(pl.col('value').sort_by('item').str.join(', '))
     )
+    for name in field_names:
+        artifacts_frame = artifacts_frame.join(
+            values.filter(pl.col('name') == name).select('row', pl.col('value').alias(FIELD_PREFIX + name)), on='row', how='left'
+        )
 
-    req_count = requirements.height
+    types = artifacts_frame.select('row', 'aid', 'atype')
+    links = (
+        tables.links.join(types, on='row')
+        .join(types.select(pl.col('aid').alias('pid'), pl.col('atype').alias('parent_atype')), on='pid')
+        .select(
+            pl.col('aid').alias('child'),
+            pl.col('atype').alias('child_atype'),
+            pl.col('pid').alias('parent'),
+            'parent_atype',
+            (pl.col('nominal_revision').fill_null('') != '').alias('pinned'),
+            'suspicious',
+        )
+    )
 
-    if req_count == 0:
-        errors.append(ReportError(message=_('Metrics: No requirements found'), category=CAT_STRUCTURE))
-        return metrics
+    trace_rows = []
+    metamodel = config.metamodel
+    if metamodel:
+        rules = [(source, sorted(rule['targets'])) for source, source_rules in metamodel['traces'].items() for rule in source_rules]
+        trace_rows = [(number, source, ', '.join(targets), target) for number, (source, targets) in enumerate(rules) for target in targets]
+
+    return MetricFrames(
+        artifacts=artifacts_frame.drop('row'),
+        links=links,
+        traces=pl.LazyFrame(trace_rows, schema=TRACE_SCHEMA, orient='row'),
+        status_field=status_field,
+    )
+
+
+def _of_type(frame: pl.LazyFrame, column: str, atype: str | None) -> pl.LazyFrame:
+    return frame if atype is None else frame.filter(pl.col(column) == atype)
 
-    metrics['total_requirements'] = req_count
 
-    metrics['requirements_by_status'] = (
-        requirements.group_by('status')  # type: ignore
-        .agg(pl.count())
-        .sort('status')
-        .to_dicts()
+def _trace_coverage(definition: MetricDefinition, frames: MetricFrames) -> pl.LazyFrame:
+    """Share of the source artifacts of every trace rule that link to at least one of its target types."""
+    rules = _of_type(frames.traces, 'source', definition.atype)
+    covered = (
+        frames.links.join(rules, left_on=['child_atype', 'parent_atype'], right_on=['source', 'target'])
+        .group_by('rule')
+        .agg(pl.col('child').n_unique().alias('covered'))
     )
-    metrics['requirements_without_verify_pct'] = (
-        requirements.filter(  # type: ignore
-            pl.col('verify').is_null()
-        ).height
-        / float(req_count)
-        * 100.0
+    return (
+        rules.select('rule', 'source', 'targets')
+        .unique('rule')
+        .join(frames.artifacts.group_by('atype').agg(pl.len().alias('total')), left_on='source', right_on='atype', how='left')
+        .join(covered, on='rule', how='left')
+        .with_columns(pl.col('total', 'covered').fill_null(0).cast(pl.Int64))
+        .with_columns(pl.when(pl.col('total') > 0).then((pl.col('covered') / pl.col('total') * 100.0).round(1)).alias('coverage_pct'))
+        .sort('rule')
+        .select('source', 'targets', 'total', 'covered', 'coverage_pct')
     )
-    metrics['requirements_with_tbd_pct'] = (
-        requirements.filter(  # type: ignore
-            pl.col('has_tbd')
-        ).height
-        / float(req_count)
-        * 100.0
+
+
+def _orphans(definition: MetricDefinition, frames: MetricFrames) -> pl.LazyFrame:
+    """Artifacts linked neither to a parent nor to a child, by type."""
+    return (
+        _of_type(frames.artifacts, 'atype', definition.atype)
+        .join(frames.links, left_on='aid', right_on='child', how='anti')
+        .join(frames.links, left_on='aid', right_on='parent', how='anti')
+        .group_by('atype')
+        .agg(pl.len().alias('count'), pl.col('aid').sort().alias('artifacts'))
+        .with_columns(pl.col('artifacts').list.join(', '))
+        .sort('atype')
+    )
+
+
+def _depth_histogram(definition: MetricDefinition, frames: MetricFrames) -> pl.LazyFrame:
+    """Number of artifacts at each depth below the root; artifacts on a cycle cut off from the root have no depth."""
+    return _of_type(frames.artifacts, 'atype', definition.atype).group_by('depth').agg(pl.len().alias('count')).sort('depth', nulls_last=True)
+
+
+def _breakdown(definition: MetricDefinition, frames: MetricFrames) -> pl.LazyFrame:
+    """Number of artifacts for each combination of attribute values, by type unless restricted to one."""
+    names = definition.by or [frames.status_field]
+    keys = ([] if definition.atype else ['atype']) + [pl.col(FIELD_PREFIX + name).fill_null('UNKNOWN').alias(name) for name in names]
+    return _of_type(frames.artifacts, 'atype', definition.atype).group_by(keys).agg(pl.len().alias('count')).sort(pl.all().exclude('count'))
+
+
+def _suspicious_links(definition: MetricDefinition, frames: MetricFrames) -> pl.LazyFrame:
+    """Links pinned to a parent revision and the share of them flagged by impact analysis, by child and parent type."""
+    return (
+        _of_type(frames.links, 'child_atype', definition.atype)
+        .group_by('child_atype', 'parent_atype')
+        .agg(pl.len().alias('links'), pl.col('pinned').sum().alias('pinned'), pl.col('suspicious').sum().alias('suspicious'))
+        .with_columns(
+            pl.when(pl.col('pinned') > 0).then((pl.col('suspicious') / pl.col('pinned') * 100.0).round(1)).alias('suspicious_pct'),
+        )
+        .sort('child_atype', 'parent_atype')
     )
 
+
+METRIC_KINDS: dict[str, Callable[[MetricDefinition, MetricFrames], pl.LazyFrame]] = {
+    'trace_coverage': _trace_coverage,
+    'orphans': _orphans,
+    'depth_histogram': _depth_histogram,
+    'breakdown': _breakdown,
+    'suspicious_links': _suspicious_links,
+}
+
+
+def default_catalogue() -> list[MetricDefinition]:
+    """The built-in catalogue, reported with builtin_catalogue when the configuration does not define one.
+
+    Suspicious links are left out: they need impact analysis, which the metrics step only runs for a configured suspicious_links metric.
+    """
+    return [
+        MetricDefinition(name=_('Trace coverage'), kind='trace_coverage'),
+        MetricDefinition(name=_('Orphan artifacts'), kind='orphans'),
+        MetricDefinition(name=_('Depth histogram'), kind='depth_histogram'),
+        MetricDefinition(name=_('Artifacts by status'), kind='breakdown'),
+    ]
+
+
+def metrics_catalogue(config: Config) -> list[MetricDefinition]:
+    """The configured catalogue, the built-in one if enabled instead, or none."""
+    if config.metrics.catalogue is not None:
+        return config.metrics.catalogue
+    return default_catalogue() if config.metrics.builtin_catalogue else []
+
+
+def _summarize(counts: pl.DataFrame) -> benedict:
+    """Metrics of one group from its counts by status."""
+    by_status = counts.group_by('status').agg(pl.col('count').sum(), pl.col('without_verify').sum(), pl.col('with_tbd').sum()).sort('status')
+    req_count = by_status['count'].sum()
+
+    metrics = benedict()
+    metrics['total_requirements'] = req_count
+    metrics['requirements_by_status'] = by_status.select('status', 'count').to_dicts()
+    metrics['requirements_without_verify_pct'] = by_status['without_verify'].sum() / float(req_count) * 100.0
+    metrics['requirements_with_tbd_pct'] = by_status['with_tbd'].sum() / float(req_count) * 100.0
     return metrics
+
+
+def calculate_metrics(config: Config, artifacts: ArtifactMap | ArtifactStore, errors: list) -> tuple[benedict, list[tuple[str, benedict]] | None]:
+    """Calculate metrics over all requirements and, when several input records contribute, for each of them.
+
+    Both come from one aggregation of the requirements by input record and status. The aggregation
+    and every metric of the catalogue are lazy queries over shared frames, collected as one plan.
+    The catalogue frames come from the columns of an ArtifactStore, or for an artifact map from just
+    the attributes, links and children the catalogue reads.
+    """
+    frame = _requirements_frame(config, artifacts)
+
+    if frame.height == 0:
+        errors.append(ReportError(message=_('Metrics: No requirements found'), category=CAT_STRUCTURE))
+        return benedict(), None
+
+    counts_query = (
+        frame.lazy()
+        .group_by('input_record', 'status')
+        .agg(
+            pl.len().alias('count'),
+            (~pl.col('has_verify')).sum().alias('without_verify'),
+            pl.col('values').list.eval(pl.element().str.contains(config.metrics.tbd_marker, literal=True)).list.any().sum().alias('with_tbd'),
+        )
+    )
+
+    catalogue = metrics_catalogue(config)
+    queries = []
+    if catalogue:
+        frames = _frames(config, artifacts, catalogue)
+        queries = [METRIC_KINDS[definition.kind](definition, frames) for definition in catalogue]
+    counts, *results = pl.collect_all([counts_query, *queries])
+
+    metrics = _summarize(counts)
+    metrics['catalogue'] = [
+        {'name': definition.name, 'kind': definition.kind, 'columns': result.columns, 'rows': result.rows()} for definition, result in zip(catalogue, results)
+    ]
+
+    records = sorted(counts['input_record'].drop_nulls().unique())
+    if len(records) <= 1:
+        return metrics, None
+
+    return metrics, [(record_name, _summarize(counts.filter(pl.col('input_record') == record_name))) for record_name in records]
@@ -16,8 +16,11 @@ class Params(TypedDict):
     ai: bool
     cwd: str
     no_git: bool
+    no_cache: NotRequired[bool]
+    jobs: NotRequired[int | None]
     allow_dirty_worktree: bool
     language: str
 
     suppress_tracing: bool
     tasks: bool
+    incremental: NotRequired[bool]
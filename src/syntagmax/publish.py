@@ -11,6 +11,7 @@ from typing import Optional
 from syntagmax.blocks import BlockTree, InputBlock, FileRecord, TextBlock, ArtifactBlock, ErrorBlock, Block
 from syntagmax.config import Config, InputRecord
 from syntagmax.extract import EXTRACTORS
+from syntagmax.extract_cache import open_extraction_cache
 from syntagmax.artifact import Artifact, FileLocation
 from syntagmax.metamodel import is_attribute_mandatory
 from syntagmax.publish_config import PublishConfig, TableSection, TextSection, MarkerRenderSection, AttributePresence
@@ -50,9 +51,11 @@ def generate_block_id(marker: str, content: str, filepath: str) -> str:
 
 def build_block_tree(config: Config) -> tuple[BlockTree, list[str]]:
     tree = BlockTree()
+    cache = open_extraction_cache(config)
 
     for record in config.input_records():
         extractor = EXTRACTORS[record.driver](config, record, config.metamodel)
+        extractor.cache = cache.for_record(record) if cache else None
         sorted_paths = sorted(record.filepaths, key=lambda p: p.relative_to(record.record_base).as_posix())
 
         input_block = InputBlock(name=record.name)
@@ -60,12 +63,15 @@ def build_block_tree(config: Config) -> tuple[BlockTree, list[str]]:
         for filepath in sorted_paths:
             if not filepath.is_file():
                 continue
-            blocks = extractor.extract_blocks_from_file(filepath)
+            blocks = extractor.load_blocks(filepath)
             if blocks:
                 input_block.files.append(FileRecord(path=config.derive_path(filepath), blocks=blocks))
 
         tree.inputs.append(input_block)
 
+    if cache:
+        cache.save()
+
     # Assign deterministic IDs to marked TextBlocks that don't have explicit IDs
     for input_block in tree.inputs:
         for file_record in input_block.files:
@@ -7,9 +7,10 @@
 from pathlib import Path
 from typing import Literal, Union
 import tomllib
-import yaml
 from pydantic import BaseModel, Field, field_validator, ConfigDict
 
+from syntagmax.yaml_utils import safe_load
+
 
 AttributePresence = Literal['all', 'mandatory', 'values-only']
 
@@ -104,7 +105,7 @@ def load_publish_config(path: Path | None, root_dir: Path, *, explicit: bool = F
         suffix = resolved_path.suffix.lower()
 
         if suffix in ('.yaml', '.yml'):
-            data = yaml.safe_load(content) or {}
+            data = safe_load(content) or {}
         elif suffix == '.toml':
             data = tomllib.loads(content)
         else:
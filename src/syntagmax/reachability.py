@@ -0,0 +1,291 @@
+# SPDX-License-Identifier: MIT
+
+# Author: Boris Resnick
+# Created: 2026-10-17
+# Description: Compact reachability index over the artifact hierarchy.
+
+from collections import deque
+from collections.abc import Iterable, Iterator, Mapping, Set
+
+
+def _find_cycle(children: Mapping[str, Iterable[str]], members: set[str]) -> list[str]:
+    """Return a cycle through the smallest member of a strongly connected component, closed by its start."""
+    start = min(members)
+    previous: dict[str, str] = {}
+    queue = deque([start])
+
+    while queue:
+        aid = queue.popleft()
+        for child in sorted(children[aid]):
+            if child == start:
+                path = [aid]
+                while path[-1] != start:
+                    path.append(previous[path[-1]])
+                return [*reversed(path), start]
+            if child in members and child not in previous:
+                previous[child] = aid
+                queue.append(child)
+
+    return [start, start]
+
+
+def _strongly_connected(nodes: set[str], children: Mapping[str, Iterable[str]]) -> list[set[str]]:
+    """Tarjan's algorithm over the subgraph induced by nodes, without recursion.
+
+    Components are returned in reverse topological order: a component comes before the ones it is reachable from.
+    """
+    index: dict[str, int] = {}
+    lowlink: dict[str, int] = {}
+    stack: list[str] = []
+    on_stack: set[str] = set()
+    components: list[set[str]] = []
+
+    for root in sorted(nodes):
+        if root in index:
+            continue
+
+        work = [(root, iter(sorted(c for c in children[root] if c in nodes)))]
+        index[root] = lowlink[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+
+        while work:
+            aid, successors = work[-1]
+            advanced = False
+
+            for child in successors:
+                if child not in index:
+                    index[child] = lowlink[child] = len(index)
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(sorted(c for c in children[child] if c in nodes))))
+                    advanced = True
+                    break
+                if child in on_stack:
+                    lowlink[aid] = min(lowlink[aid], index[child])
+
+            if advanced:
+                continue
+
+            work.pop()
+            if work:
+                lowlink[work[-1][0]] = min(lowlink[work[-1][0]], lowlink[aid])
+
+            if lowlink[aid] == index[aid]:
+                component = set()
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.add(member)
+                    if member == aid:
+                        break
+                components.append(component)
+
+    return components
+
+
+class ReachabilityIndex:
+    """Answers ancestor and descendant queries without materializing per-artifact sets.
+
+    Strongly connected components are numbered in topological order, so an ancestor always has a
+    smaller number than its descendants. Each component carries two post-order labels of a depth-first
+    traversal: the interval of its spanning subtree, which proves reachability, and the interval of
+    everything it reaches, which rules it out. Queries that neither label settles fall back to a
+    search pruned by both. The index stores a fixed number of integers per artifact and per link.
+
+    X is an ancestor of Y when there is a non-empty path of links from X down to Y, so the members of
+    a cycle are ancestors of themselves.
+    """
+
+    def __init__(self, children: Mapping[str, Iterable[str]]):
+        self._aids: list[str] = list(children)
+        ids = {aid: node for node, aid in enumerate(self._aids)}
+        successors = [[ids[c] for c in kids if c in ids] for kids in children.values()]
+
+        self._ids = ids
+        self.cycles: list[list[str]] = []
+        self._condense(children, successors)
+        self._label()
+
+    def _condense(self, children: Mapping[str, Iterable[str]], successors: list[list[int]]):
+        # Kahn's algorithm numbers everything outside cycles; the rest is split into strongly connected components
+        in_degree = [0] * len(successors)
+        for kids in successors:
+            for child in kids:
+                in_degree[child] += 1
+
+        order = [node for node, degree in enumerate(in_degree) if degree == 0]
+        for node in order:
+            for child in successors[node]:
+                in_degree[child] -= 1
+                if in_degree[child] == 0:
+                    order.append(child)
+
+        members: list[tuple[int, ...]] = [(node,) for node in order]
+        cyclic = [False] * len(order)
+
+        if len(order) < len(successors):
+            ordered = set(order)
+            remaining = {self._aids[node] for node in range(len(successors)) if node not in ordered}
+
+            for component in reversed(_strongly_connected(remaining, children)):
+                member = next(iter(component))
+                is_cycle = len(component) > 1 or member in children[member]
+                members.append(tuple(self._ids[aid] for aid in component))
+                cyclic.append(is_cycle)
+                if is_cycle:
+                    self.cycles.append(_find_cycle(children, component))
+
+            self.cycles.sort()
+
+        component_of = [0] * len(successors)
+        for component, nodes in enumerate(members):
+            for node in nodes:
+                component_of[node] = component
+
+        down: list[tuple[int, ...]] = []
+        up: list[list[int]] = [[] for _ in members]
+        for component, nodes in enumerate(members):
+            linked = sorted({component_of[child] for node in nodes for child in successors[node]} - {component})
+            down.append(tuple(linked))
+            for child in linked:
+                up[child].append(component)
+
+        self._members = members
+        self._cyclic = cyclic
+        self._component_of = component_of
+        self._down = down
+        self._up = [tuple(parents) for parents in up]
+
+    def _label(self):
+        count = len(self._members)
+        post = [0] * count
+        tree_low = [0] * count
+        visited = [False] * count
+        counter = 0
+
+        # Components are in topological order, so every traversal starts from a component without parents
+        for start in range(count):
+            if visited[start]:
+                continue
+
+            visited[start] = True
+            tree_low[start] = counter
+            work = [(start, iter(self._down[start]))]
+
+            while work:
+                component, successors = work[-1]
+                for child in successors:
+                    if not visited[child]:
+                        visited[child] = True
+                        tree_low[child] = counter
+                        work.append((child, iter(self._down[child])))
+                        break
+                else:
+                    work.pop()
+                    post[component] = counter
+                    counter += 1
+
+        # Descendants come later in topological order, so one backward sweep covers everything reachable
+        low = list(tree_low)
+        for component in range(count - 1, -1, -1):
+            for child in self._down[component]:
+                if low[child] < low[component]:
+                    low[component] = low[child]
+
+        self._post = post
+        self._tree_low = tree_low
+        self._low = low
+
+    def __contains__(self, aid: object) -> bool:
+        return aid in self._ids
+
+    def __len__(self) -> int:
+        return len(self._aids)
+
+    def is_ancestor(self, aid: str, of: str) -> bool:
+        """Whether aid is an ancestor of the artifact of."""
+        if aid not in self._ids or of not in self._ids:
+            return False
+
+        source = self._component_of[self._ids[aid]]
+        target = self._component_of[self._ids[of]]
+
+        if source == target:
+            return self._cyclic[source]
+
+        return self._reaches(source, target)
+
+    def _reaches(self, source: int, target: int) -> bool:
+        post, tree_low, low = self._post, self._tree_low, self._low
+        label = post[target]
+
+        if source > target or not low[source] <= label <= post[source]:
+            return False
+
+        pending = [source]
+        seen = {source}
+
+        while pending:
+            component = pending.pop()
+            if tree_low[component] <= label <= post[component]:
+                return True
+
+            for child in self._down[component]:
+                if child <= target and child not in seen and low[child] <= label <= post[child]:
+                    seen.add(child)
+                    pending.append(child)
+
+        return False
+
+    def ancestors(self, aid: str) -> set[str]:
+        return self.ancestors_of([aid])
+
+    def descendants(self, aid: str) -> set[str]:
+        return self.descendants_of([aid])
+
+    def ancestors_of(self, aids: Iterable[str]) -> set[str]:
+        """All artifacts that are an ancestor of at least one of aids."""
+        return self._closure(aids, self._up)
+
+    def descendants_of(self, aids: Iterable[str]) -> set[str]:
+        """All artifacts that are a descendant of at least one of aids."""
+        return self._closure(aids, self._down)
+
+    def _closure(self, aids: Iterable[str], links: list[tuple[int, ...]]) -> set[str]:
+        sources = {self._component_of[self._ids[aid]] for aid in aids if aid in self._ids}
+        found = {component for component in sources if self._cyclic[component]}
+        pending = [linked for component in sources for linked in links[component]]
+
+        while pending:
+            component = pending.pop()
+            if component not in found:
+                found.add(component)
+                pending.extend(links[component])
+
+        return {self._aids[node] for component in found for node in self._members[component]}
+
+    def ancestor_view(self, aid: str) -> 'AncestorView':
+        return AncestorView(self, aid)
+
+
+class AncestorView(Set[str]):
+    """Read-only set of the ancestors of one artifact, answered by the reachability index."""
+
+    __slots__ = ('_index', '_aid')
+
+    def __init__(self, index: ReachabilityIndex, aid: str):
+        self._index = index
+        self._aid = aid
+
+    def __contains__(self, aid: object) -> bool:
+        return isinstance(aid, str) and self._index.is_ancestor(aid, self._aid)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index.ancestors(self._aid))
+
+    def __len__(self) -> int:
+        return len(self._index.ancestors(self._aid))
+
+    def __repr__(self) -> str:
+        return f'AncestorView({self._aid!r}, {sorted(self)!r})'
@@ -14,6 +14,7 @@ from jinja2 import Environment, FileSystemLoader, select_autoescape
 
 if TYPE_CHECKING:
     from syntagmax.config import ReportConfig
+    from syntagmax.extract_cache import CacheStats
 
 
 CAT_SCHEMA = 'schema'
@@ -114,6 +115,7 @@ class Report:
     metrics_by_input: list[tuple[str, benedict]] | None = None
     impact: benedict | None = None
     tasks_summary: dict | None = None
+    cache_stats: 'CacheStats | None' = None
     report_config: 'ReportConfig | None' = None
 
     def errors_grouped(self) -> dict[str, list[tuple[str, list['ReportError']]]]:
@@ -0,0 +1,152 @@
+# SPDX-License-Identifier: MIT
+
+# Author: Boris Resnick
+# Created: 2026-10-17
+# Description: Metamodel compiled into per-type rule tables for validation.
+
+import re
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+
+from syntagmax.id_utils import compile_id_schema
+from syntagmax.metamodel import DEFAULT_FALSY, DEFAULT_TRUTHY, compile_condition, truthy_values
+
+type Condition = Callable[[Mapping], bool]
+
+
+@dataclass(frozen=True, slots=True)
+class AttributeRule:
+    name: str
+    mandatory: bool
+    multiple: bool
+    kind: str
+    condition: Condition | None = None
+    # Enumerations: the declared values, in order for messages, and as a set for lookups
+    allowed: tuple = ()
+    allowed_set: frozenset = frozenset()
+    # Booleans: all accepted lowercased values, and the declared ones for messages (None for the defaults)
+    boolean_values: frozenset[str] = frozenset()
+    custom_true: tuple[str, ...] | None = None
+    custom_false: tuple[str, ...] | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class IdRule:
+    schema: str
+    pattern: re.Pattern
+    condition: Condition | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class TraceRule:
+    targets: frozenset[str]
+    mandatory: bool
+    mode: str
+    condition: Condition | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class ArtifactRules:
+    """Everything needed to validate one artifact type, in metamodel order."""
+
+    atype: str
+    # Rules of each attribute
+    attributes: tuple[tuple[str, tuple[AttributeRule, ...]], ...]
+    # Without conditions the active rules are the same for every artifact and only computed once
+    unconditional: bool
+    allowed_names: frozenset[str]
+    id_rules: tuple[IdRule, ...]
+    traces: tuple[TraceRule, ...]
+    trace_targets: frozenset[str]
+
+
+def _compile_attribute(name: str, rule: dict, condition: Condition | None) -> AttributeRule:
+    type_info = rule['type_info']
+    kind = type_info['type']
+    options: dict = {}
+
+    if kind == 'enum':
+        allowed = type_info['allowed']
+        options['allowed'] = tuple(allowed)
+        options['allowed_set'] = frozenset(allowed)
+    elif kind == 'boolean':
+        if 'custom_values' in type_info:
+            custom = type_info['custom_values']
+            options['custom_true'] = tuple(custom['true'])
+            options['custom_false'] = tuple(custom['false'])
+            options['boolean_values'] = frozenset(v.lower() for v in (*custom['true'], *custom['false']))
+        else:
+            options['boolean_values'] = DEFAULT_TRUTHY | DEFAULT_FALSY
+
+    return AttributeRule(
+        name=name,
+        mandatory=rule['presence'] == 'mandatory',
+        multiple=rule.get('multiple', False),
+        kind=kind,
+        condition=condition,
+        **options,
+    )
+
+
+def compile_artifact_rules(atype: str, artifact_def: dict, trace_rules: list[dict]) -> ArtifactRules:
+    attribute_defs = {name: [rules] if isinstance(rules, dict) else rules for name, rules in artifact_def['attributes'].items()}
+    # Conditions use the truthy values of their anchor attribute within the same artifact type
+    truthy = {name: truthy_values(rules) for name, rules in attribute_defs.items()}
+
+    def condition_of(rule: dict) -> Condition | None:
+        condition = rule.get('condition')
+        if not condition:
+            return None
+        return compile_condition(condition, truthy.get(condition['anchor'], DEFAULT_TRUTHY))
+
+    attributes = tuple((name, tuple(_compile_attribute(name, rule, condition_of(rule)) for rule in rules)) for name, rules in attribute_defs.items() if rules)
+
+    id_rules = tuple(
+        IdRule(schema=rule['schema'], pattern=compile_id_schema(rule['schema'], atype), condition=condition_of(rule))
+        for rule in attribute_defs.get('id', [])
+        if rule.get('schema')
+    )
+
+    traces = tuple(
+        TraceRule(
+            targets=frozenset(rule['targets']), mandatory=rule['presence'] == 'mandatory', mode=rule.get('mode', 'timestamp'), condition=condition_of(rule)
+        )
+        for rule in trace_rules
+    )
+
+    return ArtifactRules(
+        atype=atype,
+        attributes=attributes,
+        unconditional=all(rule.condition is None for _, rules in attributes for rule in rules),
+        allowed_names=frozenset(name for name, _ in attributes),
+        id_rules=id_rules,
+        traces=traces,
+        trace_targets=frozenset().union(*(rule.targets for rule in traces)),
+    )
+
+
+def compile_rules(artifact_defs: Mapping[str, dict], trace_defs: Mapping[str, list[dict]]) -> dict[str, ArtifactRules]:
+    """Compile the artifact and trace definitions of a parsed metamodel into rule tables by artifact type."""
+    return {atype: compile_artifact_rules(atype, artifact_def, trace_defs.get(atype, [])) for atype, artifact_def in artifact_defs.items()}
+
+
+def value_is_valid(rule: AttributeRule, val) -> bool:
+    """Whether a single value satisfies the integer, boolean or enum type of a rule; other types always pass."""
+    if rule.kind == 'integer':
+        try:
+            int(val)
+        except (ValueError, TypeError):
+            return False
+        return True
+
+    if rule.kind == 'boolean':
+        return str(val).lower() in rule.boolean_values
+
+    if rule.kind == 'enum':
+        try:
+            return val in rule.allowed_set
+        except TypeError:
+            # Unhashable values never equal a declared value
+            return False
+
+    return True
@@ -0,0 +1,301 @@
+# SPDX-License-Identifier: MIT
+
+# Author: Boris Resnick
+# Created: 2026-10-17
+# Description: Columnar artifact store with lightweight row views.
+
+from array import array
+from collections.abc import Iterable, Iterator, Mapping
+from collections.abc import Set as AbstractSet
+
+import polars as pl
+
+from syntagmax.artifact import Artifact, FileLocation, LineLocation, Location, NotebookLocation, ParentLink, Revision
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from syntagmax.config import InputRecord
+    from syntagmax.reachability import ReachabilityIndex
+
+# Location kinds of the loc_kind column; other locations (such as the root's) are kept as objects
+_NO_LOCATION, _FILE, _LINES, _NOTEBOOK, _OTHER = range(5)
+
+
+def _enum(values: Iterable[str]) -> pl.Enum:
+    return pl.Enum(sorted(set(values)))
+
+
+def _offsets(rows: list[int], count: int) -> array:
+    """Start of every row in a long table sorted by row, with the end as the last entry."""
+    offsets = array('L', [0]) * (count + 1)
+    for row in rows:
+        offsets[row + 1] += 1
+    for i in range(count):
+        offsets[i + 1] += offsets[i]
+    return offsets
+
+
+class ArtifactStore(Mapping[str, 'ArtifactRow']):
+    """Artifacts held in Polars columns, read through ArtifactRow views.
+
+    The store is a read-only replacement for an ArtifactMap once the tree is built: it maps artifact IDs
+    to views with the attributes of Artifact, so code that only reads artifacts (metrics, tree rendering,
+    trace matrices) accepts either. Artifact types, field names, drivers, input records and file paths are
+    interned in dictionaries and stored as codes. Fields, parent links, children and revisions are long
+    tables sorted by row, so a view finds its entries by offset. The frames are exposed as LazyFrames for
+    queries over all artifacts at once.
+
+    Field values are stored as strings. Values that are not a string or a list of strings keep the original
+    object in a side table, so views return exactly what the artifact held.
+    """
+
+    def __init__(self, artifacts: Iterable[Artifact]):
+        artifacts = list(artifacts)
+        self._rows: dict[str, int] = {a.aid: row for row, a in enumerate(artifacts)}
+        self.reachability: 'ReachabilityIndex | None' = next((a.reachability for a in artifacts if a.reachability is not None), None)
+
+        self.records: dict[str, 'InputRecord'] = {a.record.name: a.record for a in artifacts if a.record is not None}
+        self.revisions: list[Revision] = list(dict.fromkeys(r for a in artifacts for r in a.revisions))
+        revision_codes = {revision: code for code, revision in enumerate(self.revisions)}
+
+        self.atypes = _enum(a.atype for a in artifacts)
+        self.field_names = _enum(name for a in artifacts for name in a.fields)
+        self._objects: dict[tuple[int, str], object] = {}
+        self._locations: dict[int, Location] = {}
+
+        loc_kind, loc_file, loc_sidecar, loc_start, loc_end, loc_cell = [], [], [], [], [], []
+        for row, a in enumerate(artifacts):
+            location = a.location
+            if location is None:
+                loc_kind.append(_NO_LOCATION)
+            elif location.__class__ is NotebookLocation:
+                loc_kind.append(_NOTEBOOK)
+            elif location.__class__ is LineLocation:
+                loc_kind.append(_LINES)
+            elif location.__class__ is FileLocation:
+                loc_kind.append(_FILE)
+            else:
+                loc_kind.append(_OTHER)
+                self._locations[row] = location
+                location = None
+            loc_file.append(location.filepath() if location is not None else None)
+            loc_sidecar.append(getattr(location, 'loc_sidecar', None))
+            lines = getattr(location, 'loc_lines', (None, None))
+            loc_start.append(lines[0])
+            loc_end.append(lines[1])
+            loc_cell.append(getattr(location, 'loc_cell', None))
+
+        self._artifacts = pl.DataFrame(
+            {
+                'aid': [a.aid for a in artifacts],
+                'atype': [a.atype for a in artifacts],
+                'driver': [a.driver for a in artifacts],
+                'input_record': [a.record.name if a.record is not None else None for a in artifacts],
+                'loc_kind': loc_kind,
+                'loc_file': loc_file,
+                'loc_sidecar': loc_sidecar,
+                'loc_start': loc_start,
+                'loc_end': loc_end,
+                'loc_cell': loc_cell,
+            },
+            schema={
+                'aid': pl.String,
+                'atype': self.atypes,
+                'driver': _enum(a.driver for a in artifacts),
+                'input_record': _enum(self.records),
+                'loc_kind': pl.UInt8,
+                'loc_file': _enum(f for f in loc_file if f is not None),
+                'loc_sidecar': pl.String,
+                'loc_start': pl.Int32,
+                'loc_end': pl.Int32,
+                'loc_cell': pl.Int32,
+            },
+        )
+
+        # Long tables: one entry per field value, parent, child and revision
+        field_rows, field_name, field_item, field_value, field_boxed = [], [], [], [], []
+        link_rows, link_pid, link_linked, link_revision, link_suspicious = [], [], [], [], []
+        child_rows, child_aid = [], []
+        revision_rows, revision_code = [], []
+
+        for row, a in enumerate(artifacts):
+            for name, value in a.fields.items():
+                if isinstance(value, list):
+                    items = [(i, item) for i, item in enumerate(value)] or [(None, None)]
+                    boxed = not value or not all(item.__class__ is str for item in value)
+                else:
+                    items = [(None, value)]
+                    boxed = value.__class__ is not str
+                if boxed:
+                    self._objects[(row, name)] = value
+                for item, item_value in items:
+                    field_rows.append(row)
+                    field_name.append(name)
+                    field_item.append(item)
+                    field_value.append(None if item_value is None else str(item_value))
+                    field_boxed.append(boxed)
+
+            links = {link.pid: link for link in a.parent_links}
+            for pid in a.pids:
+                link = links.get(pid)
+                link_rows.append(row)
+                link_pid.append(pid)
+                link_linked.append(link is not None)
+                link_revision.append(link.nominal_revision if link else None)
+                link_suspicious.append(link.is_suspicious if link else False)
+
+            for child in sorted(a.children):
+                child_rows.append(row)
+                child_aid.append(child)
+
+            for revision in sorted(a.revisions, key=lambda r: (r.timestamp, r.hash_long)):
+                revision_rows.append(row)
+                revision_code.append(revision_codes[revision])
+
+        self._fields = pl.DataFrame(
+            {'row': field_rows, 'name': field_name, 'item': field_item, 'value': field_value, 'boxed': field_boxed},
+            schema={'row': pl.UInt32, 'name': self.field_names, 'item': pl.UInt32, 'value': pl.String, 'boxed': pl.Boolean},
+        )
+        self._links = pl.DataFrame(
+            {'row': link_rows, 'pid': link_pid, 'linked': link_linked, 'nominal_revision': link_revision, 'suspicious': link_suspicious},
+            schema={'row': pl.UInt32, 'pid': pl.String, 'linked': pl.Boolean, 'nominal_revision': pl.String, 'suspicious': pl.Boolean},
+        )
+        self._children = pl.DataFrame({'row': child_rows, 'child': child_aid}, schema={'row': pl.UInt32, 'child': pl.String})
+        self._revisions = pl.DataFrame({'row': revision_rows, 'revision': revision_code}, schema={'row': pl.UInt32, 'revision': pl.UInt32})
+
+        count = len(artifacts)
+        self._field_offsets = _offsets(field_rows, count)
+        self._link_offsets = _offsets(link_rows, count)
+        self._child_offsets = _offsets(child_rows, count)
+        self._revision_offsets = _offsets(revision_rows, count)
+
+    def __getitem__(self, aid: str) -> 'ArtifactRow':
+        return ArtifactRow(self, self._rows[aid])
+
+    def __contains__(self, aid: object) -> bool:
+        return aid in self._rows
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def artifact_frame(self) -> pl.LazyFrame:
+        """One row per artifact: row, aid, atype, driver and input record name."""
+        return self._artifacts.lazy().with_row_index('row').select('row', 'aid', 'atype', 'driver', 'input_record')
+
+    def field_frame(self) -> pl.LazyFrame:
+        """One row per field value: row, name, item (position in a list, null for a single value) and value as a string."""
+        return self._fields.lazy().select('row', 'name', 'item', 'value')
+
+    def link_frame(self) -> pl.LazyFrame:
+        """One row per parent reference: row, pid, nominal revision and the suspicious flag of impact analysis."""
+        return self._links.lazy().select('row', 'pid', 'nominal_revision', 'suspicious')
+
+    def children_frame(self) -> pl.LazyFrame:
+        return self._children.lazy()
+
+
+class ArtifactRow:
+    """Read-only view of one artifact of an ArtifactStore with the attributes of Artifact."""
+
+    __slots__ = ('_store', '_row')
+
+    def __init__(self, store: ArtifactStore, row: int):
+        self._store = store
+        self._row = row
+
+    def _column(self, name: str):
+        return self._store._artifacts.get_column(name)[self._row]
+
+    def _slice(self, frame: pl.DataFrame, offsets: array) -> pl.DataFrame:
+        start = offsets[self._row]
+        return frame.slice(start, offsets[self._row + 1] - start)
+
+    @property
+    def aid(self) -> str:
+        return self._column('aid')
+
+    @property
+    def atype(self) -> str:
+        return self._column('atype')
+
+    @property
+    def driver(self) -> str:
+        return self._column('driver')
+
+    @property
+    def record(self) -> 'InputRecord | None':
+        name = self._column('input_record')
+        return None if name is None else self._store.records[name]
+
+    @property
+    def location(self) -> Location | None:
+        kind, loc_file, sidecar, start, end, cell = self._store._artifacts.select(
+            'loc_kind', 'loc_file', 'loc_sidecar', 'loc_start', 'loc_end', 'loc_cell'
+        ).row(self._row)
+        if kind == _NOTEBOOK:
+            return NotebookLocation(loc_file, (start, end), cell)
+        if kind == _LINES:
+            return LineLocation(loc_file, (start, end))
+        if kind == _FILE:
+            return FileLocation(loc_file, sidecar)
+        return self._store._locations.get(self._row)
+
+    @property
+    def fields(self) -> dict[str, str | list[str]]:
+        """A fresh dictionary of the field values; changing it does not change the store."""
+        fields: dict = {}
+        objects = self._store._objects
+        for name, item, value, boxed in self._slice(self._store._fields, self._store._field_offsets).select('name', 'item', 'value', 'boxed').iter_rows():
+            if boxed:
+                fields[name] = objects[(self._row, name)]
+            elif item is None:
+                fields[name] = value
+            else:
+                fields.setdefault(name, []).append(value)
+        return fields
+
+    @property
+    def pids(self) -> list[str]:
+        return self._slice(self._store._links, self._store._link_offsets).get_column('pid').to_list()
+
+    @property
+    def parent_links(self) -> list[ParentLink]:
+        links = self._slice(self._store._links, self._store._link_offsets).filter(pl.col('linked')).select('pid', 'nominal_revision', 'suspicious')
+        return [ParentLink(pid=pid, nominal_revision=revision, is_suspicious=suspicious) for pid, revision, suspicious in links.iter_rows()]
+
+    @property
+    def children(self) -> set[str]:
+        return set(self._slice(self._store._children, self._store._child_offsets).get_column('child').to_list())
+
+    @property
+    def revisions(self) -> set[Revision]:
+        revisions = self._store.revisions
+        return {revisions[code] for code in self._slice(self._store._revisions, self._store._revision_offsets).get_column('revision').to_list()}
+
+    @property
+    def latest_revision(self) -> Revision | None:
+        codes = self._slice(self._store._revisions, self._store._revision_offsets).get_column('revision')
+        return self._store.revisions[codes[-1]] if len(codes) else None
+
+    @property
+    def ancestors(self) -> AbstractSet[str]:
+        if self._store.reachability is None:
+            return frozenset()
+        return self._store.reachability.ancestor_view(self.aid)
+
+    def contents(self) -> str:
+        return self.fields.get('contents', '<empty>')
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, ArtifactRow) and other._store is self._store and other._row == self._row
+
+    def __hash__(self) -> int:
+        return hash((id(self._store), self._row))
+
+    def __str__(self) -> str:
+        latest = self.latest_revision
+        return f'{self.atype}።{self.aid}።{self.location}@{latest.hash_short if latest else "none"}'
@@ -10,10 +10,10 @@ from pathlib import Path
 
 from benedict import benedict
 from jinja2 import Environment, FileSystemLoader, ChoiceLoader
-from ruamel.yaml import YAML
 
 from syntagmax.artifact import Artifact, ArtifactMap
 from syntagmax.config import Config, InputRecord
+from syntagmax.yaml_utils import safe_load
 
 
 IMPLICIT_TASK_METAMODEL = {
@@ -203,8 +203,7 @@ def _parse_frontmatter(content: str) -> dict | None:
     if end == -1:
         return None
     yaml_str = content[3:end].strip()
-    yaml = YAML(typ='safe')
     try:
-        return yaml.load(yaml_str)
+        return safe_load(yaml_str)
     except Exception:
         return None
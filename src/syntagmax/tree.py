@@ -4,21 +4,24 @@
 # Created: 2025-04-06
 # Description: Builds a tree of artifacts.
 
-
 from syntagmax.config import Config
 from syntagmax.artifact import ArtifactMap, Artifact, Location, ParentLink
 from syntagmax.i18n import _
+from syntagmax.interning import intern
+from syntagmax.reachability import ReachabilityIndex
 from syntagmax.report import ReportError, CAT_REFERENCE, CAT_STRUCTURE
 
-MAX_TREE_DEPTH = 20
-
 
 class RootLocation(Location):
+    __slots__ = ()
+
     def __str__(self):
         return '<ROOT>'
 
 
 class RootArtifact(Artifact):
+    __slots__ = ()
+
     def __init__(self, config: Config):
         super().__init__(config)
         self.atype = 'ROOT'
@@ -71,7 +74,7 @@ def populate_pids(config: Config, artifacts: ArtifactMap, errors: list):
                         for actual_ref in sub_refs:
                             try:
                                 aid, sep, nominal_revision = actual_ref.partition('@')
-                                aid = aid.strip()
+                                aid = intern(aid.strip())
                                 nominal_revision = nominal_revision.strip() or None if sep else None
 
                                 parent_artifact = artifacts.get(aid)
@@ -121,29 +124,15 @@ def populate_pids(config: Config, artifacts: ArtifactMap, errors: list):
                 # But usually it's just one set of pids per attribute.
 
 
-def gather_ancestors(artifacts: ArtifactMap, ref: str, depth: int = 0) -> str | None:
-    if depth > MAX_TREE_DEPTH:
-        return _('Circular reference detected with {aid}').format(aid=artifacts[ref].aid)
-
-    for child in artifacts[ref].children:
-        artifacts[child].ancestors.add(ref)
-        artifacts[child].ancestors.update(artifacts[ref].ancestors)
-        err = gather_ancestors(artifacts, child, depth + 1)
-
-        if err:
-            return err
-
-    return None
-
-
 def build_tree(config: Config, artifacts: ArtifactMap, errors: list):
     full_set = set(artifacts.keys())
     suppress = config.params.get('suppress_tracing', False)
 
     for a in artifacts.values():
+        aid = intern(a.aid)
         for pid in a.pids:
             if pid in full_set:
-                artifacts[pid].children.add(a.aid)
+                artifacts[pid].children.add(aid)
 
     top_level = set()
     for a in artifacts.values():
@@ -159,14 +148,22 @@ def build_tree(config: Config, artifacts: ArtifactMap, errors: list):
 
     artifacts[root.aid] = root
 
-    for ref in artifacts.keys():
-        err = gather_ancestors(artifacts, ref)
+    index = ReachabilityIndex({aid: a.children for aid, a in artifacts.items()})
+    for a in artifacts.values():
+        a.reachability = index
 
-        if err:
-            errors.append(
-                ReportError(
-                    message=err,
-                    category=CAT_STRUCTURE,
-                )
+    for cycle in index.cycles:
+        errors.append(
+            ReportError(
+                message=_('Circular reference detected with {aid}').format(aid=' → '.join(cycle)),
+                category=CAT_STRUCTURE,
             )
-            break
+        )
+
+
+def reachability(artifacts: ArtifactMap) -> ReachabilityIndex:
+    """The reachability index attached by build_tree, or a fresh one for a hand-built artifact map."""
+    root = artifacts.get('ROOT')
+    if root is not None and root.reachability is not None:
+        return root.reachability
+    return ReachabilityIndex({aid: a.children for aid, a in artifacts.items()})
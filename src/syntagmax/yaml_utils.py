@@ -2,17 +2,33 @@
 
 # Author: Boris Resnick
 # Created: 2026-07-06
-# Description: Round-trip YAML editing utilities using ruamel.yaml.
-#              Preserves key order, comments, and formatting when modifying attrs.
+# Description: YAML loading and round-trip YAML editing utilities.
+#              Loading uses PyYAML (libyaml when available); editing uses ruamel.yaml
+#              to preserve key order, comments, and formatting when modifying attrs.
 
-from typing import Any
+from typing import IO, Any
 
+import yaml
 from ruamel.yaml import YAML
 from ruamel.yaml.comments import CommentedMap
 from ruamel.yaml.error import YAMLError
 from ruamel.yaml.compat import StringIO
 
 
+# libyaml is optional: PyYAML wheels ship it, source builds may not
+SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+def safe_load(stream: str | IO) -> Any:
+    """Parse a YAML document into plain Python objects with the safe loader.
+
+    Uses the C loader of libyaml when PyYAML was built with it. Both loaders implement YAML 1.1, so
+    yes/no/on/off are booleans, as `Extractor._yaml_value_to_str` expects. Raises yaml.YAMLError on
+    malformed input.
+    """
+    return yaml.load(stream, Loader=SafeLoader)
+
+
 class YAMLParsingError(Exception):
     """Raised when a YAML block cannot be parsed by ruamel.yaml."""
 
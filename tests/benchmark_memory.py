@@ -0,0 +1,73 @@
+# SPDX-License-Identifier: MIT
+import gc
+import tracemalloc
+from collections.abc import Callable
+
+from syntagmax.artifact import Artifact, FileLocation, ParentLink
+from syntagmax.blocks import ArtifactBlock
+
+
+class DictArtifact:
+    """The artifact layout without slots, for comparison."""
+
+    __init__ = Artifact.__init__
+
+
+class DictFileLocation:
+    __init__ = FileLocation.__init__
+
+
+class DictParentLink:
+    def __init__(self, pid: str, nominal_revision: str | None = None, is_suspicious: bool = False):
+        self.pid = pid
+        self.nominal_revision = nominal_revision
+        self.is_suspicious = is_suspicious
+
+
+class DictArtifactBlock:
+    def __init__(self, artifact, raw_text: str):
+        self.artifact = artifact
+        self.raw_text = raw_text
+
+
+def make_artifacts(count: int, artifact_class=Artifact, location_class=FileLocation, link_class=ParentLink, block_class=ArtifactBlock) -> list:
+    """Artifacts as an extractor builds them, each with a location, a parent link and a publish block."""
+    items = []
+    for i in range(count):
+        artifact = artifact_class(None)
+        artifact.aid = f'REQ-{i}'
+        artifact.atype = 'REQ'
+        artifact.location = location_class(f'docs/{i // 50}.md')
+        artifact.fields = {'id': artifact.aid, 'status': 'draft', 'contents': 'The system shall respond.'}
+        if i:
+            artifact.pids = [f'REQ-{i // 2}']
+            artifact.parent_links = [link_class(artifact.pids[0])]
+        items.append(block_class(artifact, ''))
+    return items
+
+
+def bytes_per_artifact(factory: Callable[[int], list], count: int) -> float:
+    """Memory allocated per artifact while the objects made by factory are alive."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        items = factory(count)
+        allocated = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del items
+    return allocated / count
+
+
+def run_benchmark(count: int = 100_000):
+    print(f'Measuring {count} artifacts with a location, a parent link and a publish block...')
+    slotted = bytes_per_artifact(make_artifacts, count)
+    plain = bytes_per_artifact(lambda n: make_artifacts(n, DictArtifact, DictFileLocation, DictParentLink, DictArtifactBlock), count)
+    print(f'With __dict__: {plain:.0f} bytes per artifact')
+    print(f'With __slots__: {slotted:.0f} bytes per artifact ({(1 - slotted / plain) * 100:.0f}% less)')
+    return slotted, plain
+
+
+if __name__ == '__main__':
+    run_benchmark()
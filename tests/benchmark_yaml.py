@@ -0,0 +1,70 @@
+# SPDX-License-Identifier: MIT
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+from syntagmax import yaml_utils
+from syntagmax.config import Config
+from syntagmax.extractors.sidecar import SidecarExtractor
+from syntagmax.params import Params
+
+SIDECAR = """id: REQ-{i}
+contents: |
+  The flight computer shall log sensor frame {i} within 10 ms of acquisition.
+parent: SYS-{parent}
+status: {status}
+priority: high
+derived: {derived}
+verify: "Integration test: test_frame_{i}"
+owner: avionics
+"""
+
+
+def make_tree(root: Path, count: int) -> Path:
+    """A sidecar input of count binary files, 100 per directory, each with a .stmx file; returns the config file."""
+    for i in range(count):
+        directory = root / 'bin' / f'{i // 100:03d}'
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / f'blob-{i}.bin').write_bytes(b'\0')
+        sidecar = SIDECAR.format(i=i, parent=i // 10, status=('draft', 'active')[i % 2], derived=('yes', 'no')[i % 2])
+        (directory / f'blob-{i}.bin.stmx').write_text(sidecar, encoding='utf-8')
+    config_file = root / 'config.toml'
+    config_file.write_text('base = "."\n[[input]]\nname = "bin"\ndir = "bin"\ndriver = "sidecar"\natype = "REQ"\nfilter = "**/*.bin"\n', encoding='utf-8')
+    return config_file
+
+
+def extract_seconds(config_file: Path, loader) -> float:
+    """Time a full extraction of the sidecar record with the given PyYAML loader class."""
+    params = Params(verbose=False, render_tree=False, ai=False, no_git=True, allow_dirty_worktree=True, suppress_tracing=True)
+    config = Config(params=params, config_filename=config_file)
+    extractor = SidecarExtractor(config, config.input_records()[0])
+    default = yaml_utils.SafeLoader
+    yaml_utils.SafeLoader = loader
+    try:
+        start = time.perf_counter()
+        artifacts, errors = extractor.extract()
+        elapsed = time.perf_counter() - start
+    finally:
+        yaml_utils.SafeLoader = default
+    assert not errors and artifacts
+    return elapsed
+
+
+def run_benchmark(count: int = 10_000):
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f'Creating {count} sidecar files...')
+        config_file = make_tree(Path(tmp), count)
+        python = extract_seconds(config_file, yaml.SafeLoader)
+        print(f'SafeLoader (pure Python): {python:.2f} s')
+        if not hasattr(yaml, 'CSafeLoader'):
+            print('PyYAML was built without libyaml, CSafeLoader is not available')
+            return python, None
+        c = extract_seconds(config_file, yaml.CSafeLoader)
+        print(f'CSafeLoader (libyaml): {c:.2f} s ({python / c:.1f}x faster)')
+        return python, c
+
+
+if __name__ == '__main__':
+    run_benchmark()
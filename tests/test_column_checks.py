@@ -0,0 +1,95 @@
+import random
+import textwrap
+
+import pytest
+
+from syntagmax.analyse import ArtifactValidator
+from syntagmax.artifact import Artifact, FileLocation
+from syntagmax.metamodel import load_metamodel
+
+MODEL = textwrap.dedent("""
+    artifact REQ:
+        id is string
+        attribute contents is mandatory string
+        attribute priority is mandatory integer
+        attribute active is optional boolean
+        attribute safety is optional boolean [true: "Ja", false: "Nein"]
+        attribute level is mandatory enum [low, high]
+        attribute notes is mandatory string if active
+        attribute tags is optional multiple enum [a, b]
+
+    artifact SYS:
+        id is string
+        attribute contents is mandatory string
+        attribute count is optional integer
+    """)
+
+VALUES = {
+    'priority': ['1', ' 12 ', '+5', '-0', '1_000', '1__0', '_1', '٣', '1.5', '', 'x', True, 7, None, ['1']],
+    'active': ['true', 'YES', '1', 'no', 'False', 'maybe', '', True, 0],
+    'safety': ['ja', 'NEIN', 'true', 'Ja ', False],
+    'level': ['low', 'high', 'Low', 'medium', '', 3, ['low']],
+    'notes': ['text', ''],
+    'tags': [['a', 'b'], ['c'], 'a', []],
+    'count': ['3', 'three', 4],
+    'contents': ['text'],
+    'extra': ['x'],
+}
+
+
+@pytest.fixture
+def metamodel(tmp_path):
+    model_file = tmp_path / 'model.syntagmax'
+    model_file.write_text(MODEL, encoding='utf-8')
+    errors = []
+    metamodel = load_metamodel(model_file, errors)
+    assert not errors
+    return metamodel
+
+
+def _artifacts(count: int) -> dict[str, Artifact]:
+    rng = random.Random(42)
+    artifacts = {}
+    for i in range(count):
+        artifact = Artifact(None)
+        artifact.atype = rng.choice(['REQ', 'REQ', 'SYS', 'OTHER'])
+        artifact.aid = f'{artifact.atype}-{i}'
+        artifact.location = FileLocation('f.md')
+        artifact.fields = {'id': artifact.aid}
+        for name, values in VALUES.items():
+            if rng.random() < 0.8:
+                artifact.fields[name] = rng.choice(values)
+        artifacts[artifact.aid] = artifact
+    return artifacts
+
+
+def _errors(metamodel, artifacts: dict[str, Artifact], columnar: bool) -> list[str]:
+    validator = ArtifactValidator(metamodel, artifacts, suppress_tracing=True)
+    if columnar:
+        validator.prepare(artifacts.values())
+    for artifact in artifacts.values():
+        validator.validate(artifact)
+    return [f'{e.artifact_id}: {e.message}' for e in validator.errors]
+
+
+def test_columnar_checks_report_the_same_errors(metamodel):
+    artifacts = _artifacts(600)
+    expected = _errors(metamodel, artifacts, columnar=False)
+
+    assert _errors(metamodel, artifacts, columnar=True) == expected
+    assert any('cannot be converted to an integer' in e for e in expected)
+    assert any('is not a valid boolean' in e for e in expected)
+    assert any('Missing mandatory attribute' in e for e in expected)
+
+
+def test_artifacts_outside_the_columnar_pass_are_checked_per_artifact(metamodel):
+    artifacts = _artifacts(50)
+    validator = ArtifactValidator(metamodel, artifacts, suppress_tracing=True)
+    validator.prepare([])
+
+    late = Artifact(None)
+    late.atype = 'SYS'
+    late.aid = 'SYS-late'
+    late.fields = {'id': 'SYS-late', 'contents': 'text', 'count': 'many'}
+
+    assert [e.message for e in validator.validate(late)] == ["Attribute 'count' value 'many' cannot be converted to an integer"]
@@ -0,0 +1,80 @@
+# SPDX-License-Identifier: MIT
+# Author: Boris Resnick
+# Created: 2026-10-17
+# Description: Tests for lazy, git-aware input file discovery.
+
+from pathlib import Path
+
+import git
+import pytest
+
+from syntagmax import discovery
+from syntagmax.config import Config
+from syntagmax.discovery import FileDiscovery, GlobMatcher
+from syntagmax.params import Params
+
+FILES = ['a.md', 'b.txt', 'docs/c.md', 'docs/sub/d.md', 'docs/sub/e.py', 'src/f.md', '.hidden/g.md', 'docs/.h.md']
+
+
+def _tree(root: Path, files=FILES):
+    for rel in files:
+        (root / rel).parent.mkdir(parents=True, exist_ok=True)
+        (root / rel).write_text('x', encoding='utf-8')
+
+
+@pytest.mark.parametrize('pattern', ['**/*.md', '*.md', 'docs/**/*.md', 'docs/*', 'docs/**', '**/sub/*', '*/*.md', '**/*'])
+def test_walk_matches_path_glob(tmp_path, pattern):
+    _tree(tmp_path)
+    expected = sorted(p for p in tmp_path.glob(pattern) if p.is_file())
+    assert FileDiscovery(use_git=False).find(tmp_path, pattern) == expected
+
+
+def test_matcher_prunes_outside_literal_prefix():
+    matcher = GlobMatcher('docs/**/*.md')
+    assert matcher.can_contain('docs')
+    assert matcher.can_contain('docs/sub/deeper')
+    assert not matcher.can_contain('src')
+    assert not GlobMatcher('*.md').can_contain('docs')
+    assert GlobMatcher('**/*.md').can_contain('any/where')
+
+
+def test_git_listing_skips_ignored_files(tmp_path):
+    repo = git.Repo.init(tmp_path)
+    _tree(tmp_path, ['reqs/a.md', 'reqs/sub/b.md', 'build/c.md', 'worktrees/w/d.md', 'reqs/new.md'])
+    (tmp_path / '.gitignore').write_text('build/\nworktrees/\n', encoding='utf-8')
+    repo.index.add(['reqs/a.md', 'reqs/sub/b.md', '.gitignore'])
+
+    found = FileDiscovery().find(tmp_path, '**/*.md')
+    assert found == [tmp_path / 'reqs/a.md', tmp_path / 'reqs/new.md', tmp_path / 'reqs/sub/b.md']
+    assert FileDiscovery().find(tmp_path / 'reqs', 'sub/*.md') == [tmp_path / 'reqs/sub/b.md']
+    assert FileDiscovery(use_git=False).find(tmp_path, 'build/*.md') == [tmp_path / 'build/c.md']
+
+
+def test_git_listing_is_shared_between_directories(tmp_path, monkeypatch):
+    git.Repo.init(tmp_path)
+    _tree(tmp_path)
+    calls = []
+    ls_files = discovery._ls_files
+    monkeypatch.setattr(discovery, '_ls_files', lambda repo: calls.append(repo) or ls_files(repo))
+
+    files = FileDiscovery()
+    assert files.find(tmp_path / 'docs', '**/*.md') == [tmp_path / 'docs/.h.md', tmp_path / 'docs/c.md', tmp_path / 'docs/sub/d.md']
+    assert files.find(tmp_path, 'src/*.md') == [tmp_path / 'src/f.md']
+    assert len(calls) == 1
+
+
+def test_config_discovers_files_on_first_use(tmp_path, monkeypatch):
+    _tree(tmp_path)
+    (tmp_path / 'config.toml').write_text('base = "."\n[[input]]\nname = "docs"\ndir = "docs"\ndriver = "obsidian"\natype = "REQ"\n', encoding='utf-8')
+    calls = []
+    find = FileDiscovery.find
+    monkeypatch.setattr(FileDiscovery, 'find', lambda self, *args: calls.append(args) or find(self, *args))
+
+    params = Params(verbose=False, render_tree=False, ai=False, no_git=True, allow_dirty_worktree=True, suppress_tracing=True)
+    record = Config(params=params, config_filename=tmp_path / 'config.toml').input_records()[0]
+    assert not calls
+
+    expected = [tmp_path / 'docs/.h.md', tmp_path / 'docs/c.md', tmp_path / 'docs/sub/d.md']
+    assert list(record.filepaths) == expected
+    assert record.filepaths == expected
+    assert len(calls) == 1
@@ -219,6 +219,20 @@ class TestArtifactBlocks:
         assert len(artifact_blocks) == 1
         assert artifact_blocks[0].artifact.aid == 'REQ-001'
 
+    def test_line_numbers_with_mixed_terminators(self, obsidian_config, input_record_with_markers, tmp_path):
+        """Line ranges are exact for many artifacts ended by every kind of terminator."""
+        endings = ['\n\n', '[/REQ]\n', '```yaml\nattrs:\n  owner: x\n```\n', '# Heading\n', '[COM] note\n']
+        content = ''.join(f'Intro {i}\n[REQ]\nThe system shall {i}.\n[id] REQ-{i}\n{endings[i % len(endings)]}' for i in range(200))
+        blocks = _extract_blocks(obsidian_config, input_record_with_markers, tmp_path, content)
+
+        artifact_blocks = [b for b in blocks if isinstance(b, ArtifactBlock)]
+        assert [b.artifact.aid for b in artifact_blocks] == [f'REQ-{i}' for i in range(200)]
+        for b in artifact_blocks:
+            start = content.index(f'[REQ]\nThe system shall {b.artifact.aid[4:]}.')
+            segment = b.raw_text if content.startswith(b.raw_text, start) else b.raw_text[:-1]
+            first = content.count('\n', 0, start) + 1
+            assert b.artifact.location.loc_lines == (first, first + segment.count('\n'))
+
 
 class TestMarkedTextBlocks:
     """Test marked text block termination by empty lines."""
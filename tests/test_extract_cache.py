@@ -0,0 +1,149 @@
+import textwrap
+from pathlib import Path
+
+from syntagmax.config import Config, Params
+from syntagmax.extract import extract
+from syntagmax.extract_cache import CacheStats
+from syntagmax.report import Report
+
+
+METAMODEL = 'artifact REQ:\n    id is string\n    attribute contents is mandatory string\n'
+
+
+def _setup_project(tmp_path: Path, cache: bool = True) -> Path:
+    project_dir = tmp_path / 'project'
+    (project_dir / 'docs').mkdir(parents=True)
+    (project_dir / 'bin').mkdir()
+
+    config_file = project_dir / 'config.toml'
+    config_file.write_text(
+        textwrap.dedent(f"""
+        base = "."
+
+        [[input]]
+        name = "reqs"
+        dir = "docs"
+        driver = "obsidian"
+
+        [[input]]
+        name = "binaries"
+        dir = "bin"
+        driver = "sidecar"
+        filter = "*.bin"
+
+        [metamodel]
+        filename = "project.syntagmax"
+
+        [cache]
+        enabled = {'true' if cache else 'false'}
+        """).strip(),
+        encoding='utf-8',
+    )
+
+    (project_dir / 'project.syntagmax').write_text(METAMODEL, encoding='utf-8')
+    (project_dir / 'docs' / 'a.md').write_text('[REQ]\nFirst.\n[id] REQ-001\n[/REQ]\n', encoding='utf-8')
+    (project_dir / 'docs' / 'b.md').write_text('[REQ]\nSecond.\n[id] REQ-002\n[/REQ]\n', encoding='utf-8')
+    (project_dir / 'bin' / 'blob.bin').write_bytes(b'\x00\x01')
+    (project_dir / 'bin' / 'blob.bin.stmx').write_text('id: REQ-003\ncontents: Binary\n', encoding='utf-8')
+    return config_file
+
+
+def _load(config_file: Path, **params) -> Config:
+    return Config(Params(render_tree=False, cwd=str(config_file.parent), no_git=True, **params), config_file)  # type: ignore
+
+
+def _run(config: Config) -> tuple[list, list, CacheStats]:
+    errors: list = []
+    stats = CacheStats()
+    artifacts = extract(config, errors, stats)
+    return artifacts, errors, stats
+
+
+def _summary(artifacts) -> list:
+    return [(a.aid, a.atype, str(a.location), a.fields, a.record.name) for a in artifacts]
+
+
+def test_second_run_is_served_from_cache(tmp_path):
+    config = _load(_setup_project(tmp_path))
+
+    first, errors, stats = _run(config)
+    assert not errors
+    assert (stats.hits, stats.misses) == (0, 3)
+
+    second, errors, stats = _run(config)
+    assert not errors
+    assert (stats.hits, stats.misses) == (3, 0)
+    assert _summary(second) == _summary(first)
+    assert all(a._config is config for a in second)
+
+
+def test_changed_file_is_reextracted(tmp_path):
+    config_file = _setup_project(tmp_path)
+    config = _load(config_file)
+    _run(config)
+
+    (config_file.parent / 'docs' / 'b.md').write_text('[REQ]\nSecond, revised.\n[id] REQ-002\n[/REQ]\n', encoding='utf-8')
+
+    artifacts, _, stats = _run(config)
+    assert (stats.hits, stats.misses) == (2, 1)
+    assert next(a for a in artifacts if a.aid == 'REQ-002').fields['contents'].strip() == 'Second, revised.'
+
+
+def test_changed_sidecar_is_reextracted(tmp_path):
+    config_file = _setup_project(tmp_path)
+    config = _load(config_file)
+    _run(config)
+
+    (config_file.parent / 'bin' / 'blob.bin.stmx').write_text('id: REQ-003\ncontents: Updated\n', encoding='utf-8')
+
+    artifacts, _, stats = _run(config)
+    assert (stats.hits, stats.misses) == (2, 1)
+    assert next(a for a in artifacts if a.aid == 'REQ-003').fields['contents'] == 'Updated'
+
+
+def test_metamodel_change_invalidates_cache(tmp_path):
+    config_file = _setup_project(tmp_path)
+    _run(_load(config_file))
+
+    (config_file.parent / 'project.syntagmax').write_text(METAMODEL + '    attribute owner is optional string\n', encoding='utf-8')
+
+    _, _, stats = _run(_load(config_file))
+    assert (stats.hits, stats.misses) == (0, 3)
+
+
+def test_cache_disabled(tmp_path):
+    config_file = _setup_project(tmp_path, cache=False)
+    _, _, stats = _run(_load(config_file))
+    assert (stats.hits, stats.misses) == (0, 0)
+    assert not (config_file.parent / 'cache').exists()
+
+
+def test_no_cache_param_bypasses_cache(tmp_path):
+    config_file = _setup_project(tmp_path)
+    _run(_load(config_file))
+
+    _, _, stats = _run(_load(config_file, no_cache=True))
+    assert (stats.hits, stats.misses) == (0, 0)
+
+
+def test_cached_warnings_are_replayed(tmp_path, caplog):
+    config_file = _setup_project(tmp_path)
+    (config_file.parent / 'docs' / 'c.md').write_text('[REQ]\nNo identifier.\n[/REQ]\n', encoding='utf-8')
+    config = _load(config_file)
+
+    _run(config)
+    fresh = [r.getMessage() for r in caplog.records if r.levelname in ('WARNING', 'ERROR')]
+    caplog.clear()
+
+    _, _, stats = _run(config)
+    replayed = [r.getMessage() for r in caplog.records if r.levelname in ('WARNING', 'ERROR')]
+    assert stats.misses == 0
+    assert replayed == fresh
+
+
+def test_report_shows_cache_stats():
+    report = Report(cache_stats=CacheStats(hits=5, misses=2))
+    text = report.render()
+    assert 'Extraction Cache' in text
+    assert 'Cache hits: 5' in text
+    assert 'Cache misses: 2' in text
@@ -1,9 +1,12 @@
 # SPDX-License-Identifier: MIT
+import pickle
+
 import pytest
 from syntagmax.config import Config, InputRecord
 from syntagmax.extractors.text import TextExtractor
 from syntagmax.extractors.obsidian import ObsidianExtractor
 from syntagmax.params import Params
+from syntagmax.blocks import TextBlock
 
 
 @pytest.fixture
@@ -121,6 +124,23 @@ def test_obsidian_extractor_complex_fields(config, input_record, tmp_path):
     assert artifact.fields['fusion srs#plot data record'].strip() == 'Some value'
 
 
+def test_obsidian_extractor_yaml_data_is_lazy(config, input_record, tmp_path):
+    contents = '[REQ]\nMain contents.\n[id] REQ-4\n```yaml\nattrs:\n  priority: low\n  doc.section: 2.1\n```\n'
+    filepath = tmp_path / 'test_lazy.md'
+    filepath.write_text(contents, encoding='utf-8')
+
+    extractor = ObsidianExtractor(config, input_record)
+    artifacts, errors = extractor.extract_from_file(filepath)
+
+    assert errors == []
+    artifact = artifacts[0]
+    assert artifact.fields['doc.section'] == '2.1'
+    assert artifact._yaml_data is None
+    restored = pickle.loads(pickle.dumps(artifact))
+    assert artifact.yaml_data == restored.yaml_data == {'attrs': {'priority': 'low', 'doc.section': 2.1}}
+    assert type(artifact.yaml_data) is dict
+
+
 def test_obsidian_extractor_field_not_at_bol(config, input_record, tmp_path):
     contents = """[REQ]
 This is contents with [not-a-field] in the middle.
@@ -173,3 +193,20 @@ def test_text_extractor_lowercase(config, input_record, tmp_path):
     assert artifacts[0].atype == 'system-requirement'
     assert artifacts[1].aid == 'REQ-2'
     assert artifacts[1].atype == 'user-requirement'
+
+
+def test_text_extractor_unterminated_section_text_once(config, input_record, tmp_path):
+    filepath = tmp_path / 'open.txt'
+    filepath.write_text('intro\n[<\nID = REQ-1\nno end\n', encoding='utf-8')
+
+    blocks = TextExtractor(config, input_record).extract_blocks_from_file(filepath)
+    assert blocks == [TextBlock(content='intro\n[<\nID = REQ-1\nno end\n')]
+
+
+def test_text_extractor_invalid_utf8_reports_nothing(config, input_record, tmp_path, caplog):
+    filepath = tmp_path / 'bad.txt'
+    filepath.write_bytes(b'[<\n>>>\nno id\n>]\n' + b'x' * 100 + b'\xff\n')
+
+    with caplog.at_level('DEBUG'):
+        assert TextExtractor(config, input_record).extract_blocks_from_file(filepath) == []
+    assert not [r for r in caplog.records if r.levelname == 'WARNING']
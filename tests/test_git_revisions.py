@@ -14,6 +14,7 @@ def mock_config():
     config = MagicMock(spec=Config)
     config.base_dir.return_value = '/mock/repo'
     config.params = {'allow_dirty_worktree': True}
+    config.cache_enabled.return_value = False
     return config
 
 
@@ -33,15 +34,20 @@ def test_populate_revisions_line_location(mock_repo_class, mock_config, mock_art
     mock_repo.is_dirty.return_value = False
     mock_repo.untracked_files = []
 
-    mock_artifact.location = LineLocation('file.md', (1, 10))
-
-    mock_commit = MagicMock()
-    mock_commit.hexsha = '1234567890abcdef'
-    mock_commit.committed_date = 1672531200  # 2023-01-01 00:00:00
-    mock_commit.author.email = 'author@example.com'
-
-    # repo.blame returns list of (Commit, list of lines)
-    mock_repo.blame.return_value = [(mock_commit, ['line1', 'line2'])]
+    mock_artifact.location = LineLocation('file.md', (1, 2))
+
+    # git blame --porcelain prints commit details only for the first line attributed to a commit
+    mock_repo.git.blame.return_value = (
+        b'1234567890abcdef 1 1 2\n'
+        b'author Author\n'
+        b'author-mail <author@example.com>\n'
+        b'author-time 1672531200\n'
+        b'committer-time 1672531200\n'  # 2023-01-01 00:00:00
+        b'filename file.md\n'
+        b'\tline1\n'
+        b'1234567890abcdef 2 2\n'
+        b'\tline2\n'
+    )
 
     artifacts = {'REQ-001': mock_artifact}
     errors = []
@@ -54,7 +60,7 @@ def test_populate_revisions_line_location(mock_repo_class, mock_config, mock_art
     assert rev.author_email == 'author@example.com'
     assert rev.timestamp == datetime.fromtimestamp(1672531200)
 
-    mock_repo.blame.assert_called_once_with(None, 'file.md', L='1,10')
+    mock_repo.git.blame.assert_called_once_with('--porcelain', '--', 'file.md', stdout_as_string=False)
 
 
 @patch('git.Repo')
@@ -154,3 +160,70 @@ def test_populate_revisions_exception_handling(mock_repo_class, mock_config, moc
     populate_revisions(mock_config, artifacts, errors)
 
     assert len(mock_artifact.revisions) == 0
+
+
+@patch('git.Repo')
+def test_populate_revisions_blames_each_file_once(mock_repo_class, mock_config):
+    mock_repo = MagicMock()
+    mock_repo_class.return_value = mock_repo
+    mock_repo.working_tree_dir = '/mock/repo'
+    mock_repo.is_dirty.return_value = False
+    mock_repo.untracked_files = []
+
+    mock_repo.git.blame.return_value = (
+        b'1111111111111111 1 1 1\nauthor-mail <a1@example.com>\ncommitter-time 1672531200\n\tline1\n'
+        b'2222222222222222 2 2 1\nauthor-mail <a2@example.com>\ncommitter-time 1672617600\n\tline2\n'
+        b'1111111111111111 3 3\n\tline3\n'
+    )
+
+    artifacts = {}
+    for aid, lines in (('REQ-001', (1, 1)), ('REQ-002', (2, 3)), ('REQ-003', (3, 3))):
+        artifact = Artifact(mock_config)
+        artifact.atype = 'REQ'
+        artifact.aid = aid
+        artifact.location = LineLocation('file.md', lines)
+        artifacts[aid] = artifact
+
+    errors = []
+    populate_revisions(mock_config, artifacts, errors)
+
+    assert not errors
+    assert mock_repo.git.blame.call_count == 1
+    assert {r.author_email for r in artifacts['REQ-001'].revisions} == {'a1@example.com'}
+    assert {r.author_email for r in artifacts['REQ-002'].revisions} == {'a1@example.com', 'a2@example.com'}
+    assert {r.hash_long for r in artifacts['REQ-003'].revisions} == {'1111111111111111'}
+
+
+@patch('git.Repo')
+def test_populate_revisions_file_locations_from_one_walk(mock_repo_class, mock_config):
+    mock_repo = MagicMock()
+    mock_repo_class.return_value = mock_repo
+    mock_repo.working_tree_dir = '/mock/repo'
+    mock_repo.is_dirty.return_value = False
+    mock_repo.untracked_files = []
+
+    # git log -z --raw output, in chunks that split fields
+    null, blob = '0' * 40, 'f' * 40
+    mock_repo.git.log.return_value.stdout = [
+        f'\x012222222222222222\x021672617600\x02a2@example.com\x021111111111111111\x00\n:100644 100644 {blob} {blob} M\x00'.encode(),
+        b'b.bin.stmx\x00\x011111111111111111\x021672531200\x02a1@exa',
+        f'mple.com\x02\x00\n:000000 100644 {null} {blob} A\x00a.b'.encode(),
+        f'in\x00:000000 100644 {null} {blob} A\x00b.bin\x00:000000 100644 {null} {blob} A\x00b.bin.stmx\x00'.encode(),
+    ]
+
+    artifacts = {}
+    for aid, location in (('REQ-001', FileLocation('a.bin')), ('REQ-002', FileLocation('b.bin', 'b.bin.stmx'))):
+        artifact = Artifact(mock_config)
+        artifact.atype = 'REQ'
+        artifact.aid = aid
+        artifact.location = location
+        artifacts[aid] = artifact
+
+    errors = []
+    populate_revisions(mock_config, artifacts, errors)
+
+    assert not errors
+    assert mock_repo.git.log.call_count == 1
+    mock_repo.iter_commits.assert_not_called()
+    assert {r.hash_long for r in artifacts['REQ-001'].revisions} == {'1111111111111111'}
+    assert {r.hash_long for r in artifacts['REQ-002'].revisions} == {'1111111111111111', '2222222222222222'}
@@ -145,3 +145,164 @@ atype = "requirement"
     populate_revisions(config, artifacts, errors)
     assert len(art1.revisions) == 0
     assert any('Not a git repository' in e for e in errors)
+
+
+def test_populate_revisions_matches_per_artifact_git_queries(tmp_path):
+    from datetime import datetime
+
+    from syntagmax.artifact import Revision
+
+    repo = git.Repo.init(tmp_path)
+    actors = [git.Actor(f'Author {i}', f'a{i}@example.com') for i in range(3)]
+
+    def commit(message, actor, **files):
+        for name, content in files.items():
+            (tmp_path / name).write_text(content, encoding='utf-8')
+        repo.index.add(list(files))
+        return repo.index.commit(message, author=actor, committer=actor)
+
+    commit('one', actors[0], **{'doc.md': ''.join(f'line {i}\n' for i in range(1, 9)), 'a.bin': 'a', 'b.bin': 'b', 'b.bin.stmx': 'id: B'})
+    commit('two', actors[1], **{'doc.md': ''.join(f'line {i}{"*" if i in (3, 4) else ""}\n' for i in range(1, 9)), 'b.bin.stmx': 'id: B2'})
+
+    # A side branch merged back
+    main = repo.active_branch
+    side = repo.create_head('side')
+    side.checkout()
+    commit('side', actors[2], **{'a.bin': 'a2'})
+    main.checkout()
+    commit('three', actors[0], **{'doc.md': ''.join(f'line {i}{"*" if i in (3, 4) else ""}{"!" if i == 7 else ""}\n' for i in range(1, 9))})
+    repo.git.merge('side', '--no-edit')
+    commit('four', actors[1], **{'b.bin': 'b2'})
+
+    (tmp_path / 'config.toml').write_text('base = "."\n[[input]]\nname = "test"\ndir = "."\ndriver = "text"\n', encoding='utf-8')
+    config = Config(params=Params(verbose=False, render_tree=False, ai=False, allow_dirty_worktree=True), config_filename=tmp_path / 'config.toml')
+
+    locations = {
+        'L1': LineLocation('doc.md', (1, 2)),
+        'L2': LineLocation('doc.md', (2, 5)),
+        'L3': LineLocation('doc.md', (6, 8)),
+        'F1': FileLocation('a.bin'),
+        'F2': FileLocation('b.bin', 'b.bin.stmx'),
+    }
+    artifacts = {}
+    for aid, location in locations.items():
+        artifact = Artifact(config)
+        artifact.aid = aid
+        artifact.atype = 'req'
+        artifact.location = location
+        artifacts[aid] = artifact
+
+    errors = []
+    populate_revisions(config, artifacts, errors)
+    assert not errors
+
+    def revision(c):
+        return Revision(hash_long=c.hexsha, hash_short=c.hexsha[:7], timestamp=datetime.fromtimestamp(c.committed_date), author_email=c.author.email)
+
+    for aid, location in locations.items():
+        if isinstance(location, LineLocation):
+            start, end = location.loc_lines
+            expected = {revision(c) for c, _ in repo.blame(None, location.loc_file, L=f'{start},{end}')}
+        else:
+            paths = [location.loc_file] + ([location.loc_sidecar] if location.loc_sidecar else [])
+            expected = {revision(c) for p in paths for c in repo.iter_commits('HEAD', paths=p, max_count=1)}
+        assert artifacts[aid].revisions == expected, aid
+
+
+def test_history_walk_resolves_non_ascii_paths(tmp_path, monkeypatch):
+    repo = git.Repo.init(tmp_path)
+    actor = git.Actor('Author', 'a@example.com')
+    for name in ('спецификация.bin', 'naïve spec.bin', 'plain.bin'):
+        (tmp_path / name).write_text(name, encoding='utf-8')
+        repo.index.add([name])
+        repo.index.commit(name, author=actor, committer=actor)
+
+    (tmp_path / 'config.toml').write_text('base = "."\n[[input]]\nname = "test"\ndir = "."\ndriver = "text"\n', encoding='utf-8')
+    config = Config(params=Params(verbose=False, render_tree=False, ai=False, allow_dirty_worktree=True), config_filename=tmp_path / 'config.toml')
+
+    artifacts = {}
+    for i, name in enumerate(('спецификация.bin', 'naïve spec.bin', 'plain.bin')):
+        artifact = Artifact(config)
+        artifact.aid = f'F{i}'
+        artifact.atype = 'req'
+        artifact.location = FileLocation(name)
+        artifacts[artifact.aid] = artifact
+
+    def no_per_path_query(self, *args, **kwargs):
+        raise AssertionError(f'{kwargs.get("paths")} was not resolved by the history walk')
+
+    monkeypatch.setattr(git.Repo, 'iter_commits', no_per_path_query)
+
+    errors = []
+    populate_revisions(config, artifacts, errors)
+    assert not errors
+    commits = list(repo.git.log('--format=%H').split())
+    assert [next(iter(artifacts[f'F{i}'].revisions)).hash_long for i in range(3)] == commits[::-1]
+
+
+def test_history_walk_follows_merges(tmp_path, monkeypatch):
+    from datetime import datetime
+
+    from syntagmax.artifact import Revision
+
+    repo = git.Repo.init(tmp_path)
+    actors = [git.Actor(f'Author {i}', f'a{i}@example.com') for i in range(3)]
+    names = ('base.bin', 'main.bin', 'side.bin', 'both.bin', 'evil.bin', 'late.bin', 'late.bin.stmx')
+
+    def commit(message, actor, **files):
+        for name, content in files.items():
+            (tmp_path / name).write_text(content, encoding='utf-8')
+        repo.index.add(list(files))
+        return repo.index.commit(message, author=actor, committer=actor)
+
+    commit('one', actors[0], **{name: name for name in names})
+    main = repo.active_branch
+    side = repo.create_head('side')
+    side.checkout()
+    commit('side', actors[1], **{'side.bin': 'side', 'both.bin': 'same'})
+    commit('side late', actors[1], **{'late.bin.stmx': 'side'})
+    main.checkout()
+    commit('main', actors[2], **{'main.bin': 'main', 'both.bin': 'same'})
+    # An evil merge: the merge itself changes a file neither parent touched
+    repo.git.merge('side', '--no-commit', '--no-ff')
+    (tmp_path / 'evil.bin').write_text('evil', encoding='utf-8')
+    repo.index.add(['evil.bin'])
+    repo.git.commit('-m', 'merge side', '--no-edit')
+    evil_merge = repo.head.commit
+    side.checkout()
+    commit('side again', actors[1], **{'late.bin': 'side'})
+    main.checkout()
+    # HEAD itself is a merge
+    repo.git.merge('side', '--no-edit', '--no-ff')
+
+    (tmp_path / 'config.toml').write_text('base = "."\n[[input]]\nname = "test"\ndir = "."\ndriver = "text"\n', encoding='utf-8')
+    config = Config(params=Params(verbose=False, render_tree=False, ai=False, allow_dirty_worktree=True), config_filename=tmp_path / 'config.toml')
+
+    locations = {f'F{i}': FileLocation(name) for i, name in enumerate(names[:-2])}
+    locations['S'] = FileLocation('late.bin', 'late.bin.stmx')
+    artifacts = {}
+    for aid, location in locations.items():
+        artifact = Artifact(config)
+        artifact.aid = aid
+        artifact.atype = 'req'
+        artifact.location = location
+        artifacts[aid] = artifact
+
+    def revision(c):
+        return Revision(hash_long=c.hexsha, hash_short=c.hexsha[:7], timestamp=datetime.fromtimestamp(c.committed_date), author_email=c.author.email)
+
+    expected = {}
+    for aid, location in locations.items():
+        paths = [location.loc_file] + ([location.loc_sidecar] if location.loc_sidecar else [])
+        expected[aid] = {revision(c) for p in paths for c in repo.iter_commits('HEAD', paths=p, max_count=1)}
+    assert expected['F4'] == {revision(evil_merge)}
+
+    def no_per_path_query(self, *args, **kwargs):
+        raise AssertionError(f'{kwargs.get("paths")} was not resolved by the history walk')
+
+    monkeypatch.setattr(git.Repo, 'iter_commits', no_per_path_query)
+
+    errors = []
+    populate_revisions(config, artifacts, errors)
+    assert not errors
+    assert {aid: artifact.revisions for aid, artifact in artifacts.items()} == expected
@@ -0,0 +1,163 @@
+import textwrap
+from pathlib import Path
+
+import git
+import pytest
+
+from syntagmax.config import Config, Params
+from syntagmax.main import process
+
+METAMODEL = textwrap.dedent("""
+    artifact SYS:
+        id is string
+        attribute contents is mandatory string
+
+    artifact REQ:
+        id is string
+        attribute contents is mandatory string
+        attribute parent is optional reference to parent
+        attribute related is optional reference
+
+    trace from REQ to SYS is mandatory
+    """)
+
+ACTOR = git.Actor('Test Author', 'test@example.com')
+
+
+def _req(aid: str, text: str, parent: str, related: str | None = None) -> str:
+    extra = f'[related] {related}\n' if related else ''
+    return f'[REQ]\n{text}\n[id] {aid}\n[parent] {parent}\n{extra}[/REQ]\n'
+
+
+@pytest.fixture
+def project(tmp_path) -> tuple[git.Repo, Path]:
+    project_dir = tmp_path / 'project'
+    (project_dir / 'sys').mkdir(parents=True)
+    (project_dir / 'req').mkdir()
+
+    (project_dir / 'config.toml').write_text(
+        textwrap.dedent("""
+        base = "."
+
+        [[input]]
+        name = "system"
+        dir = "sys"
+        driver = "obsidian"
+        atype = "SYS"
+
+        [[input]]
+        name = "software"
+        dir = "req"
+        driver = "obsidian"
+
+        [metamodel]
+        filename = "project.syntagmax"
+        """).strip(),
+        encoding='utf-8',
+    )
+    (project_dir / 'project.syntagmax').write_text(METAMODEL, encoding='utf-8')
+    (project_dir / '.gitignore').write_text('cache/\noutputs/\n', encoding='utf-8')
+    (project_dir / 'sys' / 'sys.md').write_text('[SYS]\nSystem one.\n[id] SYS-001\n[/SYS]\n\n[SYS]\nSystem two.\n[id] SYS-002\n[/SYS]\n', encoding='utf-8')
+    (project_dir / 'req' / 'a.md').write_text(_req('REQ-001', 'First.', 'SYS-001'), encoding='utf-8')
+    (project_dir / 'req' / 'b.md').write_text(_req('REQ-002', 'Second.', 'SYS-002', related='REQ-001'), encoding='utf-8')
+    (project_dir / 'req' / 'c.md').write_text(_req('REQ-003', 'Third.', 'SYS-404'), encoding='utf-8')
+
+    repo = git.Repo.init(project_dir)
+    _commit(repo, 'Initial commit')
+    return repo, project_dir
+
+
+def _commit(repo: git.Repo, message: str):
+    repo.git.add('-A')
+    repo.index.commit(message, author=ACTOR, committer=ACTOR)
+
+
+def _analyze(project_dir: Path, incremental: bool, step: str = 'metrics', **params) -> tuple[list[str], str]:
+    params = Params(render_tree=False, cwd=str(project_dir), incremental=incremental, **params)  # type: ignore
+    config = Config(params, project_dir / 'config.toml')
+    report = process(step, config)
+    return [str(e) for e in report.errors], str(report.impact)
+
+
+def _revalidated(caplog) -> list[str]:
+    return [r.getMessage() for r in caplog.records if r.getMessage().startswith('Re-validating')]
+
+
+def test_unchanged_tree_reuses_everything(project, caplog):
+    _, project_dir = project
+    caplog.set_level('INFO')
+
+    first = _analyze(project_dir, incremental=True)
+    caplog.clear()
+    second = _analyze(project_dir, incremental=True)
+
+    assert second == first
+    assert any('SYS-404' in e for e in first[0])
+    assert _revalidated(caplog) == ['Re-validating 0 of 5 artifact(s)']
+
+    first = _analyze(project_dir, incremental=True, step='impact')
+    caplog.clear()
+    assert _analyze(project_dir, incremental=True, step='impact') == first
+    assert 'Reusing revisions of 5 artifact(s)' in caplog.text
+
+
+def test_committed_change_matches_full_run(project, caplog):
+    repo, project_dir = project
+    _analyze(project_dir, incremental=True)
+    _analyze(project_dir, incremental=True, step='impact')
+
+    # REQ-001 moves to a missing parent: itself, its former parent and its referrer REQ-002 are re-validated
+    (project_dir / 'req' / 'a.md').write_text(_req('REQ-001', 'First, revised.', 'SYS-999'), encoding='utf-8')
+    _commit(repo, 'Change parent')
+
+    caplog.set_level('INFO')
+    incremental = _analyze(project_dir, incremental=True, step='impact')
+    assert 'Reusing revisions of 4 artifact(s)' in caplog.text
+    assert incremental == _analyze(project_dir, incremental=False, step='impact')
+
+    incremental = _analyze(project_dir, incremental=True)
+    assert _revalidated(caplog)[-1] == 'Re-validating 2 of 5 artifact(s)'
+    assert incremental == _analyze(project_dir, incremental=False)
+    assert any('SYS-999' in e for e in incremental[0])
+
+
+def test_worktree_change_and_removed_file(project, caplog):
+    repo, project_dir = project
+    _analyze(project_dir, incremental=True, allow_dirty_worktree=True)
+
+    (project_dir / 'sys' / 'sys.md').write_text('[SYS]\nSystem one.\n[id] SYS-001\n[/SYS]\n', encoding='utf-8')
+    (project_dir / 'req' / 'c.md').unlink()
+
+    incremental = _analyze(project_dir, incremental=True, allow_dirty_worktree=True)
+    assert incremental == _analyze(project_dir, incremental=False, allow_dirty_worktree=True)
+    assert not any('SYS-404' in e for e in incremental[0])
+    assert any('SYS-002' in e for e in incremental[0])
+
+
+def test_reverted_worktree_change_is_not_reused(project):
+    repo, project_dir = project
+    _analyze(project_dir, incremental=True, allow_dirty_worktree=True)
+
+    (project_dir / 'req' / 'a.md').write_text(_req('REQ-001', 'First.', 'SYS-999'), encoding='utf-8')
+    (project_dir / 'req' / 'new.md').write_text(_req('REQ-004', 'Fourth.', 'SYS-998'), encoding='utf-8')
+    dirty = _analyze(project_dir, incremental=True, allow_dirty_worktree=True)
+    assert any('SYS-999' in e for e in dirty[0]) and any('SYS-998' in e for e in dirty[0])
+
+    # Neither git history nor the worktree diff mention the files once the edits are undone
+    repo.git.checkout('--', 'req/a.md')
+    (project_dir / 'req' / 'new.md').unlink()
+
+    incremental = _analyze(project_dir, incremental=True, allow_dirty_worktree=True)
+    assert incremental == _analyze(project_dir, incremental=False, allow_dirty_worktree=True)
+    assert not any('SYS-999' in e or 'SYS-998' in e for e in incremental[0])
+
+
+def test_config_change_forces_full_run(project, caplog):
+    _, project_dir = project
+    _analyze(project_dir, incremental=True)
+
+    caplog.set_level('INFO')
+    caplog.clear()
+    _analyze(project_dir, incremental=True, suppress_tracing=True)
+    assert 'Configuration changed since the previous run, running a full analysis' in caplog.text
+    assert _revalidated(caplog) == ['Re-validating 5 of 5 artifact(s)']
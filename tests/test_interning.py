@@ -0,0 +1,47 @@
+import pickle
+from unittest.mock import MagicMock
+
+from syntagmax.artifact import Artifact, ArtifactBuilder, FileLocation
+from syntagmax.extract import build_artifact_map
+from syntagmax.tree import build_tree, populate_pids
+
+METAMODEL = {
+    'artifacts': {
+        'SYS': {'attributes': {}},
+        'REQ': {'attributes': {'parent': [{'name': 'parent', 'multiple': False, 'type_info': {'type': 'reference', 'to_parent': True}}]}},
+    }
+}
+
+
+def _fresh(value: str) -> str:
+    """An equal string that is a separate object, as a parser would produce."""
+    return ''.join(list(value))
+
+
+def _artifact(aid: str, atype: str, **fields) -> Artifact:
+    builder = ArtifactBuilder(None, Artifact, 'text', FileLocation('f.md'), METAMODEL)
+    builder.add_id(_fresh(aid), _fresh(atype))
+    for name, value in fields.items():
+        builder.add_field(_fresh(name), _fresh(value))
+    return builder.build()
+
+
+def test_ids_types_and_field_names_are_shared():
+    built = [_artifact('SYS-1', 'SYS', contents='System.'), _artifact('REQ-1', 'REQ', parent='SYS-1', contents='One.')]
+    # Unpickled artifacts, as from the extraction cache or a worker process, carry their own copies
+    unpickled = pickle.loads(pickle.dumps(_artifact('REQ-2', 'REQ', parent=' SYS-1 ', contents='Two.')))
+    config = MagicMock()
+    config.metamodel = METAMODEL
+    config.params = {}
+    config.get_trace_mode.return_value = 'commit'
+
+    artifacts = build_artifact_map(built + [unpickled], [])
+    populate_pids(config, artifacts, [])
+    build_tree(config, artifacts, [])
+
+    sys_artifact, req1, req2 = artifacts['SYS-1'], artifacts['REQ-1'], artifacts['REQ-2']
+    assert req1.atype is req2.atype
+    assert req1.pids[0] is req2.pids[0] is sys_artifact.aid
+    assert req1.parent_links[0].pid is sys_artifact.aid
+    assert {id(aid) for aid in sys_artifact.children} == {id(req1.aid), id(req2.aid)}
+    assert [id(name) for name in req2.fields] == [id(name) for name in req1.fields]
@@ -0,0 +1,81 @@
+# SPDX-License-Identifier: MIT
+# Author: Boris Resnick
+# Created: 2026-10-17
+# Description: Tests for the streaming notebook cell reader.
+
+import io
+import json
+import random
+import tracemalloc
+
+import pytest
+
+from syntagmax.extractors.ipynb_stream import NotebookSyntaxError, read_cells
+
+
+def _expected(text: str):
+    return [(cell.get('cell_type'), ''.join(cell.get('source', []))) for cell in json.loads(text).get('cells', [])]
+
+
+def _notebook(rng: random.Random) -> dict:
+    alphabet = 'ab [REQ]\n\t"\\/é中\U0001f600\x01'
+    text = lambda n: ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, n)))  # noqa: E731
+    cells = []
+    for _ in range(rng.randint(0, 6)):
+        cell = {
+            'cell_type': rng.choice(['markdown', 'code', 'raw']),
+            'metadata': {'tags': [text(5)], 'collapsed': rng.choice([True, False, None]), 'n': rng.choice([0, -1.5e-3, 42, 1e10])},
+            'source': [text(20) for _ in range(rng.randint(0, 4))] if rng.random() < 0.8 else text(30),
+        }
+        if cell['cell_type'] == 'code':
+            cell['outputs'] = [{'output_type': 'display_data', 'data': {'image/png': 'iVBORw0KGgo' * rng.randint(0, 50)}, 'nested': [[[{}]], []]}]
+        cells.append(dict(rng.sample(list(cell.items()), len(cell))))
+    return {'metadata': {'kernelspec': {'name': text(5)}}, 'cells': cells, 'nbformat': 4, 'nbformat_minor': 5}
+
+
+@pytest.mark.parametrize('seed', range(30))
+def test_matches_json_loads_at_any_chunk_size(seed):
+    rng = random.Random(seed)
+    text = json.dumps(_notebook(rng), ensure_ascii=rng.random() < 0.5, indent=rng.choice([None, 1]))
+    for chunk_size in (1, 2, 3, 7, 64, 1 << 16):
+        assert read_cells(io.StringIO(text), chunk_size) == _expected(text), chunk_size
+
+
+@pytest.mark.parametrize(
+    'text',
+    [
+        '',
+        '[]',
+        '{"cells": [}',
+        '{"cells": {}}',
+        '{"cells": [1]}',
+        '{"cells": [{"source": [1]}]}',
+        '{"cells": [], "x": [1,]}',
+        '{"cells": [], "x": 01}',
+        '{"cells": [], "x": 1.}',
+        '{"cells": [], "x": tru}',
+        '{"cells": [], "x": "\\x"}',
+        '{"cells": [], "x": "a\nb"}',
+        '{"cells": [], "x": "open',
+        '{"cells": []} {}',
+        '{"cells": [] "x": 1}',
+        '{"x": {"y": 1 "z": 2}, "cells": []}',
+    ],
+)
+def test_malformed_notebooks_are_rejected(text):
+    with pytest.raises(NotebookSyntaxError):
+        read_cells(io.StringIO(text), 3)
+
+
+def test_memory_does_not_grow_with_outputs():
+    def peak(image_size: int) -> int:
+        notebook = {'cells': [{'cell_type': 'code', 'source': ['plot()'], 'outputs': [{'data': {'image/png': 'A' * image_size}}]}]}
+        stream = io.StringIO(json.dumps(notebook))
+        tracemalloc.start()
+        try:
+            assert read_cells(stream) == [('code', 'plot()')]
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    assert peak(8_000_000) < peak(8_000) + 200_000
@@ -0,0 +1,54 @@
+from pathlib import Path
+
+from syntagmax.lark_utils import get_parser, read_grammar
+from syntagmax.metamodel import DSLIndenter
+
+
+GRAMMAR = """
+start: WORD+
+%import common.WORD
+%import common.WS
+%ignore WS
+"""
+
+
+def test_same_grammar_and_options_share_parser():
+    assert get_parser(GRAMMAR) is get_parser(GRAMMAR)
+    assert get_parser(GRAMMAR, maybe_placeholders=False) is get_parser(GRAMMAR, maybe_placeholders=False)
+
+
+def test_different_options_build_distinct_parsers():
+    assert get_parser(GRAMMAR) is not get_parser(GRAMMAR, maybe_placeholders=False)
+    assert get_parser(GRAMMAR) is not get_parser(GRAMMAR + '\n')
+
+
+def test_parser_uses_lalr_with_disk_cache():
+    parser = get_parser(GRAMMAR)
+    assert parser.options.parser == 'lalr'
+    assert parser.options.cache is True
+    assert [str(t) for t in parser.parse('alpha beta').children] == ['alpha', 'beta']
+
+
+def test_postlex_instances_are_interchangeable():
+    grammar = read_grammar(Path(__file__).parent.parent / 'src' / 'syntagmax' / 'metamodel.lark')
+    assert get_parser(grammar, postlex=DSLIndenter()) is get_parser(grammar, postlex=DSLIndenter())
+
+
+def test_extractors_reuse_parsers(tmp_path):
+    from syntagmax.config import Config, Params
+    from syntagmax.extract import EXTRACTORS
+
+    (tmp_path / 'docs').mkdir()
+    config_file = tmp_path / 'config.toml'
+    config_file.write_text(
+        'base = "."\n'
+        '[[input]]\nname = "a"\ndir = "docs"\ndriver = "obsidian"\n'
+        '[[input]]\nname = "b"\ndir = "docs"\ndriver = "obsidian"\n'
+        '[[input]]\nname = "c"\ndir = "docs"\ndriver = "obsidian"\natype = "SYS"\n',
+        encoding='utf-8',
+    )
+    config = Config(Params(render_tree=False, cwd='', no_git=True), config_file)  # type: ignore
+    a, b, c = (EXTRACTORS[r.driver](config, r, None) for r in config.input_records())
+
+    assert a._parser is b._parser
+    assert a._parser is not c._parser
@@ -0,0 +1,104 @@
+# SPDX-License-Identifier: MIT
+"""Differential tests of the fast-path segment recognizer against the Lark grammar."""
+
+from pathlib import Path
+
+import pytest
+
+import syntagmax.extractors.markdown as markdown
+from syntagmax.blocks import ArtifactBlock, ErrorBlock
+from syntagmax.config import Config
+from syntagmax.extract import EXTRACTORS
+from syntagmax.extractors.markdown import MarkdownExtractor
+from syntagmax.extractors.markdown_fastpath import RequirementSegment, recognize_segment
+from syntagmax.params import Params
+
+EXAMPLES = Path(__file__).parent.parent / 'example'
+
+
+def _params():
+    return Params(
+        verbose=False,
+        render_tree=False,
+        ai=False,
+        cwd='.',
+        no_git=True,
+        allow_dirty_worktree=True,
+        suppress_tracing=True,
+    )
+
+
+def _summary(blocks):
+    summary = []
+    for block in blocks:
+        if isinstance(block, ArtifactBlock):
+            a = block.artifact
+            summary.append((a.aid, a.atype, a.fields, str(a.location), a.source_metadata, a.yaml_data, block.raw_text))
+        elif isinstance(block, ErrorBlock):
+            summary.append((block.message, block.raw_text))
+    return summary
+
+
+def _grammar(extractor, segment):
+    req = extractor._transformer.transform(extractor._parser.parse(segment))['req']
+    fields = [(f['field']['marker'], f['field']['contents']['text']) for f in req['fields']['list']]
+    return req['contents']['text'], fields, req['yaml']['text'] if req['yaml'] else None
+
+
+@pytest.mark.parametrize('config_file', sorted(EXAMPLES.glob('*/.syntagmax/config.toml')), ids=lambda p: p.parent.parent.name)
+def test_example_corpus_matches_grammar(config_file, monkeypatch):
+    config = Config(params=_params(), config_filename=config_file)
+    recognized = []
+
+    def counting(segment, marker):
+        result = recognize_segment(segment, marker)
+        recognized.append(result is not None)
+        return result
+
+    for record in config.input_records():
+        extractor = EXTRACTORS[record.driver](config, record, config.metamodel)
+        if not isinstance(extractor, MarkdownExtractor):
+            continue
+        for filepath in record.filepaths:
+            monkeypatch.setattr(markdown, 'recognize_segment', counting)
+            fast = _summary(extractor.extract_blocks_from_file(filepath))
+            monkeypatch.setattr(markdown, 'recognize_segment', lambda segment, marker: None)
+            assert fast == _summary(extractor.extract_blocks_from_file(filepath)), filepath
+
+    assert not recognized or any(recognized)
+
+
+@pytest.mark.parametrize(
+    'segment',
+    [
+        '[REQ]\nThe system shall.\n[id] REQ-1\n[parent] SYS-1\n```yaml\nattrs:\n  status: draft\n```',
+        '[REQ]\nFirst line.\nSecond line.\n[id] REQ-1\ncontinued\n[/REQ]',
+        '[req]\n[ID]REQ-1\n[tag]\n',
+        '[REQ]\n',
+    ],
+)
+def test_recognizer_matches_grammar(segment, tmp_path):
+    (tmp_path / 'config.toml').write_text('base = "."\n[[input]]\nname = "r"\ndir = "."\ndriver = "obsidian"\natype = "REQ"\n', encoding='utf-8')
+    config = Config(params=_params(), config_filename=tmp_path / 'config.toml')
+    extractor = MarkdownExtractor(config, config.input_records()[0])
+
+    parsed = recognize_segment(segment, 'REQ')
+    assert parsed is not None
+    assert parsed == RequirementSegment(*_grammar(extractor, segment))
+
+
+@pytest.mark.parametrize('segment', ['[REQ] inline\n[id] R\n', '[REQ]\nText\n\nMore\n', '[REQ]\n  indented\n', '[REQ]\n[[SYS-1]] link\n', '[REQ]\r\nText\r\n'])
+def test_recognizer_declines_other_shapes(segment):
+    assert recognize_segment(segment, 'REQ') is None
+
+
+def test_field_names_padded_inside_brackets(tmp_path):
+    (tmp_path / 'config.toml').write_text('base = "."\n[[input]]\nname = "r"\ndir = "."\ndriver = "obsidian"\natype = "REQ"\n', encoding='utf-8')
+    (tmp_path / 'spec.md').write_text('[REQ]\nThe system shall.\n[ID ] A-1\n[parent ] B-1\n[/REQ]\n', encoding='utf-8')
+    config = Config(params=_params(), config_filename=tmp_path / 'config.toml')
+    extractor = MarkdownExtractor(config, config.input_records()[0])
+
+    [block] = [b for b in extractor.extract_blocks_from_file(tmp_path / 'spec.md') if isinstance(b, (ArtifactBlock, ErrorBlock))]
+    assert isinstance(block, ArtifactBlock)
+    assert block.artifact.aid == 'A-1'
+    assert block.artifact.fields['parent'] == 'B-1'
@@ -247,6 +247,28 @@ class TestFragmentSplitting:
         assert blocks[0].marker is None
         assert '[COM]' in blocks[0].content
 
+    def test_unclosed_marker_ends_at_closed_marker(self, obsidian_config, input_record_with_markers):
+        extractor = ObsidianExtractor(obsidian_config, input_record_with_markers)
+        blocks = extractor._split_text_block_by_markers(TextBlock(content='[COM] open text [NOTE]n[/NOTE] tail\n# Title\n', source_offset=100))
+
+        assert blocks == [
+            TextBlock(content='open text', marker='COM', source_offset=100),
+            TextBlock(content='n', marker='NOTE', source_offset=116),
+            TextBlock(content=' tail\n', source_offset=130),
+            TextBlock(content='# Title\n', marker='HEADING', source_offset=136),
+        ]
+
+    def test_many_fragments_keep_offsets(self, obsidian_config, input_record_with_markers):
+        extractor = ObsidianExtractor(obsidian_config, input_record_with_markers)
+        content = ''.join(f'[COM] c{i}\n\n[NOTE n{i}]x[/NOTE]\n' for i in range(2000))
+        blocks = extractor._split_text_block_by_markers(TextBlock(content=content, source_offset=0))
+
+        marked = [b for b in blocks if b.marker is not None]
+        assert [b.content for b in marked[:4]] == ['c0', 'x', 'c1', 'x']
+        assert len(marked) == 4000
+        assert all(content.startswith(f'[{b.marker}', b.source_offset) for b in marked)
+        assert marked[-1].id == 'n1999'
+
     def test_spec_example(self, obsidian_config, input_record_with_markers, tmp_path):
         """Test the example from the spec document."""
         content = 'This is a sample preamble text. [COM]This is a special comment text [/COM].\n[note]This a a special note text[/note]\nSome more text\n[SYS]\nThis is a text for the requirement\n[ID] SYS-000\n[/SYS]\n'  # noqa: E501
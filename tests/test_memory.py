@@ -0,0 +1,59 @@
+import pickle
+
+import pytest
+
+from benchmark_memory import DictArtifact, DictArtifactBlock, DictFileLocation, DictParentLink, bytes_per_artifact, make_artifacts
+from syntagmax.artifact import Artifact, FileLocation, LineLocation, NotebookLocation, ParentLink
+from syntagmax.blocks import ArtifactBlock, BlockTree, ErrorBlock, FileRecord, InputBlock, TextBlock
+from syntagmax.extractors.markdown import MarkdownArtifact
+from syntagmax.extractors.text import TextArtifact
+from syntagmax.tree import RootArtifact, RootLocation
+
+
+@pytest.mark.parametrize(
+    'instance',
+    [
+        Artifact(None),
+        RootArtifact(None),
+        TextArtifact(None),
+        MarkdownArtifact(None),
+        FileLocation('f.md'),
+        LineLocation('f.py', (1, 2)),
+        NotebookLocation('n.ipynb', (1, 2), 3),
+        RootLocation(),
+        ParentLink('REQ-1'),
+        TextBlock('text'),
+        ArtifactBlock(Artifact(None), ''),
+        ErrorBlock('message', ''),
+        FileRecord('f.md'),
+        InputBlock('input'),
+        BlockTree(),
+    ],
+    ids=type,
+)
+def test_no_instance_dict(instance):
+    assert not hasattr(instance, '__dict__')
+
+
+def test_slotted_artifacts_use_less_memory():
+    slotted = bytes_per_artifact(make_artifacts, 5000)
+    plain = bytes_per_artifact(lambda n: make_artifacts(n, DictArtifact, DictFileLocation, DictParentLink, DictArtifactBlock), 5000)
+
+    assert slotted < plain
+
+
+def test_slotted_artifacts_pickle():
+    artifact = MarkdownArtifact(None)
+    artifact.aid = 'REQ-1'
+    artifact.atype = 'REQ'
+    artifact.location = NotebookLocation('n.ipynb', (1, 2), 3)
+    artifact.fields = {'status': 'draft'}
+    artifact.parent_links = [ParentLink('SYS-1', 'abc1234')]
+    artifact.source_metadata = {'status': 'yaml'}
+
+    restored = pickle.loads(pickle.dumps(artifact))
+
+    assert (restored.aid, restored.fields, restored.source_metadata) == ('REQ-1', {'status': 'draft'}, {'status': 'yaml'})
+    assert restored.parent_links == [ParentLink('SYS-1', 'abc1234')]
+    assert str(restored.location) == 'n.ipynb[3]:1-2'
+    assert restored._config is None and restored.record is None
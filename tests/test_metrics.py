@@ -0,0 +1,172 @@
+from unittest.mock import MagicMock
+
+from pydantic import ValidationError
+import pytest
+
+from syntagmax.artifact import Artifact, ParentLink
+from syntagmax.config import VALID_METRIC_KINDS, MetricDefinition, MetricsConfig
+from syntagmax.main import dependencies
+from syntagmax.metrics import METRIC_KINDS, calculate_metrics, default_catalogue
+from syntagmax.tree import RootArtifact
+from syntagmax.utils import get_execution_plan
+
+
+def _config() -> MagicMock:
+    config = MagicMock()
+    config.metrics = MetricsConfig()
+    return config
+
+
+def _artifact(aid: str, atype: str, record: str | None, **fields) -> Artifact:
+    artifact = Artifact(None)
+    artifact.aid = aid
+    artifact.atype = atype
+    if record:
+        artifact.record = MagicMock()
+        artifact.record.name = record
+    artifact.fields = fields
+    return artifact
+
+
+def _artifacts(*artifacts: Artifact) -> dict[str, Artifact]:
+    return {a.aid: a for a in artifacts}
+
+
+def test_global_and_per_input_metrics():
+    artifacts = _artifacts(
+        _artifact('R1', 'REQ', 'software', status='draft', verify='T1', contents='Done.'),
+        _artifact('R2', 'REQ', 'software', status='draft', contents='Limit is TBD.'),
+        _artifact('R3', 'REQ', 'hardware', status='approved', verify='T2', tags=['a', 'TBD later']),
+        _artifact('R4', 'REQ', 'hardware', contents='No status.'),
+        _artifact('R5', 'REQ', None, status='draft', contents='Orphan.'),
+        _artifact('S1', 'SYS', 'system', status='draft', contents='TBD'),
+    )
+    errors: list = []
+
+    metrics, by_input = calculate_metrics(_config(), artifacts, errors)
+
+    assert not errors
+    assert metrics['total_requirements'] == 5
+    assert metrics['requirements_by_status'] == [
+        {'status': 'UNKNOWN', 'count': 1},
+        {'status': 'approved', 'count': 1},
+        {'status': 'draft', 'count': 3},
+    ]
+    assert metrics['requirements_without_verify_pct'] == 60.0
+    assert metrics['requirements_with_tbd_pct'] == 40.0
+
+    assert [name for name, _ in by_input] == ['hardware', 'software']
+    hardware = dict(by_input)['hardware']
+    assert hardware['total_requirements'] == 2
+    assert hardware['requirements_with_tbd_pct'] == 50.0
+    assert dict(by_input)['software']['requirements_by_status'] == [{'status': 'draft', 'count': 2}]
+
+
+def test_single_input_has_no_breakdown():
+    artifacts = _artifacts(_artifact('R1', 'REQ', 'software', status='draft'), _artifact('R2', 'REQ', None))
+
+    metrics, by_input = calculate_metrics(_config(), artifacts, [])
+
+    assert metrics['total_requirements'] == 2
+    assert by_input is None
+
+
+def test_no_requirements():
+    errors: list = []
+
+    metrics, by_input = calculate_metrics(_config(), _artifacts(_artifact('S1', 'SYS', 'system')), errors)
+
+    assert not metrics and by_input is None
+    assert errors[0].message == 'Metrics: No requirements found'
+
+
+def _linked(artifacts: dict[str, Artifact], links: list[tuple[str, str, str | None, bool]]) -> dict[str, Artifact]:
+    """Attach child -> parent links with their nominal revision and suspicious flag, and a root over the top level."""
+    for child, parent, revision, suspicious in links:
+        artifacts[child].pids.append(parent)
+        artifacts[child].parent_links.append(ParentLink(pid=parent, nominal_revision=revision, is_suspicious=suspicious))
+        artifacts[parent].children.add(child)
+    root = RootArtifact(None)
+    root.children = {aid for aid, a in artifacts.items() if not a.pids}
+    artifacts['ROOT'] = root
+    return artifacts
+
+
+def _catalogue(metrics) -> dict[str, list[dict]]:
+    return {m['name']: [dict(zip(m['columns'], row)) for row in m['rows']] for m in metrics['catalogue']}
+
+
+def test_catalogue():
+    artifacts = _linked(
+        _artifacts(
+            _artifact('S1', 'SYS', 'system', owner='ann'),
+            _artifact('S2', 'SYS', 'system'),
+            _artifact('R1', 'REQ', 'software', status='draft', owner='ann'),
+            _artifact('R2', 'REQ', 'software', status='draft', owner='bob'),
+            _artifact('R3', 'REQ', 'software', status='approved', owner='ann'),
+            _artifact('T1', 'TST', 'tests'),
+        ),
+        [('R1', 'S1', 'abc1234', True), ('R2', 'S1', 'abc1234', False), ('R2', 'R1', None, False), ('T1', 'R2', None, False)],
+    )
+    config = _config()
+    config.metamodel = {'traces': {'REQ': [{'targets': ['SYS']}], 'TST': [{'targets': ['REQ', 'SYS']}]}}
+    config.metrics = MetricsConfig(
+        catalogue=[
+            MetricDefinition(name='coverage', kind='trace_coverage'),
+            MetricDefinition(name='orphans', kind='orphans'),
+            MetricDefinition(name='depth', kind='depth_histogram'),
+            MetricDefinition(name='req depth', kind='depth_histogram', atype='REQ'),
+            MetricDefinition(name='status by owner', kind='breakdown', atype='REQ', by=['owner', 'status']),
+            MetricDefinition(name='suspicious', kind='suspicious_links'),
+        ]
+    )
+
+    catalogue = _catalogue(calculate_metrics(config, artifacts, [])[0])
+
+    assert catalogue['coverage'] == [
+        {'source': 'REQ', 'targets': 'SYS', 'total': 3, 'covered': 2, 'coverage_pct': 66.7},
+        {'source': 'TST', 'targets': 'REQ, SYS', 'total': 1, 'covered': 1, 'coverage_pct': 100.0},
+    ]
+    assert catalogue['orphans'] == [{'atype': 'REQ', 'count': 1, 'artifacts': 'R3'}, {'atype': 'SYS', 'count': 1, 'artifacts': 'S2'}]
+    assert catalogue['depth'] == [{'depth': 1, 'count': 3}, {'depth': 2, 'count': 2}, {'depth': 3, 'count': 1}]
+    assert catalogue['req depth'] == [{'depth': 1, 'count': 1}, {'depth': 2, 'count': 2}]
+    assert catalogue['status by owner'] == [
+        {'owner': 'ann', 'status': 'approved', 'count': 1},
+        {'owner': 'ann', 'status': 'draft', 'count': 1},
+        {'owner': 'bob', 'status': 'draft', 'count': 1},
+    ]
+    assert catalogue['suspicious'] == [
+        {'child_atype': 'REQ', 'parent_atype': 'REQ', 'links': 1, 'pinned': 0, 'suspicious': 0, 'suspicious_pct': None},
+        {'child_atype': 'REQ', 'parent_atype': 'SYS', 'links': 2, 'pinned': 2, 'suspicious': 1, 'suspicious_pct': 50.0},
+        {'child_atype': 'TST', 'parent_atype': 'REQ', 'links': 1, 'pinned': 0, 'suspicious': 0, 'suspicious_pct': None},
+    ]
+
+
+def test_default_catalogue():
+    artifacts = _linked(_artifacts(_artifact('R1', 'REQ', 'software', status='draft'), _artifact('R2', 'REQ', 'software')), [('R2', 'R1', None, False)])
+    config = _config()
+    config.metamodel = None
+
+    assert calculate_metrics(config, artifacts, [])[0]['catalogue'] == []
+
+    config.metrics = MetricsConfig(builtin_catalogue=True)
+    catalogue = _catalogue(calculate_metrics(config, artifacts, [])[0])
+
+    assert set(METRIC_KINDS) == VALID_METRIC_KINDS
+    assert [m.kind for m in default_catalogue()] == [kind for kind in METRIC_KINDS if kind != 'suspicious_links']
+    assert catalogue['Trace coverage'] == [] and catalogue['Orphan artifacts'] == []
+    assert catalogue['Artifacts by status'] == [{'atype': 'REQ', 'status': 'UNKNOWN', 'count': 1}, {'atype': 'REQ', 'status': 'draft', 'count': 1}]
+
+
+def test_suspicious_links_run_impact_analysis_first():
+    config = _config()
+    assert 'impact' not in get_execution_plan(dependencies(config), 'metrics')
+
+    config.metrics = MetricsConfig(catalogue=[MetricDefinition(name='suspicious', kind='suspicious_links')])
+    plan = get_execution_plan(dependencies(config), 'metrics')
+    assert plan.index('impact') < plan.index('metrics')
+
+
+def test_unknown_metric_kind_is_rejected():
+    with pytest.raises(ValidationError, match='Unknown metric kind'):
+        MetricsConfig(catalogue=[{'name': 'x', 'kind': 'velocity'}])
@@ -0,0 +1,100 @@
+import os
+import textwrap
+from pathlib import Path
+
+from syntagmax.config import Config, Params
+from syntagmax.extract import build_artifact_map, extract
+from syntagmax.extract_cache import CacheStats
+
+
+def _setup_project(tmp_path: Path, extra: str = '') -> Path:
+    project_dir = tmp_path / 'project'
+    for d in ('sys', 'req', 'src'):
+        (project_dir / d).mkdir(parents=True)
+
+    config_file = project_dir / 'config.toml'
+    config_file.write_text(
+        textwrap.dedent("""
+        base = "."
+        {extra}
+
+        [[input]]
+        name = "system"
+        dir = "sys"
+        driver = "obsidian"
+        atype = "SYS"
+
+        [[input]]
+        name = "software"
+        dir = "req"
+        driver = "obsidian"
+
+        [[input]]
+        name = "code"
+        dir = "src"
+        driver = "text"
+        filter = "*.py"
+        """).format(extra=extra).strip(),
+        encoding='utf-8',
+    )
+
+    for i in range(6):
+        (project_dir / 'sys' / f'sys{i}.md').write_text(f'[SYS]\nSystem {i}.\n[id] SYS-{i:03}\n[/SYS]\n', encoding='utf-8')
+        (project_dir / 'req' / f'req{i}.md').write_text(f'[REQ]\nSoftware {i}.\n[id] REQ-{i:03}\n[/REQ]\n', encoding='utf-8')
+
+    # Duplicates across records and files must resolve exactly as in a serial run
+    (project_dir / 'req' / 'dup.md').write_text('[REQ]\nDuplicate.\n[id] REQ-001\n[/REQ]\n', encoding='utf-8')
+    (project_dir / 'req' / 'broken.md').write_text('[REQ]\nNo identifier.\n[/REQ]\n', encoding='utf-8')
+    (project_dir / 'src' / 'main.py').write_text('# [< REQ-900 >]\n# [< REQ-000 >]\n', encoding='utf-8')
+    return config_file
+
+
+def _run(config_file: Path, jobs: int | None = None, **params):
+    config = Config(Params(render_tree=False, cwd=str(config_file.parent), no_git=True, jobs=jobs, **params), config_file)  # type: ignore
+    errors: list = []
+    artifacts = extract(config, errors)
+    artifact_map = build_artifact_map(artifacts, errors)
+
+    summary = [(a.aid, a.atype, str(a.location), a.fields, a.record.name) for a in artifacts]
+    assert all(a._config is config for a in artifacts)
+    return summary, [str(e) for e in errors], {aid: str(a.location) for aid, a in artifact_map.items()}
+
+
+def test_parallel_matches_serial(tmp_path):
+    config_file = _setup_project(tmp_path)
+
+    serial = _run(config_file, jobs=1)
+    parallel = _run(config_file, jobs=3)
+
+    assert parallel == serial
+    assert any('Duplicate artifact ID: REQ-001' in e for e in serial[1])
+
+
+def test_parallel_with_cache_matches_serial(tmp_path):
+    config_file = _setup_project(tmp_path, extra='[cache]\nenabled = true')
+
+    serial = _run(config_file, jobs=1, no_cache=True)
+    assert _run(config_file, jobs=3) == serial
+
+    # Partially warm cache: one changed file goes to the pool alongside cached hits
+    (config_file.parent / 'sys' / 'sys2.md').write_text('[SYS]\nSystem two.\n[id] SYS-002\n[/SYS]\n', encoding='utf-8')
+    (config_file.parent / 'req' / 'req4.md').write_text('[REQ]\nSoftware four.\n[id] REQ-004\n[/REQ]\n', encoding='utf-8')
+    serial = _run(config_file, jobs=1, no_cache=True)
+
+    config = Config(Params(render_tree=False, cwd=str(config_file.parent), no_git=True, jobs=3), config_file)  # type: ignore
+    stats = CacheStats()
+    extract(config, [], stats)
+    assert (stats.hits, stats.misses) == (13, 2)
+    assert _run(config_file, jobs=3) == serial
+
+
+def test_jobs_resolution(tmp_path):
+    config_file = _setup_project(tmp_path, extra='jobs = 4')
+    config = Config(Params(render_tree=False, cwd='', no_git=True), config_file)  # type: ignore
+    assert config.jobs() == 4
+
+    config = Config(Params(render_tree=False, cwd='', no_git=True, jobs=2), config_file)  # type: ignore
+    assert config.jobs() == 2
+
+    config = Config(Params(render_tree=False, cwd='', no_git=True, jobs=0), config_file)  # type: ignore
+    assert config.jobs() == (os.cpu_count() or 1)
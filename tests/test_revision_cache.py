@@ -0,0 +1,116 @@
+import json
+from pathlib import Path
+
+import git
+import pytest
+
+from syntagmax.artifact import Artifact, FileLocation, LineLocation
+from syntagmax.config import Config
+from syntagmax.git_utils import populate_revisions
+from syntagmax.params import Params
+
+ACTOR = git.Actor('Test Author', 'test@example.com')
+OTHER = git.Actor('Other Author', 'other@example.com')
+
+
+@pytest.fixture
+def project(tmp_path) -> tuple[git.Repo, Path]:
+    repo = git.Repo.init(tmp_path)
+    (tmp_path / '.gitignore').write_text('cache/\n', encoding='utf-8')
+    (tmp_path / 'config.toml').write_text('base = "."\n[[input]]\nname = "test"\ndir = "."\ndriver = "text"\n[cache]\nenabled = true\n', encoding='utf-8')
+    _commit(repo, ACTOR, **{'a.md': 'a1\na2\na3\n', 'b.md': 'b1\nb2\n', 'c.bin': 'c'})
+    return repo, tmp_path
+
+
+def _commit(repo: git.Repo, actor: git.Actor, **files: str) -> git.Commit:
+    root = Path(repo.working_tree_dir)
+    for name, content in files.items():
+        (root / name).write_text(content, encoding='utf-8')
+    repo.git.add('-A')
+    return repo.index.commit('change', author=actor, committer=actor)
+
+
+def _populate(project_dir: Path, monkeypatch, **params) -> tuple[dict[str, set], list[str]]:
+    """Run populate_revisions and return revisions by artifact ID and the git commands it invoked."""
+    config = Config(Params(render_tree=False, **params), project_dir / 'config.toml')  # type: ignore
+    artifacts = {}
+    for aid, location in (('A', LineLocation('a.md', (1, 3))), ('B', LineLocation('b.md', (2, 2))), ('C', FileLocation('c.bin'))):
+        artifact = Artifact(config)
+        artifact.aid = aid
+        artifact.atype = 'REQ'
+        artifact.location = location
+        artifacts[aid] = artifact
+
+    commands: list[str] = []
+    call_process = git.cmd.Git._call_process
+
+    def spy(self, method, *args, **kwargs):
+        commands.append(method)
+        return call_process(self, method, *args, **kwargs)
+
+    monkeypatch.setattr(git.cmd.Git, '_call_process', spy)
+    errors: list = []
+    populate_revisions(config, artifacts, errors)
+    monkeypatch.undo()
+
+    assert not errors
+    return {aid: a.revisions for aid, a in artifacts.items()}, commands
+
+
+def _history_queries(commands: list[str]) -> list[str]:
+    return [c for c in commands if c in ('blame', 'rev_list', 'log')]
+
+
+def test_unchanged_history_is_answered_from_cache(project, monkeypatch):
+    _, project_dir = project
+
+    first, commands = _populate(project_dir, monkeypatch)
+    assert 'blame' in commands
+    assert json.loads((project_dir / 'cache' / 'revisions.json').read_text(encoding='utf-8'))['format'] == 1
+
+    second, commands = _populate(project_dir, monkeypatch)
+    assert second == first
+    assert _history_queries(commands) == []
+
+
+def test_new_commits_invalidate_touched_paths_only(project, monkeypatch):
+    repo, project_dir = project
+    _populate(project_dir, monkeypatch)
+
+    # b.md is changed and reverted: same blob as before, but blame now names the revert commit
+    _commit(repo, OTHER, **{'b.md': 'b1\nchanged\n'})
+    _commit(repo, OTHER, **{'b.md': 'b1\nb2\n', 'c.bin': 'c2'})
+
+    cached, commands = _populate(project_dir, monkeypatch)
+    assert commands.count('blame') == 1
+
+    fresh, _ = _populate(project_dir, monkeypatch, no_cache=True)
+    assert cached == fresh
+    assert {r.author_email for r in cached['B']} == {'other@example.com'}
+    assert {r.author_email for r in cached['A']} == {'test@example.com'}
+
+
+def test_rebased_history_discards_cache(project, monkeypatch):
+    repo, project_dir = project
+    _commit(repo, ACTOR, **{'a.md': 'a1\nA2\na3\n'})
+    _populate(project_dir, monkeypatch)
+
+    # Rewrite the last commit: the cached HEAD is no longer an ancestor of HEAD
+    repo.git.reset('--soft', 'HEAD~1')
+    repo.index.commit('rewritten', author=OTHER, committer=OTHER)
+
+    cached, commands = _populate(project_dir, monkeypatch)
+    assert commands.count('blame') == 2
+    assert cached == _populate(project_dir, monkeypatch, no_cache=True)[0]
+    assert 'other@example.com' in {r.author_email for r in cached['A']}
+
+
+def test_modified_files_are_not_cached(project, monkeypatch):
+    _, project_dir = project
+    (project_dir / 'a.md').write_text('a1\nlocal\na3\n', encoding='utf-8')
+
+    _populate(project_dir, monkeypatch, allow_dirty_worktree=True)
+    cached, commands = _populate(project_dir, monkeypatch, allow_dirty_worktree=True)
+
+    assert commands.count('blame') == 1
+    assert cached == _populate(project_dir, monkeypatch, allow_dirty_worktree=True, no_cache=True)[0]
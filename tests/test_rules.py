@@ -0,0 +1,86 @@
+import textwrap
+
+import pytest
+
+from syntagmax.analyse import ArtifactValidator
+from syntagmax.artifact import Artifact, FileLocation
+from syntagmax.metamodel import evaluate_condition, load_metamodel
+from syntagmax.rules import compile_rules
+
+MODEL = textwrap.dedent("""
+    artifact SYS:
+        id is string as "SYS-{num}"
+        attribute contents is mandatory string
+
+    artifact REQ:
+        id is string as "REQ-{num}"
+        attribute contents is mandatory string
+        attribute derived is optional boolean [true: "si", false: "no"]
+        attribute rationale is mandatory string if derived
+        attribute level is optional enum [low, high]
+        attribute tags is optional multiple string
+        attribute parent is optional reference to parent
+
+    trace from REQ to SYS is mandatory if not derived
+    """)
+
+
+@pytest.fixture
+def metamodel(tmp_path):
+    model_file = tmp_path / 'model.syntagmax'
+    model_file.write_text(MODEL, encoding='utf-8')
+    errors = []
+    metamodel = load_metamodel(model_file, errors)
+    assert not errors
+    return metamodel
+
+
+def _artifact(aid: str, atype: str, **fields) -> Artifact:
+    artifact = Artifact(None)
+    artifact.aid = aid
+    artifact.atype = atype
+    artifact.fields = {'id': aid, **fields}
+    artifact.location = FileLocation('f.md')
+    return artifact
+
+
+def test_tables(metamodel):
+    rules = compile_rules(metamodel['artifacts'], metamodel['traces'])
+
+    assert rules['SYS'].unconditional
+    assert not rules['REQ'].unconditional
+    assert rules['SYS'].allowed_names == {'id', 'contents'}
+    assert rules['REQ'].trace_targets == {'SYS'}
+    assert [name for name, _ in rules['REQ'].attributes] == list(metamodel['artifacts']['REQ']['attributes'])
+
+    derived = dict(rules['REQ'].attributes)['derived'][0]
+    assert derived.boolean_values == {'si', 'no'}
+    assert dict(rules['REQ'].attributes)['level'][0].allowed_set == {'low', 'high'}
+    assert rules['REQ'].id_rules[0].pattern.match('REQ-001')
+
+
+@pytest.mark.parametrize('value', ['si', 'SI', 'no', 'true', '', ['x'], [], True, None])
+def test_conditions_match_shared_evaluation(metamodel, value):
+    rules = compile_rules(metamodel['artifacts'], metamodel['traces'])
+    rule = dict(rules['REQ'].attributes)['rationale'][0]
+    condition = metamodel['artifacts']['REQ']['attributes']['rationale'][0]['condition']
+    fields = {} if value is None else {'derived': value}
+
+    assert rule.condition(fields) == evaluate_condition(fields, 'REQ', condition, metamodel)
+    assert rules['REQ'].traces[0].condition(fields) == evaluate_condition(fields, 'REQ', metamodel['traces']['REQ'][0]['condition'], metamodel)
+
+
+def test_validation_reports_in_rule_order(metamodel):
+    sys_artifact = _artifact('SYS-1', 'SYS', contents='System.')
+    req = _artifact('REQ-1', 'REQ', contents='Req.', derived='si', level='medium', tags='one', extra='x')
+    req.pids = ['SYS-1']
+
+    errors = ArtifactValidator(metamodel, {'SYS-1': sys_artifact}).validate(req)
+
+    assert [e.message for e in errors] == [
+        "Attribute 'extra' is not allowed for artifact 'REQ'",
+        "Missing mandatory attribute: 'rationale'",
+        "Attribute 'level' value 'medium' is invalid. Allowed values: ['low', 'high']",
+        "Attribute 'tags' must be a list (multiple=True)",
+        "Trace from 'REQ' to 'SYS' is not allowed",
+    ]
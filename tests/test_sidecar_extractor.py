@@ -0,0 +1,85 @@
+# SPDX-License-Identifier: MIT
+# Author: Boris Resnick
+# Created: 2026-10-17
+# Description: Tests for sidecar pairing and orphan detection through the record directory index.
+
+from pathlib import Path
+
+import pytest
+
+from syntagmax.config import Config
+from syntagmax.extractors.sidecar import SidecarExtractor, SidecarIndex
+from syntagmax.params import Params
+
+
+def _extractor(root: Path) -> SidecarExtractor:
+    (root / 'config.toml').write_text(
+        'base = "."\n[[input]]\nname = "bin"\ndir = "assets"\ndriver = "sidecar"\natype = "REQ"\nfilter = "**/*.bin"\n', encoding='utf-8'
+    )
+    params = Params(verbose=False, render_tree=False, ai=False, no_git=True, allow_dirty_worktree=True, suppress_tracing=True)
+    config = Config(params=params, config_filename=root / 'config.toml')
+    return SidecarExtractor(config, config.input_records()[0], config.metamodel)
+
+
+def _write(root: Path, files: dict[str, str]):
+    for rel, text in files.items():
+        (root / rel).parent.mkdir(parents=True, exist_ok=True)
+        (root / rel).write_text(text, encoding='utf-8')
+
+
+def test_pairing_and_orphans_without_file_system_calls(tmp_path, monkeypatch):
+    _write(
+        tmp_path / 'assets',
+        {
+            'a.bin': '',
+            'a.bin.stmx': 'id: REQ-1\n',
+            'sub/b.bin': '',
+            'sub/b.bin.syntagmax': 'id: REQ-2\n',
+            'sub/c.bin': '',
+            'd.bin': '',
+            'd.bin.stmx': 'id: REQ-4\n',
+            'd.bin.syntagmax': 'id: REQ-4\n',
+            'gone.bin.syntagmax': 'id: REQ-5\n',
+            'sub/gone.png.stmx': 'id: REQ-6\n',
+        },
+    )
+    extractor = _extractor(tmp_path)
+    filepaths = list(extractor._record.filepaths)
+    extractor.sidecar_index()
+
+    def no_stat(self, *args, **kwargs):
+        raise AssertionError(f'{self} was checked on disk')
+
+    monkeypatch.setattr(Path, 'exists', no_stat)
+    monkeypatch.setattr(Path, 'rglob', no_stat)
+
+    artifacts, errors = extractor.collect_results((f, extractor.extract_blocks_from_file(f)) for f in filepaths)
+
+    assert sorted(a.aid for a in artifacts) == ['REQ-1', 'REQ-2']
+    base = tmp_path / 'assets'
+    assert errors == [
+        f'sidecar :: Both .stmx and .syntagmax sidecars are present for {base / "d.bin"}',
+        f'sidecar :: Missing sidecar file for {base / "sub/c.bin"}',
+        f'sidecar :: Orphaned sidecar file {base / "sub/gone.png.stmx"} without matching original file',
+        f'sidecar :: Orphaned sidecar file {base / "gone.bin.syntagmax"} without matching original file',
+    ]
+
+
+def test_files_outside_the_record_directory_are_checked_on_disk(tmp_path):
+    _write(tmp_path, {'assets/a.bin': '', 'other/x.bin': '', 'other/x.bin.stmx': 'id: REQ-9\n'})
+    extractor = _extractor(tmp_path)
+
+    artifacts, errors = extractor.extract_from_file(tmp_path / 'other/x.bin')
+    assert [a.aid for a in artifacts] == ['REQ-9'] and not errors
+
+
+@pytest.mark.parametrize('root', ['.', 'assets'])
+def test_index_keys_match_input_paths(tmp_path, monkeypatch, root):
+    _write(tmp_path, {'assets/sub/a.bin': '', 'assets/sub/a.bin.stmx': ''})
+    monkeypatch.chdir(tmp_path)
+    index = SidecarIndex(Path(root))
+
+    path = Path(root, 'assets/sub/a.bin' if root == '.' else 'sub/a.bin')
+    assert index.covers(str(path)) and str(path) in index.stmx
+    assert not index.covers(str(tmp_path / 'elsewhere.bin'))
+    assert index.orphans() == []
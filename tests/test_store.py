@@ -0,0 +1,117 @@
+import datetime
+import random
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from syntagmax.artifact import Artifact, FileLocation, LineLocation, NotebookLocation, ParentLink, Revision
+from syntagmax.config import InputRecord, MetricDefinition, MetricsConfig
+from syntagmax.metrics import METRIC_KINDS, calculate_metrics
+from syntagmax.render import render_tree_markdown
+from syntagmax.store import ArtifactStore
+from syntagmax.trace import build_trace_matrix
+from syntagmax.tree import build_tree
+
+REVISIONS = [Revision(f'{i:040x}', f'{i:07x}', datetime.datetime(2026, 1, 1) + datetime.timedelta(days=i), f'dev{i}@example.com') for i in range(1, 9)]
+
+VALUES = ['text', 'TBD', '', ['a', 'b'], [], True, 3, ['x', 7]]
+
+
+def _record(name: str) -> InputRecord:
+    return InputRecord(name=name, dir=name, record_base=Path(name), filepaths=[], driver='text', default_atype='REQ', marker='REQ')
+
+
+def _artifacts(count: int) -> dict[str, Artifact]:
+    rng = random.Random(7)
+    records = [_record('software'), _record('hardware')]
+    locations = [
+        lambda i: FileLocation(f'docs/{i % 3}.md'),
+        lambda i: FileLocation(f'docs/{i % 3}.md', f'docs/{i}.yaml'),
+        lambda i: LineLocation(f'src/{i % 4}.py', (i, i + 2)),
+        lambda i: NotebookLocation('nb.ipynb', (1, 4), i),
+        lambda i: None,
+    ]
+    artifacts: dict[str, Artifact] = {}
+    for i in range(count):
+        a = Artifact(None)
+        a.atype = rng.choice(['SYS', 'REQ', 'REQ', 'TST'])
+        a.aid = f'{a.atype}-{i}'
+        a.driver = rng.choice(['text', 'obsidian'])
+        a.record = rng.choice(records + [None])
+        a.location = rng.choice(locations)(i)
+        a.fields = {name: rng.choice(VALUES) for name in rng.sample(['contents', 'owner', 'tags', 'verify'], rng.randint(0, 4))}
+        if rng.random() < 0.8:
+            a.fields['status'] = rng.choice(['draft', 'approved'])
+        a.revisions = set(rng.sample(REVISIONS, rng.randint(0, 3)))
+        for pid in rng.sample(sorted(artifacts), min(len(artifacts), rng.randint(0, 2))) + (['MISSING'] if rng.random() < 0.05 else []):
+            a.pids.append(pid)
+            if rng.random() < 0.7:
+                a.parent_links.append(ParentLink(pid=pid, nominal_revision=rng.choice([None, 'older', '0000001']), is_suspicious=rng.random() < 0.3))
+        artifacts[a.aid] = a
+    config = MagicMock()
+    config.params = {}
+    build_tree(config, artifacts, [])
+    return artifacts
+
+
+def test_views_read_like_artifacts():
+    artifacts = _artifacts(300)
+    store = ArtifactStore(artifacts.values())
+
+    assert list(store) == list(artifacts) and len(store) == len(artifacts)
+    assert 'MISSING' not in store
+    for aid, a in artifacts.items():
+        view = store[aid]
+        assert (view.aid, view.atype, view.driver, view.record) == (a.aid, a.atype, a.driver, a.record)
+        assert str(view.location) == str(a.location) and type(view.location) is type(a.location)
+        assert view.fields == a.fields and list(view.fields) == list(a.fields)
+        assert view.pids == a.pids
+        assert sorted(view.parent_links, key=lambda link: link.pid) == sorted(a.parent_links, key=lambda link: link.pid)
+        assert view.children == a.children
+        assert view.revisions == a.revisions
+        assert view.latest_revision == a.latest_revision
+        assert view.ancestors == a.ancestors
+        assert view.contents() == a.contents()
+
+
+def test_readers_accept_a_store():
+    artifacts = _artifacts(200)
+    store = ArtifactStore(artifacts.values())
+
+    assert render_tree_markdown(store) == render_tree_markdown(artifacts)
+    matrix = build_trace_matrix(store, 'REQ', 'SYS', attributes=['status'])
+    assert matrix.records == build_trace_matrix(artifacts, 'REQ', 'SYS', attributes=['status']).records
+
+    config = MagicMock()
+    config.metrics = MetricsConfig(
+        catalogue=[MetricDefinition(name=kind, kind=kind) for kind in METRIC_KINDS] + [MetricDefinition(name='by', kind='breakdown', by=['owner', 'tags'])]
+    )
+    config.metamodel = {'traces': {'REQ': [{'targets': ['SYS']}], 'TST': [{'targets': ['REQ']}]}}
+    assert calculate_metrics(config, store, []) == calculate_metrics(config, artifacts, [])
+
+    without_root = {aid: a for aid, a in artifacts.items() if aid != 'ROOT'}
+    assert calculate_metrics(config, ArtifactStore(without_root.values()), []) == calculate_metrics(config, without_root, [])
+
+
+def test_metrics_do_not_build_a_store(monkeypatch):
+    artifacts = _artifacts(50)
+    config = MagicMock()
+    config.metrics = MetricsConfig(catalogue=[MetricDefinition(name=kind, kind=kind) for kind in METRIC_KINDS])
+    config.metamodel = None
+
+    def no_store(self, artifacts):
+        raise AssertionError('an artifact map was copied into a store')
+
+    monkeypatch.setattr(ArtifactStore, '__init__', no_store)
+    assert calculate_metrics(config, artifacts, [])[0]['catalogue']
+
+
+def test_frames():
+    artifacts = _artifacts(100)
+    store = ArtifactStore(artifacts.values())
+
+    frame = store.artifact_frame().collect()
+    assert frame.get_column('aid').to_list() == list(artifacts)
+    assert frame.get_column('input_record').to_list() == [a.record.name if a.record else None for a in artifacts.values()]
+    assert store.link_frame().collect().height == sum(len(a.pids) for a in artifacts.values())
+    values = store.field_frame().collect()
+    assert values.height == sum(len(v) if isinstance(v, list) and v else 1 for a in artifacts.values() for v in a.fields.values())
@@ -5,8 +5,9 @@ import json
 import pytest
 from pydantic import ValidationError
 
-from syntagmax.config import Config, ObsidianDriverConfig
+from syntagmax.config import Config, ExcludeElementConfig, ObsidianDriverConfig
 from syntagmax.extractors.markdown import apply_soft_line_breaks
+from syntagmax.extractors.markdown_filters import BLANK, BLOCK, CALLOUT, FENCE, HEADING, RULE, classify_lines
 from syntagmax.extractors.obsidian import ObsidianExtractor
 from syntagmax.obsidian_settings import read_obsidian_strict_line_breaks
 from syntagmax.params import Params
@@ -384,6 +385,15 @@ class TestApplySoftLineBreaks:
         result = apply_soft_line_breaks(text)
         assert result == '# Heading\nsome text  \nmore text\n\n- list\n'
 
+    def test_markers_need_text_before_line_ending(self):
+        # A bare '#' or '-' is not a heading or list item, whatever the line ending
+        result = apply_soft_line_breaks('#\r\n-\ntext\n')
+        assert result == '#  \r\n-  \ntext  \n'
+
+    def test_line_labels(self):
+        lines = ['# Title\n', '#tag\n', '> note\n', '---\r\n', '- item\n', '٣. item\n', '```\n', '  \n', 'text']
+        assert classify_lines(lines) == [HEADING | BLOCK, HEADING, CALLOUT, RULE | BLOCK, BLOCK, BLOCK, FENCE, BLANK, 0]
+
 
 # ============================================================
 # Task 6: ObsidianExtractor integration
@@ -454,6 +464,19 @@ class TestObsidianExtractorLineBreaks:
         contents = artifact_blocks[0].artifact.fields['contents']
         assert '  \n' not in contents
 
+    def test_off_with_excluded_elements_breaks_lines_once(self, params, tmp_path):
+        config, req_dir = self._make_config(params, tmp_path, 'off')
+        config.input_records()[0].exclude_elements = [ExcludeElementConfig(name='callouts', mode='only')]
+        extractor = ObsidianExtractor(config, config.input_records()[0], config.metamodel)
+
+        md_file = req_dir / 'test.md'
+        md_file.write_text('First line\n> - quoted item\n> quoted text\nlast line\n', encoding='utf-8')
+
+        blocks = extractor.extract_blocks_from_file(md_file)
+
+        # The unquoted list item is a block element and is not broken
+        assert [b.content for b in blocks] == ['First line  \n- quoted item\nquoted text  \nlast line  \n']
+
     def test_code_blocks_in_requirements_untouched(self, params, tmp_path):
         config, req_dir = self._make_config(params, tmp_path, 'off')
         record = config.input_records()[0]
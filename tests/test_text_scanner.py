@@ -0,0 +1,38 @@
+import random
+
+from syntagmax.extractors.text import scan_sections
+
+
+def _str_scan(text: str) -> list[tuple[str, str | None, int, int]]:
+    """A str-based scan that counts lines from the start of the text for every section, as the extractor used to.
+
+    Unlike the former extractor loop, it yields the text before an unterminated '[<' only once, in
+    the trailing gap; the former loop also added it as a gap of its own.
+    """
+    result = []
+    pos = 0
+    while True:
+        start_pos = text.find('[<', pos)
+        if start_pos == -1:
+            break
+        end_pos = text.find('>]', start_pos)
+        if end_pos == -1:
+            break
+        segment_end = end_pos + 2
+        start_line = text.count('\n', 0, start_pos) + 1
+        end_line = text.count('\n', 0, segment_end) + 1
+        result.append((text[pos:start_pos], text[start_pos:segment_end], start_line, end_line))
+        pos = segment_end
+    result.append((text[pos:], None, 0, 0))
+    return result
+
+
+def test_matches_the_str_scan():
+    rng = random.Random(3)
+    pieces = ['[<', '>]', 'ID=A-1', ' ', 'x', 'ü', '→', '\n', '\r\n', '\r', '>>>', '[', '>']
+    for _ in range(300):
+        raw = ''.join(rng.choice(pieces) for _ in range(rng.randint(0, 60)))
+        # Text mode reading translated line endings before the former scan
+        text = raw.replace('\r\n', '\n').replace('\r', '\n')
+
+        assert list(scan_sections(raw.encode('utf-8'))) == _str_scan(text), repr(raw)
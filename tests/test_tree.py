@@ -0,0 +1,91 @@
+import random
+from unittest.mock import MagicMock
+
+from syntagmax.artifact import Artifact
+from syntagmax.config import Config
+from syntagmax.tree import build_tree
+
+
+def _config() -> Config:
+    config = MagicMock(spec=Config)
+    config.params = {}
+    return config
+
+
+def _build(links: dict[str, list[str]]) -> tuple[dict[str, Artifact], list[str]]:
+    config = _config()
+    artifacts = {}
+    for aid, pids in links.items():
+        artifact = Artifact(config)
+        artifact.aid = aid
+        artifact.atype = 'REQ'
+        artifact.pids = list(pids)
+        artifacts[aid] = artifact
+
+    errors: list = []
+    build_tree(config, artifacts, errors)
+    return artifacts, [e.message for e in errors]
+
+
+def test_ancestors_of_a_dag():
+    artifacts, errors = _build({'A': [], 'B': ['A'], 'C': ['A'], 'D': ['B', 'C'], 'E': ['D'], 'X': ['MISSING']})
+
+    assert not errors
+    assert artifacts['A'].ancestors == {'ROOT'}
+    assert artifacts['D'].ancestors == {'ROOT', 'A', 'B', 'C'}
+    assert artifacts['E'].ancestors == {'ROOT', 'A', 'B', 'C', 'D'}
+    assert artifacts['X'].ancestors == set()
+
+    index = artifacts['A'].reachability
+    assert index.is_ancestor('A', 'E') and index.is_ancestor('ROOT', 'D')
+    assert not index.is_ancestor('B', 'C') and not index.is_ancestor('E', 'A') and not index.is_ancestor('D', 'D')
+    assert index.descendants('B') == {'D', 'E'}
+    assert index.ancestors_of(['B', 'X']) == {'ROOT', 'A'}
+    assert 'C' in artifacts['E'].ancestors and 'X' not in artifacts['E'].ancestors
+
+
+def test_deep_chain_is_not_a_cycle():
+    links = {'N0': []} | {f'N{i}': [f'N{i - 1}'] for i in range(1, 200)}
+    artifacts, errors = _build(links)
+
+    assert not errors
+    assert len(artifacts['N199'].ancestors) == 200
+
+
+def test_cycles_are_reported_with_their_members():
+    artifacts, errors = _build({'A': [], 'B': ['A', 'D'], 'C': ['B'], 'D': ['C'], 'E': ['D'], 'S': ['S']})
+
+    assert len(errors) == 2
+    assert errors[0].endswith(' B → C → D → B')
+    assert errors[1].endswith(' S → S')
+    assert artifacts['E'].ancestors == {'ROOT', 'A', 'B', 'C', 'D'}
+
+    # Members of a cycle are their own ancestors
+    index = artifacts['A'].reachability
+    assert index.is_ancestor('C', 'C') and index.is_ancestor('D', 'B') and index.is_ancestor('S', 'S')
+    assert index.descendants('C') == {'B', 'C', 'D', 'E'}
+
+
+def test_queries_match_a_naive_walk():
+    rng = random.Random(7)
+    links = {f'N{i}': rng.sample([f'N{j}' for j in range(i)], min(i, rng.randint(0, 3))) for i in range(150)}
+    links['N20'].append('N140')
+    links['N140'].append('N20')
+    artifacts, errors = _build(links)
+    assert len(errors) == 1
+    index = artifacts['N0'].reachability
+
+    def walk(aid: str) -> set[str]:
+        found: set[str] = set()
+        pending = list(artifacts[aid].children)
+        while pending:
+            child = pending.pop()
+            if child not in found:
+                found.add(child)
+                pending.extend(artifacts[child].children)
+        return found
+
+    for aid in artifacts:
+        descendants = walk(aid)
+        assert index.descendants(aid) == descendants
+        assert all(index.is_ancestor(aid, other) == (other in descendants) for other in artifacts)
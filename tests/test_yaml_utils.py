@@ -1,8 +1,16 @@
 # SPDX-License-Identifier: MIT
 
+import datetime
+
 import pytest
 
-from syntagmax.yaml_utils import roundtrip_modify_attrs, YAMLParsingError
+import yaml
+
+from syntagmax import yaml_utils
+from syntagmax.config import Config
+from syntagmax.extractors.sidecar import SidecarExtractor
+from syntagmax.params import Params
+from syntagmax.yaml_utils import roundtrip_modify_attrs, safe_load, YAMLParsingError
 
 
 class TestRoundtripModifyAttrsOrderPreservation:
@@ -240,3 +248,43 @@ class TestRoundtripModifyAttrsOperationSemantics:
         raw_yaml = 'attrs:\n  id: REQ-001\n  derived: false\n'
         result = roundtrip_modify_attrs(raw_yaml, {'derived': True}, 'replace')
         assert 'derived: true' in result
+
+
+class TestSafeLoad:
+    """Tests of the shared YAML loader."""
+
+    def test_yaml_11_scalars(self):
+        data = safe_load('a: yes\nb: Off\nc: 2024-01-01\nd: 1_000\ne: "yes"\nf: 0o17\n')
+        assert data == {'a': True, 'b': False, 'c': datetime.date(2024, 1, 1), 'd': 1000, 'e': 'yes', 'f': '0o17'}
+
+    def test_matches_pure_python_loader(self):
+        text = 'attrs:\n  id: REQ-001\n  tags: [a, b]\n  derived: on\n  ratio: 1.5e+3\n  note: ~\n  nested: {k: v}\n'
+        assert safe_load(text) == yaml.load(text, Loader=yaml.SafeLoader)
+
+    def test_malformed_yaml_raises(self):
+        with pytest.raises(yaml.YAMLError):
+            safe_load('attrs: [unclosed\n')
+
+    def test_sidecar_extraction_with_either_loader(self, tmp_path, monkeypatch):
+        for i in range(20):
+            (tmp_path / 'bin').mkdir(exist_ok=True)
+            (tmp_path / 'bin' / f'blob-{i}.bin').write_bytes(b'\0')
+            (tmp_path / 'bin' / f'blob-{i}.bin.stmx').write_text(
+                f'id: REQ-{i}\ncontents: |\n  Frame {i} is logged.\nparent: SYS-{i // 10}\nderived: {("yes", "off")[i % 2]}\nstatus: "draft"\n',
+                encoding='utf-8',
+            )
+        (tmp_path / 'config.toml').write_text(
+            'base = "."\n[[input]]\nname = "bin"\ndir = "bin"\ndriver = "sidecar"\natype = "REQ"\nfilter = "*.bin"\n', encoding='utf-8'
+        )
+        params = Params(verbose=False, render_tree=False, ai=False, no_git=True, allow_dirty_worktree=True, suppress_tracing=True)
+
+        def extract(loader):
+            monkeypatch.setattr(yaml_utils, 'SafeLoader', loader)
+            config = Config(params=params, config_filename=tmp_path / 'config.toml')
+            artifacts, errors = SidecarExtractor(config, config.input_records()[0]).extract()
+            assert not errors
+            return sorted((a.aid, a.fields) for a in artifacts)
+
+        python = extract(yaml.SafeLoader)
+        assert len(python) == 20
+        assert extract(getattr(yaml, 'CSafeLoader', yaml.SafeLoader)) == python